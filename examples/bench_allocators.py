@@ -0,0 +1,100 @@
+import io
+import os
+import sys
+import random
+import contextlib
+from time import perf_counter
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ltl_core.allocator import RandomAllocator, CostAllocator, SequenceAllocator
+from ltl_core.batch import answer_verifications
+from ltl_core.binding_manager import BindingManager
+from ltl_core.labeler import Labeler
+from ltl_core.simulation import Simulation
+from ltl_core.specification import Specification
+from ltl_core.workspace import Workspace
+
+
+ALLOCATORS = {
+    "random": lambda spec, abt, bm, labeler, ws: RandomAllocator(spec, abt, bm, labeler),
+    "cost": lambda spec, abt, bm, labeler, ws: CostAllocator(spec, abt, bm, labeler, ws),
+    "cost-incr": lambda spec, abt, bm, labeler, ws: CostAllocator(spec, abt, bm, labeler, ws, incremental=True),
+    "sequence": lambda spec, abt, bm, labeler, ws: SequenceAllocator(spec, abt, bm, labeler, ws),
+}
+
+
+def run_mission(make_allocator, n_targets, seed, dt=0.1, max_steps=20000):
+    """
+    One headless mission. Human verification is answered as soon as the scan
+    finishes, with a seeded random found / not-found response.
+    Returns (completion time, total distance flown/driven, allocator calls,
+    mean seconds per allocator call, allocation decisions). Decisions are
+    replans for SequenceAllocator and calls for the others.
+    """
+    rng = random.Random(seed)
+    random.seed(seed)
+    bm = BindingManager()
+    spec = Specification()
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.get_task_specification("Case2", s=[1] * n_targets, binding_manager=bm, backend="native")
+
+    ws = Workspace(size=(50, 40), target_mask=[1] * n_targets, num_drones=4, num_gvs=2, num_humans=2,
+                   seed=seed, margin=4)
+    agents_by_type = {"drone": ws.agents["drones"], "gv": ws.agents["gvs"], "human": ws.agents["humans"]}
+    bm.agents_by_type = agents_by_type
+    labeler = Labeler(spec)
+    allocator = make_allocator(spec, agents_by_type, bm, labeler, ws)
+    sim = Simulation(spec, ws, allocator, labeler)
+
+    calls = [0, 0.0]
+    choose = allocator.choose
+
+    def counted_choose(*args):
+        start = perf_counter()
+        result = choose(*args)
+        calls[0] += 1
+        calls[1] += perf_counter() - start
+        return result
+
+    allocator.choose = counted_choose
+
+    distance = 0.0
+    steps = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        while steps < max_steps:
+            before = np.array([a.pos for a in ws.get_all_agents()])
+            out = sim.step(dt=dt)
+            steps += 1
+            distance += np.linalg.norm(np.array([a.pos for a in ws.get_all_agents()]) - before, axis=1).sum()
+
+            answer_verifications(labeler, out["completed"], rng, 0.5)
+
+            if labeler.all_completed() and ws.all_mobile_agents_at_base():
+                break
+    decisions = getattr(allocator, "plan_calls", calls[0])
+    return steps * dt, distance, calls[0], calls[1] / max(calls[0], 1), decisions
+
+
+def main(n_targets=6, n_seeds=5):
+    """Mission completion time of RandomAllocator vs CostAllocator on seeded workspaces."""
+    names = list(ALLOCATORS)
+    print(f"{'seed':>5} " + " ".join(f"{name + ' [s]':>14}" for name in names))
+    totals = {name: [] for name in names}
+    for seed in range(n_seeds):
+        row = [run_mission(ALLOCATORS[name], n_targets, seed) for name in names]
+        for name, result in zip(names, row):
+            totals[name].append(result)
+        print(f"{seed:>5} " + " ".join(f"{result[0]:14.1f}" for result in row))
+
+    for name, runs in totals.items():
+        runs = np.array(runs)
+        print(f"{name:>10}: mean completion {runs[:, 0].mean():.1f} s, mean distance {runs[:, 1].mean():.1f}, "
+              f"mean allocator calls {runs[:, 2].mean():.1f} ({runs[:, 4].mean():.1f} decisions), "
+              f"{runs[:, 3].mean() * 1e3:.3f} ms/call")
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
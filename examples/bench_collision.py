@@ -0,0 +1,82 @@
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rrt_2D.rrt_connect import Node
+from rrt_2D.utils_rrt import Utils
+from rrt_2D.grid_utils import GridUtils
+
+
+def random_obstacles(rng, n_circles, n_rectangles):
+    circles = np.column_stack([rng.uniform((-2.5, -1.3), (2.5, 1.3), (n_circles, 2)),
+                               rng.uniform(0.05, 0.3, n_circles)]).tolist()
+    rectangles = np.column_stack([rng.uniform((-2.5, -1.3), (2.5, 1.3), (n_rectangles, 2)),
+                                  rng.uniform(0.05, 0.5, (n_rectangles, 2))]).tolist()
+    return circles, rectangles
+
+
+def time_checks(n_segments, n_circles, n_rectangles, seed=0):
+    """
+    Mean seconds per segment for Utils.is_collision called in a loop, for one
+    Utils.is_collision_batch call and for GridUtils.is_collision in a loop,
+    on random short segments in the rrt_2D world with random circle /
+    rectangle obstacles.
+    """
+    rng = np.random.default_rng(seed)
+    circles, rectangles = random_obstacles(rng, n_circles, n_rectangles)
+    utils = Utils()
+    utils.update_obs(circles, utils.obs_boundary, rectangles)
+    grid = GridUtils()
+    grid.update_obs(circles, grid.obs_boundary, rectangles)
+
+    starts = rng.uniform((-2.5, -1.3), (2.5, 1.3), size=(n_segments, 2))
+    ends = starts + rng.normal(0, 0.1, size=(n_segments, 2))
+    pairs = [(Node(s), Node(e)) for s, e in zip(starts.tolist(), ends.tolist())]
+
+    start = perf_counter()
+    single = [utils.is_collision(s, e) for s, e in pairs]
+    t_single = (perf_counter() - start) / n_segments
+
+    start = perf_counter()
+    batch = utils.is_collision_batch(starts, ends)
+    t_batch = (perf_counter() - start) / n_segments
+
+    start = perf_counter()
+    [grid.is_collision(s, e) for s, e in pairs]
+    t_grid = (perf_counter() - start) / n_segments
+
+    assert single == batch.tolist()
+    return t_single, t_batch, t_grid
+
+
+def time_wind_update(n_wind=3, n_updates=50, seed=0):
+    """Mean seconds per GridUtils.update_obs when every wind cell drifts a little."""
+    rng = np.random.default_rng(seed)
+    wind = np.column_stack([rng.uniform((-1.9, -1.25), (1.9, 1.25), (n_wind, 2)),
+                            rng.uniform(0.06, 0.15, n_wind)])
+    grid = GridUtils()
+    grid.update_obs(wind.tolist(), [], [])
+
+    start = perf_counter()
+    for _ in range(n_updates):
+        wind[:, :2] += rng.uniform(-0.1, 0.1, (n_wind, 2))
+        grid.update_obs(wind.tolist(), [], [])
+    return (perf_counter() - start) / n_updates
+
+
+def main():
+    """Per-segment collision cost: Utils single checks vs one batch call vs GridUtils."""
+    print(f"{'segments':>9} {'obstacles':>10} {'single [us]':>12} {'batch [us]':>11} {'grid [us]':>10}")
+    for n_segments in (10, 100, 1000):
+        for n_obs in (3, 30):
+            t = time_checks(n_segments, n_obs, n_obs)
+            print(f"{n_segments:>9} {2 * n_obs:>10} " + " ".join(f"{v * 1e6:>{w}.1f}" for v, w in zip(t, (12, 11, 10))))
+    print(f"GridUtils update, 3 drifting wind cells: {time_wind_update() * 1e3:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import os
+import sys
+from time import perf_counter
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ltl_core.agent import Agent
+from ltl_core.fleet import Fleet
+
+
+def make_fleet(n_agents, seed=0):
+    """
+    *n_agents* agents spread over a 50x40 grid, each with a far-away goal and
+    half of them running a symbolic task, so every step does real work.
+    """
+    rng = np.random.default_rng(seed)
+    fleet = Fleet()
+    agents = []
+    for i in range(n_agents):
+        agent = Agent(pos=rng.uniform((0, 0), (50, 40)), role="drones", label=f"D{i}", speed=0.01, fleet=fleet)
+        agent.goal = rng.uniform((0, 0), (50, 40))
+        if i % 2:
+            agent.start_symbolic_task(f"p_scan_{i}_1_1_0")
+            agent.set_symbolic_task_speed(f"p_scan_{i}_1_1_0", speed=1e-4)
+        agents.append(agent)
+    return fleet, agents
+
+
+def per_agent_step(fleet, agents, dt):
+    for agent in agents:
+        agent.move_toward_goal(dt)
+        agent.step_symbolic(dt)
+
+
+def fleet_step(fleet, agents, dt):
+    fleet.step(dt)
+
+
+def time_steps(step, n_agents, n_steps, dt=0.1):
+    fleet, agents = make_fleet(n_agents)
+    start = perf_counter()
+    for _ in range(n_steps):
+        step(fleet, agents, dt)
+    return (perf_counter() - start) / n_steps
+
+
+def main(n_steps=200):
+    """
+    Per-step dynamics cost: the old per-Agent loop (move_toward_goal +
+    step_symbolic) against one vectorized Fleet.step.
+    """
+    print(f"{'agents':>7} {'per-agent [ms/step]':>20} {'fleet [ms/step]':>16}")
+    for n_agents in (6, 30, 100, 300, 1000):
+        loop = time_steps(per_agent_step, n_agents, n_steps)
+        vec = time_steps(fleet_step, n_agents, n_steps)
+        print(f"{n_agents:>7} {loop * 1e3:20.3f} {vec * 1e3:16.3f}")
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
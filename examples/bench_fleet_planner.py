@@ -0,0 +1,79 @@
+import os
+import sys
+import multiprocessing
+from time import perf_counter
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rrt_2D.fleet_planner import plan_fleet, make_pool
+from rrt_2D.grid_utils import GridUtils
+
+
+def make_world(n_legs, n_obstacles=12, seed=0):
+    """
+    *n_legs* cross-map legs among *n_obstacles* random wind cells, with both
+    ends kept clear of every cell.
+    """
+    rng = np.random.default_rng(seed)
+    cells = np.column_stack([rng.uniform((-1.8, -1.0), (1.8, 1.0), (n_obstacles, 2)),
+                             rng.uniform(0.1, 0.25, n_obstacles)])
+
+    def clear(p):
+        return np.all(np.hypot(*(cells[:, :2] - p).T) > cells[:, 2] + 0.1)
+
+    legs = []
+    while len(legs) < n_legs:
+        start = (rng.uniform(-2.3, -1.5), rng.uniform(-1.1, 1.1))
+        goal = (rng.uniform(1.5, 2.3), rng.uniform(-1.1, 1.1))
+        if clear(start) and clear(goal):
+            legs.append((start, goal))
+    return legs, (cells.tolist(), [], [])
+
+
+def time_replans(legs, obstacles, n_replans, processes=None, reuse=True, mp_context=None):
+    """
+    Mean seconds per plan_fleet call over *n_replans* replans: in-process
+    (processes=1), through one pool kept for all replans (reuse) or through
+    a new pool per replan, as plan_fleet does without an executor.
+    """
+    elapsed = 0.0
+    collision = GridUtils()
+    pool = make_pool(processes, GridUtils(), mp_context) if reuse and processes != 1 else None
+    try:
+        if pool is not None:
+            plan_fleet(legs[:2], obstacles, processes=processes, executor=pool)   # start the workers
+        for k in range(n_replans):
+            start = perf_counter()
+            if processes == 1:
+                plan_fleet(legs, obstacles, seed=k, processes=1, collision=collision)
+            elif pool is not None:
+                plan_fleet(legs, obstacles, seed=k, processes=processes, executor=pool)
+            else:
+                with make_pool(processes, GridUtils(), mp_context) as fresh:
+                    plan_fleet(legs, obstacles, seed=k, processes=processes, executor=fresh)
+            elapsed += perf_counter() - start
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return elapsed / n_replans
+
+
+def main(n_replans=3):
+    """Seconds per fleet replan: in-process vs a kept pool vs a pool per call (fork / spawn)."""
+    spawn = multiprocessing.get_context("spawn")
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'legs':>5} {'serial [s]':>11} {'kept pool [s]':>14} {'per call [s]':>13} "
+          f"{'per call, spawn [s]':>20} {'speedup':>8}")
+    for n_legs in (4, 16, 64):
+        legs, obstacles = make_world(n_legs)
+        serial = time_replans(legs, obstacles, n_replans, processes=1)
+        kept = time_replans(legs, obstacles, n_replans)
+        fresh = time_replans(legs, obstacles, n_replans, reuse=False)
+        spawned = time_replans(legs, obstacles, n_replans, reuse=False, mp_context=spawn)
+        print(f"{n_legs:>5} {serial:>11.3f} {kept:>14.3f} {fresh:>13.3f} {spawned:>20.3f} {serial / kept:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
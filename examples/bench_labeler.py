@@ -0,0 +1,58 @@
+import io
+import os
+import sys
+import random
+import contextlib
+from time import perf_counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ltl_core.binding_manager import BindingManager
+from ltl_core.labeler import Labeler
+from ltl_core.specification import Specification
+
+
+def build_spec(n_targets, backend="native"):
+    spec = Specification()
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.get_task_specification("Case2", s=[1] * n_targets, binding_manager=BindingManager(), backend=backend)
+    return spec
+
+
+def run_ticks(labeler, n_ticks, progress_every):
+    """
+    Drive the labeler the way Simulation.step does (advance + unlocked APs)
+    with no simulator: every *progress_every* ticks one unlocked AP becomes
+    true, the ticks in between are quiet. Returns mean seconds per tick.
+    """
+    random.seed(0)
+    true_aps = set()
+    start = perf_counter()
+    for tick in range(n_ticks):
+        if tick % progress_every == 0:
+            unlocked = sorted(labeler.get_unlocked_APs())
+            true_aps = {unlocked[0]} if unlocked else set()
+        labeler.advance(true_aps)
+        labeler.get_unlocked_APs()
+    return (perf_counter() - start) / n_ticks
+
+
+def main(n_ticks=300, progress_every=10):
+    """
+    Per-tick labeler cost on the Case2 hierarchy; 'full' re-classifies every
+    node each tick, 'incremental' only follows what changed.
+    """
+    print(f"{'targets':>8} {'nodes':>7} {'full [ms/tick]':>15} {'incremental [ms/tick]':>22}")
+    for n_targets in (10, 100, 500):
+        spec = build_spec(n_targets)
+        cost = {}
+        for incremental in (False, True):
+            with contextlib.redirect_stdout(io.StringIO()):
+                labeler = Labeler(spec, incremental=incremental)
+                cost[incremental] = run_ticks(labeler, n_ticks, progress_every)
+        print(f"{n_targets:>8} {spec.dag.number_of_nodes():>7} "
+              f"{cost[False] * 1e3:15.3f} {cost[True] * 1e3:22.3f}")
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,44 @@
+import os
+import sys
+import subprocess
+from time import perf_counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ltl_core.binding_manager import BindingManager
+from ltl_core.buchi_graph import run_ltl2ba, parse_ltl2ba_output, ltl_to_nba
+from ltl_core.specification import Specification
+
+
+def case2_formulas(n_targets):
+    """All non-empty formulas of the Case2 hierarchy with *n_targets* targets."""
+    spec = Specification()
+    spec.get_sar_specification_with_mask("Case2", [1] * n_targets, binding_manager=BindingManager())
+    return [f for level in spec.hierarchy for f in level.values() if f.strip()]
+
+
+def time_backend(formulas, backend):
+    start = perf_counter()
+    for formula in formulas:
+        if backend == "ltl2ba":
+            # bypass the translation cache so the subprocess cost is measured
+            parse_ltl2ba_output(run_ltl2ba(formula, use_cache=False))
+        else:
+            ltl_to_nba(formula, backend=backend)
+    return perf_counter() - start
+
+
+def main():
+    print(f"{'targets':>8} {'formulas':>9} {'ltl2ba [s]':>11} {'native [s]':>11}")
+    for n_targets in (10, 50, 200):
+        formulas = case2_formulas(n_targets)
+        native = time_backend(formulas, "native")
+        try:
+            subproc = f"{time_backend(formulas, 'ltl2ba'):11.3f}"
+        except (FileNotFoundError, OSError, subprocess.CalledProcessError):
+            subproc = f"{'n/a':>11}"
+        print(f"{n_targets:>8} {len(formulas):>9} {subproc} {native:11.3f}")
+
+
+if __name__ == '__main__':
+    main()
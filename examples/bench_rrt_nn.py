@@ -0,0 +1,60 @@
+import os
+import sys
+import math
+from time import perf_counter
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rrt_2D.rrt_connect import RrtConnect, Node
+from rrt_2D.spatial_index import SpatialIndex
+
+
+def time_queries(n_vertices, n_queries=500, radius=0.1, seed=0):
+    """
+    Mean seconds per nearest / radius query over *n_vertices* random tree
+    vertices in the rrt_2D world, for the list scan the planners used before
+    and for SpatialIndex (fed one insert at a time, as during planning).
+    """
+    rng = np.random.default_rng(seed)
+    points = rng.uniform((-2.5, -1.3), (2.5, 1.3), size=(n_vertices, 2))
+    queries = rng.uniform((-2.5, -1.3), (2.5, 1.3), size=(n_queries, 2))
+    nodes = [Node(p) for p in points.tolist()]
+
+    index = SpatialIndex()
+    for x, y in points.tolist():
+        index.insert(x, y)
+
+    start = perf_counter()
+    scan = [RrtConnect.nearest_neighbor(nodes, Node(q)) for q in queries.tolist()]
+    t_scan = (perf_counter() - start) / n_queries
+
+    start = perf_counter()
+    indexed = [index.nearest(x, y) for x, y in queries.tolist()]
+    t_index = (perf_counter() - start) / n_queries
+
+    start = perf_counter()
+    for x, y in queries.tolist():
+        [i for i, nd in enumerate(nodes) if math.hypot(nd.x - x, nd.y - y) <= radius]
+    t_scan_r = (perf_counter() - start) / n_queries
+
+    start = perf_counter()
+    for x, y in queries.tolist():
+        index.within(x, y, radius)
+    t_index_r = (perf_counter() - start) / n_queries
+
+    assert scan == [nodes[i] for i in indexed]
+    return t_scan, t_index, t_scan_r, t_index_r
+
+
+def main():
+    """Nearest / radius query cost against tree size: linear scan vs SpatialIndex."""
+    print(f"{'vertices':>9} {'scan NN [us]':>13} {'index NN [us]':>14} {'scan r [us]':>12} {'index r [us]':>13}")
+    for n_vertices in (100, 1000, 5000, 20000):
+        t = time_queries(n_vertices)
+        print(f"{n_vertices:>9} " + " ".join(f"{v * 1e6:>{w}.1f}" for v, w in zip(t, (13, 14, 12, 13))))
+
+
+if __name__ == '__main__':
+    main()
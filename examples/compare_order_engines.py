@@ -0,0 +1,46 @@
+import os
+import sys
+from time import perf_counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ltl_core.binding_manager import BindingManager
+from ltl_core.dag_builder import extract_pairwise_order_ltl2ba
+from ltl_core.specification import Specification
+
+
+def case2_formulas(n_targets):
+    spec = Specification()
+    spec.get_sar_specification_with_mask("Case2", [1] * n_targets, binding_manager=BindingManager())
+    return [f for level in spec.hierarchy for f in level.values() if f.strip()]
+
+
+def main(backend="native"):
+    """
+    Regression check: the reachability engine must return the same precedence
+    pairs as the exhaustive trace enumeration on the Case2 hierarchy.
+    """
+    mismatches = 0
+    for n_targets in (1, 3, 10):
+        formulas = case2_formulas(n_targets)
+        elapsed = {}
+        results = {}
+        for engine in ("traces", "reachability"):
+            start = perf_counter()
+            results[engine] = [extract_pairwise_order_ltl2ba(f, backend=backend, engine=engine) for f in formulas]
+            elapsed[engine] = perf_counter() - start
+
+        for formula, old, new in zip(formulas, results["traces"], results["reachability"]):
+            if set(old) != set(new):
+                mismatches += 1
+                print(f"[MISMATCH] {formula}\n    traces:       {sorted(old)}\n    reachability: {sorted(new)}")
+
+        print(f"{n_targets:>3} targets, {len(formulas):>4} formulas: "
+              f"traces {elapsed['traces']:.3f}s, reachability {elapsed['reachability']:.3f}s")
+
+    print("OK" if mismatches == 0 else f"{mismatches} mismatching formulas")
+    return mismatches
+
+
+if __name__ == '__main__':
+    sys.exit(1 if main(*sys.argv[1:]) else 0)
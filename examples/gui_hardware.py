@@ -14,7 +14,7 @@ import numpy as np
 from time import sleep, time, strftime
 from qfly import Pose, QualisysCrazyflie, World, ParallelContexts, utils
 import csv
-from rrt_2D import rrt_connect
+from rrt_2D.fleet_planner import plan_routes
 import game
 
 import math
@@ -252,13 +252,9 @@ with ParallelContexts(*_qcfs) as qcfs:
     path2 = []
 
     # RRT connect for all drone paths (targets)
-    drone_trajectory = [[], []]
-    for d_inx in range(2):
-        for p_idx in range(len(drone_paths[d_inx]) - 1):
-            rrt_conn = rrt_connect.RrtConnect(drone_paths[d_inx][p_idx], drone_paths[d_inx][p_idx + 1], 0.08, 0.05, 5000)
-            rrt_conn.planning()
-            rrt_conn.smoothing()
-            drone_trajectory[d_inx].append(rrt_conn.path)
+    drone_trajectory, _ = plan_routes([drone_paths[d_inx] for d_inx in range(2)],
+                                      processes=1, timeout=5.0,
+                                      seed=np.random.randint(2 ** 31 - 1))
     ####################################################################################################################
 
     # Initialize
@@ -478,15 +474,9 @@ with ParallelContexts(*_qcfs) as qcfs:
                             drone_paths = path1
                         elif game_mgr.target_clicked == 2:
                             drone_paths = path2
-                        new_drone_trajectory = [[], []]
-                        for d_inx in range(2):
-                            for p_idx in range(len(drone_paths[d_inx]) - 1):
-                                rrt_conn = rrt_connect.RrtConnect(drone_paths[d_inx][p_idx],
-                                                                  drone_paths[d_inx][p_idx + 1],
-                                                                  0.08, 0.05, 5000)
-                                rrt_conn.planning()
-                                rrt_conn.smoothing()
-                                new_drone_trajectory[d_inx].append(rrt_conn.path)
+                        new_drone_trajectory, _ = plan_routes([drone_paths[d_inx] for d_inx in range(2)],
+                                                              processes=1, timeout=5.0,
+                                                              seed=np.random.randint(2 ** 31 - 1))
                         # Maintain the current trajectory
                         drone_trajectory = [[drone_trajectory[0][target_index[0]]],
                                             [drone_trajectory[1][target_index[1]]]]
@@ -526,16 +516,9 @@ with ParallelContexts(*_qcfs) as qcfs:
                         drone_paths = assign_targets_to_drones(current_start, target_remaining,
                                                                landing=takeoff_positions)
                         # RRT-connect for all drone paths
-                        drone_trajectory = [[], []]
-                        for d_inx in range(2):
-                            for p_idx in range(len(drone_paths[d_inx]) - 1):
-                                rrt_conn = rrt_connect.RrtConnect(drone_paths[d_inx][p_idx],
-                                                                  drone_paths[d_inx][p_idx + 1], 0.08, 0.05,
-                                                                  5000)
-                                rrt_conn.utils.update_obs([], [], [])
-                                rrt_conn.planning()
-                                rrt_conn.smoothing()
-                                drone_trajectory[d_inx].append(rrt_conn.path)
+                        drone_trajectory, _ = plan_routes([drone_paths[d_inx] for d_inx in range(2)],
+                                                          obstacles=([], [], []), processes=1, timeout=5.0,
+                                                          seed=np.random.randint(2 ** 31 - 1))
                         target_index = [0, 0]
                         # Time correction
                         path_index = [0, 0]
@@ -565,16 +548,9 @@ with ParallelContexts(*_qcfs) as qcfs:
                                 drone_paths = assign_targets_to_drones(current_start, target_remaining,
                                                                        landing=takeoff_positions)
                                 # RRT-connect for all drone paths
-                                drone_trajectory = [[], []]
-                                for d_inx in range(2):
-                                    for p_idx in range(len(drone_paths[d_inx]) - 1):
-                                        rrt_conn = rrt_connect.RrtConnect(drone_paths[d_inx][p_idx],
-                                                                          drone_paths[d_inx][p_idx + 1], 0.08,
-                                                                          0.05, 5000)
-                                        rrt_conn.utils.update_obs([wind], [], [])
-                                        rrt_conn.planning()
-                                        rrt_conn.smoothing()
-                                        drone_trajectory[d_inx].append(rrt_conn.path)
+                                drone_trajectory, _ = plan_routes([drone_paths[d_inx] for d_inx in range(2)],
+                                                                  obstacles=([wind], [], []), processes=1, timeout=5.0,
+                                                                  seed=np.random.randint(2 ** 31 - 1))
                                 target_index = [0, 0]
                                 # Time correction
                                 path_index = [0, 0]
@@ -5,7 +5,8 @@ import numpy as np
 from time import time, sleep, strftime
 from qfly import World
 import csv
-from rrt_2D import rrt_connect
+from rrt_2D.grid_utils import GridUtils
+from rrt_2D.fleet_planner import plan_routes, make_pool
 from gui_panel import GameMgr
 from vehicles import VirtualDrone, VirtualGV
 import socket
@@ -119,6 +120,8 @@ def generate_voronoi_plots(map, centroids):
         cropped_img.save('examples/images/voronoi_regions_cropped.png', format='PNG')
 
 if __name__=='__main__':
+    # RRT workers for the whole session (started once, each with its own wind grid)
+    planner_pool = make_pool(collision=GridUtils())
     try:
         ########################## Set up socket ##############################################
         # Create a server for socket communication
@@ -165,6 +168,8 @@ if __name__=='__main__':
         t = time()
         dt = 0
         wind_time = 0
+        # Wind grid for legs planned in-process (a lone leg), updated in place on replans
+        wind_collision = GridUtils()
         dt_prev = [hover_duration for _ in range(n_drones)]
         print('Time initialized')
         # Create drones and GVs
@@ -250,14 +255,10 @@ if __name__=='__main__':
         # New target
         update_on = np.random.normal(loc=18.0, scale=1.0)
 
-        # RRT-connect for all drone paths
-        drone_trajectory = [[] for _ in range(n_drones)]
-        for d_inx in range(n_drones):
-            for p_idx in range(len(drone_paths[d_inx]) - 1):
-                rrt_conn = rrt_connect.RrtConnect(drone_paths[d_inx][p_idx], drone_paths[d_inx][p_idx + 1], 0.08, 0.05, 5000)
-                rrt_conn.planning()
-                rrt_conn.smoothing()
-                drone_trajectory[d_inx].append(rrt_conn.path)
+        # RRT-connect for all drone paths, legs planned in parallel (failed legs fall back to straight lines)
+        drone_trajectory, _ = plan_routes([drone_paths[d_inx] for d_inx in range(n_drones)],
+                                          seed=np.random.randint(2 ** 31 - 1), timeout=5.0,
+                                          executor=planner_pool)
         # print(len(gvs))
         # assert False
         game_mgr = GameMgr(drones, gvs)
@@ -541,16 +542,13 @@ if __name__=='__main__':
                                                         landing=takeoff_positions)
                     # Treated as a obstacles in RRT
                     obs = [w[0:3] for w in wind]
-                    # RRT-connect for all drone paths
-                    drone_trajectory = [[] for _ in range(n_drones)]
-                    for d_inx in range(n_drones):
-                        for p_idx in range(len(drone_paths[d_inx]) - 1):
-                            rrt_conn = rrt_connect.RrtConnect(drone_paths[d_inx][p_idx],
-                                                            drone_paths[d_inx][p_idx + 1], 0.08, 0.05, 5000) # !!! rrt can return None
-                            rrt_conn.utils.update_obs(obs, [], [])
-                            rrt_conn.planning()
-                            rrt_conn.smoothing()
-                            drone_trajectory[d_inx].append(rrt_conn.path)
+                    # RRT-connect for all drone paths, in parallel on the session pool
+                    drone_trajectory, leg_status = plan_routes([drone_paths[d_inx] for d_inx in range(n_drones)],
+                                                               obstacles=(obs, [], []), collision=wind_collision,
+                                                               timeout=5.0, executor=planner_pool,
+                                                               seed=np.random.randint(2 ** 31 - 1))
+                    if any(st != 'ok' for route in leg_status for st in route):
+                        print(f'[t={int(dt)}] Some legs could not be planned, flying them straight.')
                     target_index = [0 for _ in range(n_drones)]
                     # Time correction
                     path_index = [0 for _ in range(n_drones)]
@@ -604,6 +602,7 @@ if __name__=='__main__':
             for event in pygame.event.get():
                 clicked = game_mgr.perceived_risk_render(event)
     finally:
+        planner_pool.shutdown()
         # Close the socket
         for conn, addr in clients:
             conn.close()
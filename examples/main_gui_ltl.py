@@ -360,7 +360,7 @@ if __name__ == "__main__":
                         labeler.chosen_gate_per_group[target_id] = f"p_notfoundgate_{target_id}"
 
                     # Atomic proposition update
-                    labeler._completed.add(verify_ap)
+                    labeler.mark_completed(verify_ap)
                     labeler.advance({verify_ap})
 
                     # Survivor information
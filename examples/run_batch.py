@@ -0,0 +1,60 @@
+import os
+import sys
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ltl_core.batch import run_batch, make_config
+
+
+def main():
+    """
+    Headless Monte Carlo evaluation: N seeded missions across a process
+    pool, per-episode metrics written to an .npz file.
+
+        python examples/run_batch.py --episodes 1000 --allocator cost --out logs/cost.npz
+        python examples/run_batch.py --config mission.yaml --episodes 200
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", help="YAML file with keys from ltl_core.batch.DEFAULT_CONFIG")
+    parser.add_argument("--episodes", type=int, default=100)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--allocator", help="random | cost | sequence")
+    parser.add_argument("--n-targets", type=int)
+    parser.add_argument("--out", default=None, help="output .npz path")
+    args = parser.parse_args()
+
+    config = {}
+    if args.config:
+        import yaml
+        with open(args.config, "r") as f:
+            config = yaml.safe_load(f) or {}
+    if args.allocator:
+        config["allocator"] = args.allocator
+    if args.n_targets:
+        config["n_targets"] = args.n_targets
+    config = make_config(config)
+
+    start = perf_counter()
+    seeds = range(args.first_seed, args.first_seed + args.episodes)
+    metrics = run_batch(config, seeds, processes=args.processes, out=args.out)
+    elapsed = perf_counter() - start
+
+    done = metrics["completed"]
+    print(f"{args.episodes} episodes ({config['allocator']}, {config['n_targets']} targets) in {elapsed:.1f} s "
+          f"({args.episodes / elapsed:.1f} episodes/s)")
+    print(f"  completed:       {done.sum()} / {len(done)}")
+    print(f"  mission time:    {np.nanmean(metrics['mission_time']):.1f} s "
+          f"(p95 {np.nanpercentile(metrics['mission_time'], 95):.1f} s)")
+    print(f"  distance:        {metrics['distance'].mean():.1f}")
+    print(f"  allocator calls: {metrics['allocator_calls'].mean():.1f}")
+    if args.out:
+        print(f"  metrics written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,49 +1,136 @@
 import numpy as np
+from .fleet import Fleet
 
 
 class Agent:
-    def __init__(self, pos, role, label=None, speed=10.0):
-        self.pos = np.array(pos, dtype=float)   # Continuous 2D position
-        self.role = role                        # "drone", "gv", or "human"
-        self.label = label                      # Optional string label like "D0", "H1"
-        self.traj = [tuple(self.pos)]           # Continuous position trace
+    """
+    View onto one row of a Fleet. Position, goal, speed, role, label and the
+    current symbolic task live in the Fleet's arrays (a private single-row
+    Fleet until Fleet.adopt moves the agent into a shared one); the per-task
+    speed/progress dicts and the trace stay on the object.
+    """
+
+    def __init__(self, pos, role, label=None, speed=10.0, fleet=None):
+        self.fleet = None                       # Fleet holding this agent's state
+        self.index = None                       # Row in self.fleet
+        (fleet if fleet is not None else Fleet(capacity=1)).add(self, pos, role, label, speed)
 
-        self.goal = None                        # Target position (x,y) or None
-        self.speed = speed                      # Units per timestep
+        self.traj = [tuple(self.pos)]           # Continuous position trace
 
-        self.current_symbolic_task = None       # Currently executing symbolic task (str)
         self.symbolic_task_speed = {}           # task_name → speed (0.1, 1.0, etc.)
-        self.symbolic_progress = {}             # task_name → progress [0.0 ~ 1.0]
+        self._symbolic_progress = {}            # task_name → progress [0.0 ~ 1.0]
 
         self.scan_center = None                 # Center of scan area (x,y)
         self.scan_angle = 0.0                   # Scan angle in degrees
         self.scan_time = 0.0                    # Time spent in scan area
 
+    # ---- #
+    # Fleet-backed attributes
+    # ---- #
+
+    @property
+    def pos(self):
+        """Continuous 2D position (a copy; assign to move the agent)."""
+        return self.fleet.pos[self.index].copy()
+
+    @pos.setter
+    def pos(self, value):
+        self.fleet.pos[self.index] = value
+
+    @property
+    def goal(self):
+        """Target position (x,y) or None (a copy; assign to change it)."""
+        if not self.fleet.has_goal[self.index]:
+            return None
+        return self.fleet.goal[self.index].copy()
+
+    @goal.setter
+    def goal(self, value):
+        if value is None:
+            self.fleet.has_goal[self.index] = False
+        else:
+            self.fleet.goal[self.index] = value
+            self.fleet.has_goal[self.index] = True
+
+    @property
+    def speed(self):
+        """Units per timestep."""
+        return float(self.fleet.speed[self.index])
+
+    @speed.setter
+    def speed(self, value):
+        self.fleet.speed[self.index] = value
+
+    @property
+    def role(self):
+        """Role string: "drones", "gvs" or "human"."""
+        return self.fleet.roles[self.index]
+
+    @role.setter
+    def role(self, value):
+        self.fleet.roles[self.index] = value
+
+    @property
+    def label(self):
+        """Optional string label like "D0", "H1"."""
+        return self.fleet.labels[self.index]
+
+    @label.setter
+    def label(self, value):
+        self.fleet.labels[self.index] = value
+
+    @property
+    def current_symbolic_task(self):
+        """Currently executing symbolic task (str) or None."""
+        return self.fleet.tasks[self.index]
+
+    @current_symbolic_task.setter
+    def current_symbolic_task(self, task_name):
+        fleet, i = self.fleet, self.index
+        current = fleet.tasks[i]
+        if current is not None:
+            self._symbolic_progress[current] = float(fleet.task_progress[i])
+        fleet.tasks[i] = task_name
+        fleet.task_active[i] = task_name is not None
+        if task_name is not None:
+            fleet.task_speed[i] = self.symbolic_task_speed.get(task_name, 1.0)
+            fleet.task_progress[i] = self._symbolic_progress.get(task_name, 0.0)
+
+    @property
+    def symbolic_progress(self):
+        """task_name → progress [0.0 ~ 1.0], including the running task."""
+        task = self.fleet.tasks[self.index]
+        if task is not None:
+            self._symbolic_progress[task] = float(self.fleet.task_progress[self.index])
+        return self._symbolic_progress
+
     def move_toward_goal(self, dt=1.0):
         """Move the agent toward its current goal, if any."""
         if self.goal is None:
             return
         direction = self.goal - self.pos
-        dist = np.linalg.norm(direction)
+        # axis=-1: the same reduction as Fleet.move_toward_goals (plain norm() takes a dot product)
+        dist = np.linalg.norm(direction, axis=-1)
         if dist < 1e-5:
             return
         step = self.speed * dt
         if step >= dist:
-            self.pos = self.goal.copy()
+            self.pos = self.goal
         else:
             self.pos += direction / dist * step
 
     def set_symbolic_task_speed(self, task_name: str, speed: float):
         """Set the speed for symbolic task execution."""
         self.symbolic_task_speed[task_name] = speed
+        if task_name == self.current_symbolic_task:
+            self.fleet.task_speed[self.index] = speed
 
     def start_symbolic_task(self, task_name: str):
         """Start a symbolic task. Only one symbolic task can run at a time."""
         if self.current_symbolic_task is not None:
             raise RuntimeError(f"Agent {self.label} is already doing symbolic task {self.current_symbolic_task}")
+        self._symbolic_progress.setdefault(task_name, 0.0)
         self.current_symbolic_task = task_name
-        if task_name not in self.symbolic_progress:
-            self.symbolic_progress[task_name] = 0.0
 
     def stop_symbolic_task(self):
         """Stop the currently executing symbolic task."""
@@ -51,15 +138,16 @@ class Agent:
 
     def step_symbolic(self, dt=1.0):
         """Progress the currently executing symbolic task by dt * speed."""
-        task = self.current_symbolic_task
-        if task is None:
+        fleet, i = self.fleet, self.index
+        if fleet.tasks[i] is None:
             return
-        speed = self.symbolic_task_speed.get(task, 1.0)
-        self.symbolic_progress[task] = min(1.0, self.symbolic_progress[task] + speed * dt)
+        fleet.task_progress[i] = min(1.0, fleet.task_progress[i] + fleet.task_speed[i] * dt)
 
     def get_progress(self, task_name: str) -> float:
         """Return progress [0.0 ~ 1.0] for the specified symbolic task."""
-        return self.symbolic_progress.get(task_name, 0.0)
+        if task_name is not None and task_name == self.fleet.tasks[self.index]:
+            return float(self.fleet.task_progress[self.index])
+        return self._symbolic_progress.get(task_name, 0.0)
 
     def has_completed(self, task_name: str) -> bool:
         """Check if symbolic task has been completed (progress == 1.0)."""
@@ -69,7 +157,7 @@ class Agent:
         """Check if agent is within tol distance of a goal position."""
         if self.goal is None:
             return False
-        dist = np.linalg.norm(self.pos - self.goal)
+        dist = np.linalg.norm(self.pos - self.goal, axis=-1)
         # print(f"[ARRIVAL CHECK] {self.label} dist={dist:.3f} tol={tol}")
         return dist < tol
 
@@ -78,7 +166,23 @@ class Agent:
         self.traj = [tuple(self.pos)]
         self.goal = None
         self.current_symbolic_task = None
-        self.symbolic_progress.clear()
+        self._symbolic_progress.clear()
+
+    def snapshot(self):
+        """Per-agent state not held in the fleet arrays (see Fleet.snapshot)."""
+        return {
+            "traj": list(self.traj),
+            "symbolic_task_speed": dict(self.symbolic_task_speed),
+            "symbolic_progress": dict(self._symbolic_progress),
+            "scan": (None if self.scan_center is None else np.copy(self.scan_center), self.scan_angle, self.scan_time),
+        }
+
+    def restore(self, snap):
+        self.traj = list(snap["traj"])
+        self.symbolic_task_speed = dict(snap["symbolic_task_speed"])
+        self._symbolic_progress = dict(snap["symbolic_progress"])
+        center, self.scan_angle, self.scan_time = snap["scan"]
+        self.scan_center = None if center is None else np.copy(center)
 
     def __repr__(self):
         return f"Agent(label={self.label}, role={self.role}, pos={self.pos}, progress={self.symbolic_progress:.2f})"
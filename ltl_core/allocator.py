@@ -1,5 +1,8 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
 from .agent import Agent
-from typing import Dict, Set, List
+from .specification import get_ap_prefix, AP_TYPE_PREFIX_MAP
+from typing import Dict, Set, List, Optional, Tuple
 
 
 class RandomAllocator:
@@ -40,3 +43,322 @@ class RandomAllocator:
                 break  # only assign one task per group
         return actions
 
+    def snapshot(self) -> Dict[str, object]:
+        """Allocator state keyed by agent label (RandomAllocator keeps none)."""
+        return {}
+
+    def restore(self, snap: Dict[str, object]):
+        pass
+
+    def _agent_by_label(self) -> Dict[str, Agent]:
+        return {a.label: a for agents in self.agents_by_type.values() for a in agents}
+
+
+class CostAllocator(RandomAllocator):
+    """
+    Same interface as RandomAllocator and the same candidate tasks (the next
+    unlocked task of each binding group), but agents are matched to tasks by
+    solving an agent × task assignment on estimated completion time with the
+    Hungarian method instead of taking the first free agent.
+
+    Cost of a physical task is the travel time from Agent.pos to the target or
+    dropoff location; a symbolic task costs 1 / symbolic_speed (the rate
+    Simulation runs them at). Pairs forbidden by the BindingManager are
+    infeasible.
+
+    With incremental=True an agent keeps its previous task while that task is
+    still its group's next one and the binding allows it; only the agents
+    freed by completions and the newly unlocked tasks are re-solved, so the
+    matrix stays the size of the change rather than of the team.
+    """
+
+    INFEASIBLE = 1e9
+
+    def __init__(self, spec, agents_by_type, binding_manager, labeler, workspace, symbolic_speed: float = 0.1,
+                 incremental: bool = False):
+        super().__init__(spec, agents_by_type, binding_manager, labeler)
+        self.workspace = workspace
+        self.symbolic_speed = symbolic_speed
+
+        # incremental: keep last call's pairs that are still valid and only
+        # match the freed agents against the tasks nobody holds
+        self.incremental = incremental
+        self.assignment: Dict[Agent, str] = {}
+
+    def choose(self, unlocked: Set[str], completed: List[str], aps: Set[str]) -> Dict[Agent, str]:
+        previous = self.assignment if self.incremental else {}
+        actions = {}
+        for agent_type, tasks in self.next_tasks(unlocked, completed, aps).items():
+            agents = self.agents_by_type.get(agent_type, [])
+            if not agents:
+                continue
+
+            open_tasks = set(tasks)
+            free = []
+            for agent in agents:
+                task = previous.get(agent)
+                if task in open_tasks and self.binding_manager.record_assignment(task, agent, agent_type):
+                    actions[agent] = task
+                    open_tasks.discard(task)
+                else:
+                    free.append(agent)
+
+            pending = [t for t in tasks if t in open_tasks]
+            if free and pending:
+                actions.update(self.solve(free, pending, agent_type))
+
+        self.assignment = actions
+        return actions
+
+    def snapshot(self) -> Dict[str, object]:
+        return {"assignment": {a.label: task for a, task in self.assignment.items()}}
+
+    def restore(self, snap: Dict[str, object]):
+        agents = self._agent_by_label()
+        self.assignment = {agents[label]: task for label, task in snap["assignment"].items()}
+
+    def solve(self, agents: List[Agent], tasks: List[str], agent_type: str) -> Dict[Agent, str]:
+        """Min-cost matching of *agents* to *tasks*, recorded with the BindingManager."""
+        matched = {}
+        cost = self.cost_matrix(agents, tasks, agent_type)
+        rows, cols = linear_sum_assignment(cost)
+        for r, c in zip(rows, cols):
+            if cost[r, c] >= self.INFEASIBLE:
+                continue
+            if self.binding_manager.record_assignment(tasks[c], agents[r], agent_type):
+                matched[agents[r]] = tasks[c]
+        return matched
+
+    def next_tasks(self, unlocked: Set[str], completed: List[str], aps: Set[str]) -> Dict[str, List[str]]:
+        """First assignable task of every binding group, grouped by required agent type."""
+        completed = set(completed)
+        tasks_by_type: Dict[str, List[str]] = {}
+        for group in self.binding_manager.group_to_tasks:
+            for task in self.labeler.get_group_ordered_tasks(group):
+                if task not in unlocked or task in completed or task in aps:
+                    continue
+                agent_type = self.spec.get_required_role_by_ap(task)
+                if agent_type is None:
+                    continue  # as in RandomAllocator: try the group's next task
+                tasks_by_type.setdefault(agent_type, []).append(task)
+                break  # only one task per group
+        return tasks_by_type
+
+    def task_location(self, task: str) -> Optional[np.ndarray]:
+        """Goal position of a physical task, None for symbolic ones."""
+        prefix = get_ap_prefix(task)
+        if AP_TYPE_PREFIX_MAP.get(prefix) != "physical":
+            return None
+        idx = int(task.split("_")[2])
+        if prefix == "p_dropoff":
+            return np.asarray(self.workspace.dropoff_locations[idx], dtype=float)
+        return np.asarray(self.workspace.target_locations[idx], dtype=float)
+
+    def cost_matrix(self, agents: List[Agent], tasks: List[str], agent_type: str) -> np.ndarray:
+        """Estimated completion time of each task (columns) by each agent (rows)."""
+        cost = np.full((len(agents), len(tasks)), 1.0 / self.symbolic_speed)
+
+        locations = [self.task_location(t) for t in tasks]
+        physical = [c for c, loc in enumerate(locations) if loc is not None]
+        if physical:
+            pos = np.array([a.pos for a in agents], dtype=float)
+            speed = np.array([a.speed for a in agents], dtype=float)
+            goals = np.array([locations[c] for c in physical])
+            dist = np.linalg.norm(pos[:, None, :] - goals[None, :, :], axis=2)
+            cost[:, physical] = dist / speed[:, None]
+
+        labels = np.array([a.label for a in agents], dtype=object)
+        for c, task in enumerate(tasks):
+            allowed, bound = self.binding_manager.binding_constraint(task, agent_type)
+            if not allowed:
+                cost[:, c] = self.INFEASIBLE
+            elif bound is not None:
+                cost[labels != bound, c] = self.INFEASIBLE
+        return cost
+
+
+class SequenceAllocator(CostAllocator):
+    """
+    Receding-horizon allocator that plans an ordered queue of up to *horizon*
+    tasks per agent and dispatches the head of each queue.
+
+    Jobs are the open level-4 formulas; their APs are the alternative ways to
+    do them (e.g. monitor by drone or by human). Precedence comes from
+    ``pair_preds``: a leaf waits for every leaf under a pairwise predecessor of
+    itself or of one of its ancestors. Leaves behind an environment gate that
+    has not fired (found / not found) are not planned. Queues are filled by
+    list scheduling: repeatedly commit the (agent, job) pair with the earliest
+    estimated finish time, where an agent's clock and position advance along
+    its queue and a job cannot start before its predecessors finish.
+
+    choose() only replans when new jobs become plannable or an agent runs out
+    of queued work while planned-for jobs remain; plan_calls counts replans.
+    """
+
+    def __init__(self, spec, agents_by_type, binding_manager, labeler, workspace, symbolic_speed: float = 0.1,
+                 horizon: int = 3):
+        super().__init__(spec, agents_by_type, binding_manager, labeler, workspace, symbolic_speed)
+        self.horizon = horizon
+        self.queues: Dict[Agent, List[Tuple[str, str]]] = {}   # agent -> [(leaf, ap), ...]
+        self.plan_calls = 0
+        self._plan_pool: Set[str] = set()
+
+        self.leaf_preds = self._leaf_precedence()
+        # leaf -> [(ap, agent_type)] for the APs some agent can execute
+        self.options: Dict[str, List[Tuple[str, str]]] = {}
+        for leaf in labeler.leafs:
+            opts = []
+            for ap in sorted(labeler.leaf_APs_map.get(leaf, ())):
+                agent_type = spec.get_required_role_by_ap(ap)
+                if self.agents_by_type.get(agent_type):
+                    opts.append((ap, agent_type))
+            self.options[leaf] = opts
+
+    def _leaf_precedence(self) -> Dict[str, Set[str]]:
+        """leaf -> leaves that must be completed first (structural edges only, not temporal ones)."""
+        labeler = self.labeler
+        leafs = set(labeler.leafs)
+        pair_preds = labeler.pair_preds
+
+        parents: Dict[str, Set[str]] = {}
+        children: Dict[str, Set[str]] = {}
+        for node in labeler.dag.nodes:
+            temporal = set(pair_preds.get(node, []))
+            parents[node] = set(labeler.preds_map.get(node, [])) - temporal
+            for p in parents[node]:
+                children.setdefault(p, set()).add(node)
+
+        def closure(start, edges):
+            seen, stack = set(), [start]
+            while stack:
+                for nxt in edges.get(stack.pop(), ()):
+                    if nxt not in seen:
+                        seen.add(nxt)
+                        stack.append(nxt)
+            return seen
+
+        preds: Dict[str, Set[str]] = {}
+        for leaf in labeler.leafs:
+            found: Set[str] = set()
+            for node in closure(leaf, parents) | {leaf}:
+                for p in pair_preds.get(node, []):
+                    found |= {p} if p in leafs else closure(p, children) & leafs
+            found.discard(leaf)
+            preds[leaf] = found
+        return preds
+
+    def plannable(self, completed: Set[str]) -> List[str]:
+        """Open leaves that agents can do and that no pending environment gate blocks."""
+        blocked: Dict[str, bool] = {}
+
+        def is_blocked(leaf, stack=()):
+            if leaf in blocked:
+                return blocked[leaf]
+            if leaf in completed:
+                blocked[leaf] = False
+            elif not self.options.get(leaf) or leaf in stack:
+                blocked[leaf] = True
+            else:
+                blocked[leaf] = any(is_blocked(p, stack + (leaf,)) for p in self.leaf_preds.get(leaf, ()))
+            return blocked[leaf]
+
+        return [leaf for leaf in self.labeler.leafs if leaf not in completed and not is_blocked(leaf)]
+
+    def plan(self, completed: Set[str], pool: List[str]):
+        """Fill every agent's queue (up to horizon) by earliest-finish list scheduling."""
+        self.plan_calls += 1
+        self._plan_pool = set(pool)
+
+        agents = [a for agents in self.agents_by_type.values() for a in agents]
+        clock = {}
+        for a in agents:
+            task = a.current_symbolic_task
+            remaining = (1.0 - a.get_progress(task)) / self.symbolic_speed if task else 0.0
+            clock[a] = remaining
+        position = {a: np.asarray(a.pos, dtype=float) for a in agents}
+        queues: Dict[Agent, List[Tuple[str, str]]] = {a: [] for a in agents}
+
+        bound = {}   # (group, agent_type) -> label, including tentative plan bindings
+        finish: Dict[str, float] = {}
+        unplanned = list(pool)
+        while unplanned:
+            best = None
+            for leaf in unplanned:
+                preds = self.leaf_preds.get(leaf, ())
+                if any(p not in completed and p not in finish for p in preds):
+                    continue
+                ready = max((finish[p] for p in preds if p in finish), default=0.0)
+                for ap, agent_type in self.options[leaf]:
+                    allowed, label = self.binding_manager.binding_constraint(ap, agent_type)
+                    if not allowed:
+                        continue
+                    key = (self.binding_manager.task_to_group.get(ap), agent_type)
+                    label = label or bound.get(key)
+                    goal = self.task_location(ap)
+                    duration = 0.0 if goal is not None else 1.0 / self.symbolic_speed
+                    for a in self.agents_by_type[agent_type]:
+                        if len(queues[a]) >= self.horizon or (label is not None and a.label != label):
+                            continue
+                        travel = 0.0 if goal is None else np.linalg.norm(goal - position[a]) / a.speed
+                        end = max(clock[a] + travel, ready) + duration
+                        if best is None or end < best[0]:
+                            best = (end, leaf, ap, agent_type, a, goal, key)
+            if best is None:
+                break
+
+            end, leaf, ap, agent_type, a, goal, key = best
+            queues[a].append((leaf, ap))
+            clock[a] = end
+            if goal is not None:
+                position[a] = goal
+            if key[0] is not None:
+                bound.setdefault(key, a.label)
+            finish[leaf] = end
+            unplanned.remove(leaf)
+
+        self.queues = queues
+
+    def snapshot(self) -> Dict[str, object]:
+        snap = super().snapshot()
+        snap["queues"] = {a.label: list(q) for a, q in self.queues.items()}
+        snap["plan_calls"] = self.plan_calls
+        snap["plan_pool"] = set(self._plan_pool)
+        return snap
+
+    def restore(self, snap: Dict[str, object]):
+        super().restore(snap)
+        agents = self._agent_by_label()
+        self.queues = {agents[label]: list(q) for label, q in snap["queues"].items()}
+        self.plan_calls = snap["plan_calls"]
+        self._plan_pool = set(snap["plan_pool"])
+
+    def _needs_replan(self, pool: List[str]) -> bool:
+        if not self.queues:
+            return True
+        if any(leaf not in self._plan_pool for leaf in pool):
+            return True
+        queued = {leaf for q in self.queues.values() for leaf, _ in q}
+        waiting = [leaf for leaf in pool if leaf not in queued]
+        return bool(waiting) and any(not q for q in self.queues.values())
+
+    def choose(self, unlocked: Set[str], completed: List[str], aps: Set[str]) -> Dict[Agent, str]:
+        completed = set(completed)
+        for q in self.queues.values():
+            while q and q[0][0] in completed:
+                q.pop(0)
+
+        pool = self.plannable(completed)
+        if self._needs_replan(pool):
+            self.plan(completed, pool)
+
+        actions = {}
+        for agent, q in self.queues.items():
+            if not q:
+                continue
+            _, ap = q[0]
+            if ap not in unlocked or ap in completed or ap in aps:
+                continue
+            agent_type = self.spec.get_required_role_by_ap(ap)
+            if self.binding_manager.record_assignment(ap, agent, agent_type):
+                actions[agent] = ap
+        return actions
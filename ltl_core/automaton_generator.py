@@ -1,109 +1,176 @@
-from .buchi_graph import run_ltl2ba, parse_ltl2ba_output
+from .buchi_graph import ltl_to_nba
+from .dag_builder import pairwise_order_from_nba, regex_or_order
+from .structured_automata import compile_structured
 import networkx as nx
-from typing import Dict, Any, Set, List
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Set, List, Optional, Tuple
 from collections import defaultdict
 
 
-def compile_automata(spec) -> Dict[str, nx.DiGraph]:
+def _translate_formula(formula: str, backend: str, order_engine: str) -> Tuple[nx.MultiDiGraph, List[Tuple[str, str]]]:
+    """Translate, parse and order-analyse one formula (runs in pool workers)."""
+    G = ltl_to_nba(formula, backend=backend)
+    return G, pairwise_order_from_nba(G, formula, engine=order_engine)
+
+
+class CompiledSpec:
+    """
+    Translates every non-empty formula of a specification hierarchy exactly
+    once and serves both consumers of the result: the automata used by the
+    Labeler and the pairwise precedence pairs used by build_dag.
+    """
+
+    def __init__(self, hierarchy, backend: str = "ltl2ba", structural: bool = True,
+                 order_engine: str = "reachability", workers: Optional[int] = None):
+        self.backend = backend
+        self.structural = structural
+        self.order_engine = order_engine
+
+        self.formulas: Dict[str, str] = {}
+        for level in hierarchy:
+            for name, formula in level.items():
+                if formula.strip():  # skip structural/auxiliary node like p_101
+                    self.formulas[name] = formula
+
+        compiled: Dict[str, Any] = {}
+        pairwise: Dict[str, List[Tuple[str, str]]] = {}
+        pending: List[str] = []
+        for name, formula in self.formulas.items():
+            automaton = compile_structured(formula) if structural else None
+            if automaton is None:
+                pending.append(name)
+                continue
+            compiled[name] = automaton
+            pairwise[name] = automaton.pairwise_order() or regex_or_order(formula)
+
+        # irregular formulas are independent: translate them on a process pool
+        # when asked to; map() keeps results in submission order
+        args = ([self.formulas[n] for n in pending], [backend] * len(pending), [order_engine] * len(pending))
+        if workers is not None and workers > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+                results = list(pool.map(_translate_formula, *args, chunksize=max(1, len(pending) // (4 * workers))))
+        else:
+            results = list(map(_translate_formula, *args))
+
+        # the order analysis only reads nodes and edges, so the DFA can share the graph
+        for name, (G, pairs) in zip(pending, results):
+            compiled[name] = annotate_automaton(name, G)
+            pairwise[name] = pairs
+
+        # hierarchy order, independent of which formulas went through the pool
+        self.automata: Dict[str, Any] = {name: compiled[name] for name in self.formulas}
+        self.pairwise: Dict[str, List[Tuple[str, str]]] = {name: pairwise[name] for name in self.formulas}
+
+    def pairwise_order(self, name: str) -> List[Tuple[str, str]]:
+        """Precedence pairs (a, b) of formula *name*; empty for skipped formulas."""
+        return self.pairwise.get(name, [])
+
+
+def compile_automata(spec, backend: str = "ltl2ba", structural: bool = True,
+                     workers: Optional[int] = None) -> Dict[str, Any]:
     """
     Compile each LTL sub-formula in spec.hierarchy into a DFA represented
     as a NetworkX graph, with attached initial_state, accepting_states, and delta().
+    *backend* selects the LTL translator (see buchi_graph.TRANSLATOR_BACKENDS).
+
+    With *structural* set, formulas made of eventualities (conjunctions,
+    disjunctions and <> (a && <> b) chains) compile straight to a compact
+    StructuredAutomaton; only irregular formulas go through the translator.
+    *workers* > 1 fans those translations out over a process pool.
 
     Returns:
         automata: dict mapping formula-name -> NetworkX DiGraph (the DFA)
     """
-    automata: Dict[str, nx.DiGraph] = {}
-
-    for level in spec.hierarchy:
-        for name, formula in level.items():
-            if not formula.strip():
-                continue  # skip structural/auxiliary node like p_101
-
-            # 1) parse the Buchi automaton into a directed graph
-            raw = run_ltl2ba(formula)
-            G: nx.DiGraph = parse_ltl2ba_output(raw)
-
-            # 2) identify initial state (node with in-degree zero or flagged)
-            in_degrees = dict(G.in_degree())
-            init_candidates = [n for n, deg in in_degrees.items() if deg == 0]
-            # include node-level 'initial' flags
-            for n, data in G.nodes(data=True):
-                if data.get('initial', False) and n not in init_candidates:
-                    init_candidates.append(n)
-            if not init_candidates:
-                raise RuntimeError(f"No initial state found for automaton '{name}'")
-            q0 = init_candidates[0]
-
-            # 3) identify accepting states from any source
-            accepting: Set[Any] = set()
-            # 3a) graph-level keys
-            for key in ('accepting_states', 'F', 'acc_sets', 'final_states', 'acc'):
-                if key in G.graph:
-                    val = G.graph[key]
-                    # handle dict-of-lists for 'acc_sets'
-                    if isinstance(val, dict):
-                        for subset in val.values():
-                            accepting.update(subset)
-                    # handle list/tuple/set
-                    elif isinstance(val, (list, tuple, set)):
-                        accepting.update(val)
-                    break
-            # 3b) node-level flags
-            if not accepting:
-                for n, data in G.nodes(data=True):
-                    if (data.get('accept', False)
-                            or data.get('accepting', False)
-                            or data.get('final', False)
-                            or n.lower().startswith('accept')):
-                        accepting.add(n)
-            # 3c) warn if still none
-            if not accepting:
-                print(f"Warning: no accepting states found for automaton '{name}'")
-
-            # 4) store metadata on the graph
-            G.graph['initial_state'] = q0
-            G.graph['accepting_states'] = accepting
-
-            # 5) attach as attributes for easy access
-            G.initial_state = q0
-            G.accepting_states = accepting
-
-            # 6) implement the transition function
-            def delta(state: Any, inputs: Set[str], G=G) -> Any:
-                """
-                From `state`, follow any outgoing edge whose label set is a subset of inputs.
-                If none match, remain in `state`.
-                """
-                for _, nxt, data in G.out_edges(state, data=True):
-                    lbl = data.get('label', set())
-                    lbl_set: Set[str] = set(lbl) if not isinstance(lbl, set) else lbl
-                    if lbl_set <= inputs:
-                        return nxt
-                return state
-
-            G.delta = delta
-
-            # Step 7: Build disjunctive transition groups
-            # Result: for each state, list of AP sets that all trigger the same q → q′
-            disj_eq: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
-
-            for state in G.nodes:
-                # Map from target state to set of APs that lead there
-                transitions: Dict[Any, Set[str]] = defaultdict(set)
-
-                for _, tgt, data in G.out_edges(state, data=True):
-                    label = data.get("label", set())
-                    label_set: Set[str] = {label} if isinstance(label, str) else set(label)
-                    for ap in label_set:
-                        transitions[tgt].add(ap)
-
-                for tgt_state, aps in transitions.items():
-                    if len(aps) > 1:
-                        disj_eq[state].append({"next": tgt_state, "aps": aps})
-
-            # Attach to DFA graph metadata
-            G.graph["disjunctive_equivalents"] = dict(disj_eq)
-
-            automata[name] = G
-
-    return automata
+    compiled = getattr(spec, "compiled", None)
+    if compiled is not None and compiled.backend == backend and compiled.structural == structural:
+        return compiled.automata
+    return CompiledSpec(spec.hierarchy, backend=backend, structural=structural, workers=workers).automata
+
+
+def annotate_automaton(name: str, G: nx.DiGraph) -> nx.DiGraph:
+    """
+    Attach initial_state, accepting_states, delta() and the disjunctive
+    transition groups to a parsed Büchi automaton.
+    """
+    # 2) identify initial state (node with in-degree zero or flagged)
+    in_degrees = dict(G.in_degree())
+    init_candidates = [n for n, deg in in_degrees.items() if deg == 0]
+    # include node-level 'initial' flags
+    for n, data in G.nodes(data=True):
+        if data.get('initial', False) and n not in init_candidates:
+            init_candidates.append(n)
+    if not init_candidates:
+        raise RuntimeError(f"No initial state found for automaton '{name}'")
+    q0 = init_candidates[0]
+
+    # 3) identify accepting states from any source
+    accepting: Set[Any] = set()
+    # 3a) graph-level keys
+    for key in ('accepting_states', 'F', 'acc_sets', 'final_states', 'acc'):
+        if key in G.graph:
+            val = G.graph[key]
+            # handle dict-of-lists for 'acc_sets'
+            if isinstance(val, dict):
+                for subset in val.values():
+                    accepting.update(subset)
+            # handle list/tuple/set
+            elif isinstance(val, (list, tuple, set)):
+                accepting.update(val)
+            break
+    # 3b) node-level flags
+    if not accepting:
+        for n, data in G.nodes(data=True):
+            if (data.get('accept', False)
+                    or data.get('accepting', False)
+                    or data.get('final', False)
+                    or n.lower().startswith('accept')):
+                accepting.add(n)
+    # 3c) warn if still none
+    if not accepting:
+        print(f"Warning: no accepting states found for automaton '{name}'")
+
+    # 4) store metadata on the graph
+    G.graph['initial_state'] = q0
+    G.graph['accepting_states'] = accepting
+
+    # 5) attach as attributes for easy access
+    G.initial_state = q0
+    G.accepting_states = accepting
+
+    # 6) implement the transition function
+    def delta(state: Any, inputs: Set[str], G=G) -> Any:
+        """
+        From `state`, follow any outgoing edge whose label set is a subset of inputs.
+        If none match, remain in `state`.
+        """
+        for _, nxt, data in G.out_edges(state, data=True):
+            lbl = data.get('label', set())
+            lbl_set: Set[str] = set(lbl) if not isinstance(lbl, set) else lbl
+            if lbl_set <= inputs:
+                return nxt
+        return state
+
+    G.delta = delta
+
+    # Step 7: Build disjunctive transition groups
+    # Result: for each state, list of AP sets that all trigger the same q → q′
+    disj_eq: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+
+    for state in G.nodes:
+        # Map from target state to set of APs that lead there
+        transitions: Dict[Any, Set[str]] = defaultdict(set)
+
+        for _, tgt, data in G.out_edges(state, data=True):
+            label = data.get("label", set())
+            label_set: Set[str] = {label} if isinstance(label, str) else set(label)
+            for ap in label_set:
+                transitions[tgt].add(ap)
+
+        for tgt_state, aps in transitions.items():
+            if len(aps) > 1:
+                disj_eq[state].append({"next": tgt_state, "aps": aps})
+
+    # Attach to DFA graph metadata
+    G.graph["disjunctive_equivalents"] = dict(disj_eq)
+
+    return G
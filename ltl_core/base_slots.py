@@ -0,0 +1,81 @@
+import numpy as np
+from typing import List, Sequence, Tuple
+
+# Agent roles that park in the base area when idle
+MOBILE_ROLES = ("drones", "gvs", "drone", "gv")
+
+
+class BaseSlots:
+    """
+    Free-list of base cells for parking idle drones/GVs.
+
+    A base cell is taken while any agent stands on it or has it as goal
+    (positions/goals truncated to grid cells). Occupancy is recounted from
+    the Fleet arrays on every refresh, so goals set elsewhere (allocator,
+    GUI) release a cell as soon as its agent leaves or is re-tasked; within
+    one pass, reserve() books a cell before handing it out, so two agents
+    are never sent to the same one.
+    """
+
+    def __init__(self, cells: Sequence[Tuple[int, int]], size: Tuple[int, int]):
+        self.cells: List[Tuple[int, int]] = list(cells)
+        self.size = size
+
+        # grid cell -> slot id (-1 outside the base)
+        self.slot_of = np.full(size, -1, dtype=int)
+        for slot, (x, y) in enumerate(self.cells):
+            self.slot_of[x, y] = slot
+
+        self.occupancy = np.zeros(len(self.cells), dtype=int)
+
+    def slots(self, points: np.ndarray) -> np.ndarray:
+        """Slot id of the cell under each point, -1 if not a base cell."""
+        cells = points.astype(int)
+        inside = ((cells >= 0) & (cells < self.size)).all(axis=1)
+        slots = np.full(len(points), -1, dtype=int)
+        slots[inside] = self.slot_of[cells[inside, 0], cells[inside, 1]]
+        return slots
+
+    def refresh(self, fleet):
+        """Recount which base cells are stood on or targeted by any agent."""
+        taken = np.concatenate([self.slots(fleet.pos), self.slots(fleet.goal[fleet.has_goal])])
+        self.occupancy = np.bincount(taken[taken >= 0], minlength=len(self.cells))
+
+    def reserve(self) -> int:
+        """Book the first free base cell in base_area order; -1 if all are taken."""
+        free = np.flatnonzero(self.occupancy == 0)
+        if not len(free):
+            return -1
+        slot = int(free[0])
+        self.occupancy[slot] += 1
+        return slot
+
+    def release(self, slot: int):
+        if slot >= 0:
+            self.occupancy[slot] -= 1
+
+    def send_idle_home(self, fleet) -> List[int]:
+        """
+        Give every idle mobile agent outside the base (no goal, or arrived)
+        a free base cell as its new goal, in fleet order. Returns the rows
+        that were re-tasked.
+        """
+        self.refresh(fleet)
+        mobile = np.fromiter((role in MOBILE_ROLES for role in fleet.roles), dtype=bool, count=len(fleet))
+        idle = mobile & (~fleet.has_goal | fleet.arrived()) & (self.slots(fleet.pos) < 0)
+
+        sent = []
+        for i in np.flatnonzero(idle).tolist():
+            # The agent's current goal stops counting once it is replaced
+            previous = self.slots(fleet.goal[i:i + 1])[0] if fleet.has_goal[i] else -1
+            self.release(previous)
+            slot = self.reserve()
+            if slot < 0:
+                # Keep the goal it had, so take its booking back
+                if previous >= 0:
+                    self.occupancy[previous] += 1
+                continue
+            fleet.goal[i] = self.cells[slot]
+            fleet.has_goal[i] = True
+            sent.append(i)
+        return sent
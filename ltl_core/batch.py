@@ -0,0 +1,167 @@
+import io
+import random
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .allocator import RandomAllocator, CostAllocator, SequenceAllocator
+from .binding_manager import BindingManager
+from .labeler import Labeler
+from .simulation import Simulation
+from .specification import Specification
+from .workspace import Workspace
+
+
+# allocator name -> factory(spec, agents_by_type, binding_manager, labeler, workspace, **kwargs)
+ALLOCATORS = {
+    "random": lambda spec, abt, bm, labeler, ws, **kw: RandomAllocator(spec, abt, bm, labeler),
+    "cost": lambda spec, abt, bm, labeler, ws, **kw: CostAllocator(spec, abt, bm, labeler, ws, **kw),
+    "sequence": lambda spec, abt, bm, labeler, ws, **kw: SequenceAllocator(spec, abt, bm, labeler, ws, **kw),
+}
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "case": "Case2",
+    "n_targets": 6,
+    "backend": "native",
+    "size": (50, 40),
+    "num_drones": 4,
+    "num_gvs": 2,
+    "num_humans": 2,
+    "margin": 4,
+    "allocator": "random",
+    "allocator_kwargs": {},
+    "dt": 0.1,
+    "max_steps": 20000,
+    "found_prob": 0.5,      # chance the auto human-verify answers "found"
+}
+
+# Per-episode metrics, in output column order
+METRICS = ("seed", "mission_time", "episode_time", "steps", "completed", "n_completed",
+           "distance", "allocator_calls", "wall_time")
+
+
+def make_config(config: Optional[Dict[str, Any]] = None, **overrides) -> Dict[str, Any]:
+    """DEFAULT_CONFIG updated with *config* and keyword overrides; unknown keys are rejected."""
+    merged = dict(DEFAULT_CONFIG)
+    for source in (config or {}, overrides):
+        unknown = set(source) - set(DEFAULT_CONFIG)
+        if unknown:
+            raise KeyError(f"Unknown config keys: {sorted(unknown)}")
+        merged.update(source)
+    return merged
+
+
+def build_mission(config: Dict[str, Any], seed: int) -> Simulation:
+    """Specification, Workspace, Labeler and allocator for one seeded episode, wired into a Simulation."""
+    binding_manager = BindingManager()
+    spec = Specification()
+    s_mask = [1] * config["n_targets"]
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.get_task_specification(config["case"], s=s_mask, binding_manager=binding_manager,
+                                    backend=config["backend"])
+
+    ws = Workspace(size=tuple(config["size"]), target_mask=s_mask, num_drones=config["num_drones"],
+                   num_gvs=config["num_gvs"], num_humans=config["num_humans"], seed=seed, margin=config["margin"])
+    agents_by_type = {"drone": ws.agents["drones"], "gv": ws.agents["gvs"], "human": ws.agents["humans"]}
+    binding_manager.agents_by_type = agents_by_type
+
+    labeler = Labeler(spec)
+    allocator = ALLOCATORS[config["allocator"]](spec, agents_by_type, binding_manager, labeler, ws,
+                                                **config["allocator_kwargs"])
+    return Simulation(spec, ws, allocator, labeler)
+
+
+def answer_verifications(labeler: Labeler, completed: Iterable[str], rng: random.Random, found_prob: float):
+    """
+    Stand-in for the GUI's human verify step: as soon as a scan completes,
+    pick found / not-found for that target and mark p_verify done. Scans
+    are visited in name order so the draws from *rng* do not depend on
+    set hashing.
+    """
+    for ap in sorted(completed):
+        if ap.startswith("p_scan_") and ap.count("_") == 5:
+            tid = ap.split("_")[2]
+            verify_ap = f"p_verify_{tid}_3_1_0"
+            if verify_ap not in labeler.get_completed():
+                gate = "p_foundgate" if rng.random() < found_prob else "p_notfoundgate"
+                labeler.chosen_gate_per_group[tid] = f"{gate}_{tid}"
+                labeler.mark_completed(verify_ap)
+                labeler.advance({verify_ap})
+
+
+def run_episode(config: Dict[str, Any], seed: int) -> Dict[str, Any]:
+    """
+    Step one seeded mission with a fixed dt until every formula is completed
+    and the drones/GVs are back at base, or max_steps. Reproducible for a
+    given seed.
+    """
+    start = perf_counter()
+    random.seed(seed)
+    rng = random.Random(seed)
+    dt = config["dt"]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim = build_mission(config, seed)
+        ws, labeler = sim.workspace, sim.labeler
+
+        distance = 0.0
+        mission_time = np.nan
+        steps = 0
+        try:
+            while steps < config["max_steps"]:
+                before = ws.fleet.pos.copy()
+                out = sim.step(dt=dt)
+                steps += 1
+                distance += np.linalg.norm(ws.fleet.pos - before, axis=1).sum()
+
+                answer_verifications(labeler, out["completed"], rng, config["found_prob"])
+
+                if labeler.all_completed():
+                    if np.isnan(mission_time):
+                        mission_time = steps * dt
+                    if ws.all_mobile_agents_at_base():
+                        break
+        finally:
+            sim.close()
+
+    return {
+        "seed": seed,
+        "mission_time": mission_time,
+        "episode_time": steps * dt,
+        "steps": steps,
+        "completed": labeler.all_completed(),
+        "n_completed": len(labeler.get_completed()),
+        "distance": distance,
+        "allocator_calls": sim.allocator_calls,
+        "wall_time": perf_counter() - start,
+    }
+
+
+def _run_episode_args(args):
+    return run_episode(*args)
+
+
+def run_batch(config: Dict[str, Any], seeds: Iterable[int], processes: Optional[int] = None,
+              out: Optional[str] = None, chunksize: int = 8) -> Dict[str, np.ndarray]:
+    """
+    Run one episode per seed across a process pool (in-process when
+    processes == 1) and collect the metrics column-wise, in seed order.
+    With *out*, the columns are also written to an .npz file together with
+    the config.
+    """
+    config = make_config(config)
+    seeds = list(seeds)
+    jobs = [(config, seed) for seed in seeds]
+    if processes == 1:
+        rows: List[Dict[str, Any]] = [run_episode(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            rows = list(pool.map(_run_episode_args, jobs, chunksize=chunksize))
+
+    columns = {name: np.array([row[name] for row in rows]) for name in METRICS}
+    if out is not None:
+        np.savez(out, config=np.array(repr(config)), **columns)
+    return columns
@@ -1,6 +1,6 @@
 from .agent import Agent
 from collections import defaultdict
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 import networkx as nx
 
 
@@ -34,15 +34,61 @@ class BindingManager:
 
         self.group_to_automaton: Dict[str, nx.DiGraph] = {}
 
+        # agent_type → {label: Agent}, rebuilt whenever agents_by_type is assigned
+        self.agent_index: Dict[str, Dict[str, Agent]] = {}
+
+        # group_key → {agent_type: Agent}, kept in step with self.bindings
+        self.bound_agents: Dict[str, Dict[str, Agent]] = defaultdict(dict)
+
         # agent_type → [Agent list]
         self.agents_by_type: Dict[str, List[Agent]] = {}
 
+        # bumped whenever group membership changes, so per-group caches
+        # (e.g. Labeler.get_group_ordered_tasks) know when to rebuild
+        self.groups_version = 0
+
+    @property
+    def agents_by_type(self) -> Dict[str, List[Agent]]:
+        return self._agents_by_type
+
+    @agents_by_type.setter
+    def agents_by_type(self, agents_by_type: Dict[str, List[Agent]]):
+        self._agents_by_type = agents_by_type
+        self.index_agents()
+
+    def index_agents(self):
+        """
+        Rebuild the label → Agent index and the group → bound Agent table.
+        Call again if the agent lists are modified in place.
+        """
+        self.agent_index = {
+            agent_type: {agent.label: agent for agent in agents}
+            for agent_type, agents in self._agents_by_type.items()
+        }
+        self._rebind_agents()
+
+    def _rebind_agents(self):
+        self.bound_agents.clear()
+        for group, bound in self.bindings.items():
+            for agent_type, agent_id in bound.items():
+                self._bind_agent(group, agent_type, agent_id)
+
+    def _bind_agent(self, group: str, agent_type: str, agent_id: str):
+        agent = self.agent_index.get(agent_type, {}).get(agent_id)
+        if agent is not None:
+            self.bound_agents[group][agent_type] = agent
+
+    def _release_group(self, group: str):
+        self.bindings.pop(group, None)
+        self.bound_agents.pop(group, None)
+
     def register_group(self, group_key: str, tasks: List[str], group_type: str = "drone"):
         """Register a group and allowed agent types for that group."""
         for task in tasks:
             self.task_to_group[task] = group_key
             self.group_to_tasks[group_key].add(task)
         self.group_types[group_key] = {group_type} if isinstance(group_type, str) else set(group_type)
+        self.groups_version += 1
 
     def disable_binding_for(self, task_name: str):
         """Explicitly allow any agent for this task (no binding enforced)."""
@@ -87,6 +133,7 @@ class BindingManager:
 
         if current_binding is None:
             self.bindings[group][agent_type] = agent_id
+            self._bind_agent(group, agent_type, agent_id)
             if self.verbose:
                 print(f"[BindingManager] Binding {agent_id} to group {group}")
             return True
@@ -100,6 +147,23 @@ class BindingManager:
                     print(f"[BindingManager] {agent_id} rejected — group {group} already bound to {current_binding}")
                 return False
 
+    def binding_constraint(self, task_name: str, agent_type: str) -> Tuple[bool, Optional[str]]:
+        """
+        Side-effect free counterpart of record_assignment's checks: returns
+        (type allowed, label of the agent the group is bound to or None).
+        """
+        if task_name.startswith("p_found_") or task_name.startswith("p_notfound_"):
+            return True, None
+        if task_name in self.disabled_bindings:
+            return True, None
+
+        group = self.task_to_group.get(task_name)
+        if not group:
+            return True, None
+        if agent_type not in self.group_types.get(group, set()):
+            return False, None
+        return True, self.bindings.get(group, {}).get(agent_type)
+
     def mark_completed(self, task_name: str, labeler=None):
         self.completed_tasks.add(task_name)
         group = self.task_to_group.get(task_name)
@@ -111,14 +175,14 @@ class BindingManager:
             dfa_state = labeler.states.get(group)
             if dfa_state is not None and labeler._is_accepting(dfa, dfa_state):
                 print(f"[BindingManager] DFA for group {group} is accepting — releasing binding.")
-                self.bindings.pop(group, None)
+                self._release_group(group)
             else:
                 print(f"[BindingManager] DFA for group {group} not accepting yet — keep binding.")
         else:
             group_tasks = self.group_to_tasks[group]
             if group_tasks.issubset(self.completed_tasks):
                 print(f"[BindingManager] All tasks done in group {group} — releasing binding.")
-                self.bindings.pop(group, None)
+                self._release_group(group)
 
     def get_bound_agent(self, task_name: str, agent_type: str) -> Optional[str]:
         group = self.task_to_group.get(task_name)
@@ -134,16 +198,12 @@ class BindingManager:
         """
         Return the 'Agent' object bound to this group and agent_type, if any.
         """
-        agent_id = self.bindings.get(group, {}).get(agent_type)
-        if agent_id is None:
-            return None
+        bound = self.bound_agents.get(group)
+        return bound.get(agent_type) if bound else None
 
-        # Look up the actual Agent object by ID
-        for agent in self.agents_by_type.get(agent_type, []):
-            if agent.label == agent_id:
-                return agent
-
-        return None
+    def get_agent(self, label: str, agent_type: str) -> Optional[Agent]:
+        """Return the Agent of the given type with this label, if any."""
+        return self.agent_index.get(agent_type, {}).get(label)
 
     def get_bound_agent_for_group_by_role(self, group: str, agent_type: str) -> Optional[str]:
         """Return the agent of a given type currently bound to this group, if any."""
@@ -152,8 +212,21 @@ class BindingManager:
     def reset(self):
         """Clear all binding state and completed task info."""
         self.bindings.clear()
+        self.bound_agents.clear()
         self.completed_tasks.clear()
 
+    def snapshot(self) -> Dict[str, object]:
+        """Copy of the binding state; group registrations are static and not included."""
+        return {
+            "bindings": {group: dict(bound) for group, bound in self.bindings.items()},
+            "completed_tasks": set(self.completed_tasks),
+        }
+
+    def restore(self, snap: Dict[str, object]):
+        self.bindings = defaultdict(dict, {group: dict(bound) for group, bound in snap["bindings"].items()})
+        self.completed_tasks = set(snap["completed_tasks"])
+        self._rebind_agents()
+
     def get_next_unfinished_task(self, group, labeler):
         """Return the next task in the group that is not yet completed."""
         ordered_tasks = labeler.get_group_ordered_tasks(group)
@@ -1,36 +1,161 @@
 import os
 import re
+import hashlib
 import subprocess
 import shutil
 import networkx as nx
 import matplotlib.pyplot as plt
-from typing import Union
+from functools import lru_cache
+from typing import Dict, Optional, Union
+
+from . import ltl_translator
+
+# Translator backends accepted by run_ltl2ba / ltl_to_nba:
+#   "ltl2ba" — the external ltl2ba executable (subprocess, cached)
+#   "native" — in-process translator for the <>/&&/|| fragment (ltl_translator)
+TRANSLATOR_BACKENDS = ("ltl2ba", "native")
+
+
+# Content-addressed translation cache: sha256(translator version + formula) -> raw output.
+# The in-memory layer serves repeated calls within a process, the on-disk layer
+# survives restarts so a known mission spec never spawns ltl2ba again.
+LTL2BA_CACHE_DIR = os.environ.get(
+    "LTL2BA_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "ltl_core", "ltl2ba")
+)
+_LTL2BA_CACHE: Dict[str, str] = {}
+
+
+def _resolve_ltl2ba(ltl2ba_path: str) -> str:
+    """
+    Locate the ltl2ba executable: package-local copy first, then the given path, then PATH.
+    Raises FileNotFoundError if the executable cannot be found.
+    """
+    local_path = os.path.join(os.path.dirname(__file__), "ltl2ba.exe")
+    if os.path.isfile(local_path):
+        return local_path
+    if os.path.isfile(ltl2ba_path):
+        return ltl2ba_path
+    if shutil.which(ltl2ba_path) is not None:
+        return shutil.which(ltl2ba_path)
+    raise FileNotFoundError(
+        f"ltl2ba executable not found (tried local 'ltl2ba.exe' and PATH)"
+    )
+
+
+def _normalize_formula(ltl_formula: str) -> str:
+    """Replace Unicode ∧/∨ with &&/|| and collapse whitespace."""
+    cleaned = ltl_formula.replace("∧", "&&").replace("∨", "||")
+    return " ".join(cleaned.split())
+
+
+@lru_cache(maxsize=None)
+def _hash_executable(path: str, mtime_ns: int, size: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _translator_version(path: str) -> str:
+    """
+    Identify the translator by the content hash of its executable, so replacing
+    the binary invalidates every cached translation. Re-hashed only when the
+    file's mtime or size changes.
+    """
+    st = os.stat(path)
+    return "ltl2ba-" + _hash_executable(os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def _cache_key(formula: str, version: str) -> str:
+    return hashlib.sha256(f"{version}\n{formula}".encode("utf-8")).hexdigest()
+
+
+def _cache_get(key: str, cache_dir: Optional[str]) -> Optional[str]:
+    if key in _LTL2BA_CACHE:
+        return _LTL2BA_CACHE[key]
+    if cache_dir:
+        try:
+            with open(os.path.join(cache_dir, key + ".ba"), "r", encoding="utf-8") as f:
+                raw = f.read()
+        except OSError:
+            return None
+        _LTL2BA_CACHE[key] = raw
+        return raw
+    return None
+
+
+def _cache_put(key: str, raw: str, cache_dir: Optional[str]) -> None:
+    _LTL2BA_CACHE[key] = raw
+    if not cache_dir:
+        return
+    # write-then-rename so concurrent missions never read a half-written entry;
+    # the disk cache is best effort and never fails a translation
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        path = os.path.join(cache_dir, key + ".ba")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(raw)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def clear_ltl2ba_cache(disk: bool = False, cache_dir: Optional[str] = None) -> None:
+    """
+    Drop the in-memory translation cache, and the on-disk one if *disk* is set.
+    """
+    _LTL2BA_CACHE.clear()
+    cache_dir = cache_dir or LTL2BA_CACHE_DIR
+    if disk and os.path.isdir(cache_dir):
+        for entry in os.listdir(cache_dir):
+            if entry.endswith(".ba"):
+                try:
+                    os.remove(os.path.join(cache_dir, entry))
+                except OSError:
+                    pass
+
+
+def _check_backend(backend: str) -> None:
+    if backend not in TRANSLATOR_BACKENDS:
+        raise ValueError(f"Unknown translator backend '{backend}' (expected one of {TRANSLATOR_BACKENDS})")
 
 
 def run_ltl2ba(
     ltl_formula: str,
-    ltl2ba_path: str = "ltl2ba.exe"
+    ltl2ba_path: str = "ltl2ba.exe",
+    use_cache: bool = True,
+    cache_dir: Optional[str] = None,
+    backend: str = "ltl2ba"
 ) -> str:
     """
     Invoke the **nondeterministic** ltl2ba executable to generate a Büchi automaton.
     Replaces Unicode ∧/∨ with &&/|| so the formula parses correctly.
     Raises FileNotFoundError if the executable cannot be found.
+
+    Results are cached in memory and under *cache_dir* (default LTL2BA_CACHE_DIR),
+    keyed on the normalized formula and the translator version.
+
+    With backend="native" the never claim is produced in-process instead.
     """
-    # Try to resolve local path first
-    local_path = os.path.join(os.path.dirname(__file__), "ltl2ba.exe")
-    if os.path.isfile(local_path):
-        path = local_path
-    elif os.path.isfile(ltl2ba_path):
-        path = ltl2ba_path
-    elif shutil.which(ltl2ba_path) is not None:
-        path = shutil.which(ltl2ba_path)
-    else:
-        raise FileNotFoundError(
-            f"ltl2ba executable not found (tried local 'ltl2ba.exe' and PATH)"
-        )
+    _check_backend(backend)
 
     # clean formula
-    cleaned = ltl_formula.replace("∧", "&&").replace("∨", "||")
+    cleaned = _normalize_formula(ltl_formula)
+
+    if backend == "native":
+        return ltl_translator.to_never_claim(cleaned)
+
+    path = _resolve_ltl2ba(ltl2ba_path)
+
+    if use_cache:
+        cache_dir = cache_dir or LTL2BA_CACHE_DIR
+        key = _cache_key(cleaned, _translator_version(path))
+        raw = _cache_get(key, cache_dir)
+        if raw is not None:
+            return raw
 
     # run without '-d' to keep it nondeterministic
     result = subprocess.run(
@@ -39,6 +164,9 @@ def run_ltl2ba(
         text=True,
         check=True
     )
+
+    if use_cache:
+        _cache_put(key, result.stdout, cache_dir)
     return result.stdout
 
 
@@ -99,11 +227,16 @@ def parse_ltl2ba_output(ba_raw: str) -> nx.MultiDiGraph:
 
 def ltl_to_nba(
     ltl_formula: str,
-    ltl2ba_path: str = "ltl2ba.exe"
+    ltl2ba_path: str = "ltl2ba.exe",
+    backend: str = "ltl2ba"
 ) -> nx.MultiDiGraph:
     """
     Convenience wrapper: runs ltl2ba then parses the output.
+    The native backend builds the graph directly, skipping the text round-trip.
     """
+    _check_backend(backend)
+    if backend == "native":
+        return ltl_translator.translate(_normalize_formula(ltl_formula))
     raw = run_ltl2ba(ltl_formula, ltl2ba_path)
     return parse_ltl2ba_output(raw)
 
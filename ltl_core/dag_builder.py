@@ -1,11 +1,11 @@
 import re
 import networkx as nx
 import matplotlib.pyplot as plt
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Set
 from collections import defaultdict
 from networkx.drawing.nx_agraph import graphviz_layout
 
-from .buchi_graph import run_ltl2ba, parse_ltl2ba_output
+from .buchi_graph import ltl_to_nba
 
 
 # --------------------------------------------------------------------------- #
@@ -39,7 +39,12 @@ def _all_children(formula: str) -> List[str]:
     return _AP_RE.findall(formula)
 
 
-def build_dag(specification) -> nx.DiGraph:
+def build_dag(specification, backend: str = "ltl2ba", compiled=None) -> nx.DiGraph:
+    """
+    Build the formula DAG (parent→child and pairwise-order edges).
+    If *compiled* (a CompiledSpec) is given its precedence pairs are reused,
+    otherwise every formula is translated here.
+    """
     composite_names, atomic_names = specification.get_all_function_names()
     G = nx.DiGraph()
 
@@ -68,7 +73,11 @@ def build_dag(specification) -> nx.DiGraph:
                     print(f"parent→child:    {parent} → {child}")
 
             if formula.strip():
-                for a, b in extract_pairwise_order_ltl2ba(formula):
+                if compiled is not None:
+                    order = compiled.pairwise_order(parent)
+                else:
+                    order = extract_pairwise_order_ltl2ba(formula, backend=backend)
+                for a, b in order:
                     if a in G and b in G and not G.has_edge(a, b):
                         G.add_edge(a, b)
                         print(f"pairwise order:  {parent}: {a} → {b}")
@@ -89,53 +98,145 @@ def build_dag(specification) -> nx.DiGraph:
 
 
 # --------------------------------------------------------------------------- #
-# ltl2ba-based ordering extraction (unchanged except refactor)
+# ltl2ba-based ordering extraction
 # --------------------------------------------------------------------------- #
-def extract_pairwise_order_ltl2ba(formula: str) -> List[Tuple[str, str]]:
-    raw = run_ltl2ba(formula)
-    nba = parse_ltl2ba_output(raw)  # MultiDiGraph
+ORDER_ENGINES = ("reachability", "traces")
+
+
+def extract_pairwise_order_ltl2ba(
+    formula: str,
+    backend: str = "ltl2ba",
+    engine: str = "reachability"
+) -> List[Tuple[str, str]]:
+    """
+    Return pairs (a, b) such that AP a precedes AP b on every accepting run
+    of the formula's NBA.
+
+    engine="reachability" decides this with reachability sets on the NBA in
+    polynomial time; engine="traces" is the original exhaustive enumeration
+    of init-to-accepting paths, kept as a reference.
+    """
+    nba = ltl_to_nba(formula, backend=backend)  # MultiDiGraph
+    return pairwise_order_from_nba(nba, formula, engine=engine)
+
+
+def pairwise_order_from_nba(
+    nba: nx.MultiDiGraph,
+    formula: str,
+    engine: str = "reachability"
+) -> List[Tuple[str, str]]:
+    """Pairwise order of an already translated *formula* (see extract_pairwise_order_ltl2ba)."""
+    if engine not in ORDER_ENGINES:
+        raise ValueError(f"Unknown order engine '{engine}' (expected one of {ORDER_ENGINES})")
+
     init = next(iter(nba.nodes), None)
     accepting = {n for n in nba if "accept" in n.lower()}
     pairs: List[Tuple[str, str]] = []
 
     # ---------- strict ordering via path analysis ----------
     if init and accepting:
-        traces: List[List[str]] = []
-
-        def dfs(u: str, trace: List[str]):
-            if u in accepting:
-                traces.append(trace)
-                return
-            for _, v, d in nba.out_edges(u, data=True):
-                dfs(v, trace + [d["label"]])
-
-        dfs(init, [])
-
-        before, co = defaultdict(int), defaultdict(int)
-        for tr in traces:
-            unique = set(tr)
-            for a in unique:
-                for b in unique:
-                    if a != b:
-                        co[(a, b)] += 1
-            for i, a in enumerate(tr):
-                for b in tr[i + 1 :]:
-                    before[(a, b)] += 1
-
-        for (a, b), cnt in before.items():
-            if cnt == co[(a, b)] > 0 and before.get((b, a), 0) == 0:
-                pairs.append((a, b))
-
-    # ---------- simple regex fallback for OR-formulas ----------
-    if not pairs and ("||" in formula or "∨" in formula):
+        if engine == "traces":
+            pairs = _order_from_traces(nba, init, accepting)
+        else:
+            pairs = _order_from_reachability(nba, init, accepting)
+
+    if not pairs:
+        pairs = regex_or_order(formula)
+    return pairs
+
+
+def regex_or_order(formula: str) -> List[Tuple[str, str]]:
+    """Simple regex fallback for OR-formulas: "a && <> b" inside a disjunct orders a before b."""
+    pairs: List[Tuple[str, str]] = []
+    if "||" in formula or "∨" in formula:
         for part in re.split(r"\|\||∨", formula):
             m = re.search(r"(p_[A-Za-z0-9_]+)\s*&&\s*<>\s*(p_[A-Za-z0-9_]+)", part)
             if m:
                 pairs.append((m.group(1), m.group(2)))
+    return pairs
+
 
+def _order_from_traces(nba: nx.MultiDiGraph, init: str, accepting: Set[str]) -> List[Tuple[str, str]]:
+    pairs: List[Tuple[str, str]] = []
+    traces: List[List[str]] = []
+
+    def dfs(u: str, trace: List[str]):
+        if u in accepting:
+            traces.append(trace)
+            return
+        for _, v, d in nba.out_edges(u, data=True):
+            dfs(v, trace + [d["label"]])
+
+    dfs(init, [])
+
+    before, co = defaultdict(int), defaultdict(int)
+    for tr in traces:
+        unique = set(tr)
+        for a in unique:
+            for b in unique:
+                if a != b:
+                    co[(a, b)] += 1
+        for i, a in enumerate(tr):
+            for b in tr[i + 1 :]:
+                before[(a, b)] += 1
+
+    for (a, b), cnt in before.items():
+        if cnt == co[(a, b)] > 0 and before.get((b, a), 0) == 0:
+            pairs.append((a, b))
     return pairs
 
 
+def _order_from_reachability(nba: nx.MultiDiGraph, init: str, accepting: Set[str]) -> List[Tuple[str, str]]:
+    """
+    a precedes b iff some accepting run reads a and later b, and no accepting
+    run reads b and later a. Runs stop at the first accepting state, as in the
+    trace enumeration. "Reads a, later b" exists iff an a-edge u1→v1 and a
+    b-edge u2→v2 both lie on init→accept paths and u2 is reachable from v1,
+    so the whole relation comes from one reachability set per node:
+    O(V·E + E·L) for L distinct labels instead of enumerating paths.
+    """
+    def successors(u):
+        return () if u in accepting else nba.successors(u)
+
+    def closure(starts, step):
+        seen, stack = set(starts), list(starts)
+        while stack:
+            for w in step(stack.pop()):
+                if w not in seen:
+                    seen.add(w)
+                    stack.append(w)
+        return seen
+
+    from_init = closure([init], successors)
+    to_accept = closure(accepting, lambda v: (u for u in nba.predecessors(v) if u not in accepting))
+
+    # edges on some init→accept run, in graph order
+    useful = [(u, v, d["label"]) for u, v, d in nba.edges(data=True)
+              if u in from_init and v in to_accept and u not in accepting]
+    out_labels: Dict[str, List[str]] = defaultdict(list)
+    for u, _, label in useful:
+        if label not in out_labels[u]:
+            out_labels[u].append(label)
+
+    useful_nodes = {u for u, _, _ in useful} | {v for _, v, _ in useful}
+
+    def useful_successors(u):
+        return (v for v in successors(u) if v in useful_nodes)
+
+    labels_after: Dict[str, List[str]] = {}
+    before: Dict[Tuple[str, str], None] = {}
+    for _, v, a in useful:
+        if v not in labels_after:
+            reach = closure([v], useful_successors)
+            labels_after[v] = list(dict.fromkeys(
+                lbl for w in nba.nodes if w in reach for lbl in out_labels.get(w, ())))
+        for b in labels_after[v]:
+            if b != a:
+                before[(a, b)] = None
+
+    return [(a, b) for a, b in before if (b, a) not in before]
+
+
 # --------------------------------------------------------------------------- #
 # Optional drawing utilities (unchanged)
 # --------------------------------------------------------------------------- #
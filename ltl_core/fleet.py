@@ -0,0 +1,177 @@
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class Fleet:
+    """
+    Struct-of-arrays storage for agent state, so one call advances every
+    agent's motion and symbolic progress with array ops instead of a Python
+    loop of 2-vector NumPy calls.
+
+    Row i belongs to the Agent whose .fleet is this object and whose .index
+    is i; Agent keeps its attribute API as a view onto that row. Only the
+    *current* symbolic task lives here (name, speed, progress); the per-task
+    history stays in the Agent's own dicts and is synced on task switches.
+
+    The arrays are preallocated and grow geometrically; pos, goal, ... are
+    views of the first len(fleet) rows and are rebound on every add(), so
+    read them through the fleet rather than keeping them; Agent.pos / .goal
+    return copies.
+    """
+
+    # state array -> (row shape, dtype)
+    _COLUMNS = {
+        "pos": ((2,), float),
+        "goal": ((2,), float),
+        "has_goal": ((), bool),
+        "speed": ((), float),
+        "task_active": ((), bool),
+        "task_speed": ((), float),
+        "task_progress": ((), float),
+    }
+
+    def __init__(self, capacity=8):
+        self.agents: List[Any] = []
+        self.labels: List[Optional[str]] = []
+        self.roles: List[str] = []
+        self.tasks: List[Optional[str]] = []
+
+        self._data = {name: np.zeros((capacity,) + shape, dtype=dtype)
+                      for name, (shape, dtype) in self._COLUMNS.items()}
+        self._expose()
+
+    @classmethod
+    def from_agents(cls, agents: Iterable[Any]) -> "Fleet":
+        fleet = cls()
+        fleet.adopt(agents)
+        return fleet
+
+    def __len__(self):
+        return len(self.agents)
+
+    def _grow(self, capacity):
+        n = len(self.agents)
+        for name, old in self._data.items():
+            grown = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            grown[:n] = old[:n]
+            self._data[name] = grown
+
+    def _expose(self):
+        """Point pos, goal, ... at the used rows of the backing arrays."""
+        n = len(self.agents)
+        for name, data in self._data.items():
+            setattr(self, name, data[:n])
+
+    # ---- #
+    # Membership
+    # ---- #
+
+    def add(self, agent, pos, role, label=None, speed=10.0) -> int:
+        """Append a row for *agent* and point the agent at it."""
+        pos = np.asarray(pos, dtype=float)
+        if pos.size != 2:
+            raise ValueError(f"Agent position must be an (x, y) pair, got shape {pos.shape}")
+
+        i = len(self.agents)
+        if i == len(self._data["pos"]):
+            self._grow(max(2 * i, 1))
+        self.agents.append(agent)
+        self.labels.append(label)
+        self.roles.append(role)
+        self.tasks.append(None)
+
+        data = self._data
+        data["pos"][i] = pos.reshape(2)
+        data["goal"][i] = 0.0
+        data["has_goal"][i] = False
+        data["speed"][i] = float(speed)
+        data["task_active"][i] = False
+        data["task_speed"][i] = 0.0
+        data["task_progress"][i] = 0.0
+        self._expose()
+
+        agent.fleet = self
+        agent.index = i
+        return i
+
+    def adopt(self, agents: Iterable[Any]):
+        """
+        Move *agents* (each currently backed by some other Fleet, e.g. the
+        private one an Agent starts with) into this one, keeping their state.
+        """
+        for agent in agents:
+            src, j = agent.fleet, agent.index
+            goal = src.goal[j].copy() if src.has_goal[j] else None
+            task = src.tasks[j]
+            progress = float(src.task_progress[j])
+            speed = float(src.task_speed[j])
+
+            self.add(agent, src.pos[j], src.roles[j], src.labels[j], src.speed[j])
+            i = agent.index
+            if goal is not None:
+                self.goal[i] = goal
+                self.has_goal[i] = True
+            if task is not None:
+                self.tasks[i] = task
+                self.task_active[i] = True
+                self.task_speed[i] = speed
+                self.task_progress[i] = progress
+
+    # ---- #
+    # Snapshot / restore
+    # ---- #
+
+    _ARRAYS = tuple(_COLUMNS)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copies of the state arrays plus each agent's own per-task dicts."""
+        snap = {name: getattr(self, name).copy() for name in self._ARRAYS}
+        snap["tasks"] = list(self.tasks)
+        snap["agents"] = [agent.snapshot() for agent in self.agents]
+        return snap
+
+    def restore(self, snap: Dict[str, Any]):
+        """Restore a snapshot of this same fleet (arrays are copied in place, views stay valid)."""
+        if len(snap["tasks"]) != len(self.agents):
+            raise ValueError(f"Snapshot has {len(snap['tasks'])} agents, fleet has {len(self.agents)}")
+        for name in self._ARRAYS:
+            getattr(self, name)[:] = snap[name]
+        self.tasks[:] = snap["tasks"]
+        for agent, agent_snap in zip(self.agents, snap["agents"]):
+            agent.restore(agent_snap)
+
+    # ---- #
+    # Dynamics
+    # ---- #
+
+    def move_toward_goals(self, dt=1.0):
+        """Vectorized Agent.move_toward_goal over all rows."""
+        if not len(self.agents):
+            return
+        direction = self.goal - self.pos
+        # same reduction as Agent.move_toward_goal, so both paths agree bit for bit
+        dist = np.linalg.norm(direction, axis=-1)
+        step = self.speed * dt
+
+        moving = self.has_goal & (dist >= 1e-5)
+        arrive = moving & (step >= dist)
+        safe = np.where(moving, dist, 1.0)[:, None]
+        advanced = self.pos + direction / safe * step[:, None]
+
+        self.pos[:] = np.where(arrive[:, None], self.goal,
+                               np.where(moving[:, None], advanced, self.pos))
+
+    def step_symbolic(self, dt=1.0):
+        """Vectorized Agent.step_symbolic over all rows."""
+        active = self.task_active
+        self.task_progress[:] = np.where(
+            active, np.minimum(1.0, self.task_progress + self.task_speed * dt), self.task_progress)
+
+    def step(self, dt=1.0):
+        self.move_toward_goals(dt)
+        self.step_symbolic(dt)
+
+    def arrived(self, tol: float = 1e-5) -> np.ndarray:
+        """Boolean mask of agents within *tol* of their goal (Agent.has_arrived)."""
+        diff = self.pos - self.goal
+        return self.has_goal & (np.linalg.norm(diff, axis=-1) < tol)
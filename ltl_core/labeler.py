@@ -1,10 +1,15 @@
 import re
 import random
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from .specification import get_ap_prefix, AP_TYPE_PREFIX_MAP, is_environment_ap
+from .transition_table import APIndex, TransitionTable
 import networkx as nx
 
 
+# Node kinds in Labeler._kind
+_COMPOSITE, _DFA_ATOMIC, _ENV_ATOMIC = 0, 1, 2
+
+
 class Labeler:
     """
     Tracks decomposed-LTL formulas φ(k,i) via DFA states, extracts atomic
@@ -16,7 +21,7 @@ class Labeler:
     (levels 1–3) are updated bottom-up once all children are complete.
     """
 
-    def __init__(self, spec):
+    def __init__(self, spec, max_table_states: int = 4096, incremental: bool = True):
         self.spec = spec
 
         dag = spec.dag
@@ -45,17 +50,119 @@ class Labeler:
         # Initialise DFA states
         self.states: Dict[str, Any] = {}
         for name, dfa in automata.items():
-            if hasattr(dfa, "initial_state"):
-                q0 = dfa.initial_state
-            elif "initial_state" in getattr(dfa, "graph", {}):
-                q0 = dfa.graph["initial_state"]
-            else:
-                indeg = dict(dfa.in_degree())
-                q0 = next((n for n, d in indeg.items() if d == 0), None)
+            q0 = self._initial_state(dfa)
             if q0 is None:
                 raise RuntimeError(f"DFA '{name}' missing initial_state")
             self.states[name] = q0
 
+        # Node tables, built once: node id = position in dag.nodes, followed by
+        # any names only referenced as predecessors / children
+        self._nodes: List[str] = list(self.dag.nodes)
+        self._n_dag = len(self._nodes)
+        self._node_index: Dict[str, int] = {n: i for i, n in enumerate(self._nodes)}
+        self._atomic = frozenset(self.dag.graph.get("atomic_names", [])) | frozenset(self.leafs)
+        self._leaf_set = frozenset(self.leafs)
+
+        self._kind = bytearray(self._n_dag)
+        self._is_gate = bytearray(self._n_dag)
+        self._parents: List[Tuple[int, ...]] = []
+        self._mandatory: List[Tuple[int, ...]] = []
+        self._alt_groups: List[Tuple[Tuple[int, ...], ...]] = []
+        self._temporal_preds: List[Tuple[int, ...]] = []
+        self._structural_parents: List[Tuple[int, ...]] = []
+        for i, node in enumerate(self._nodes[:self._n_dag]):
+            if node in self._atomic:
+                self._kind[i] = _DFA_ATOMIC if node in automata else _ENV_ATOMIC
+            if node.startswith(("p_foundgate_", "p_notfoundgate_")):
+                self._is_gate[i] = 1
+            attrs = self.dag.nodes[node]
+            self._parents.append(self._ids(self.dag.predecessors(node)))
+            self._mandatory.append(self._ids(attrs.get("mandatory", [])))
+            self._alt_groups.append(tuple(self._ids(g) for g in attrs.get("alt_groups", [])))
+            temporal = list(dict.fromkeys(self.pair_preds.get(node, [])))
+            self._temporal_preds.append(self._ids(temporal))
+            self._structural_parents.append(
+                self._ids(p for p in dict.fromkeys(self.preds_map.get(node, [])) if p not in temporal))
+
+        self._formula_ids = self._ids(self.formulas)
+        self._env_ids = [i for i in range(self._n_dag) if self._kind[i] == _ENV_ATOMIC]
+        self._ap_pred_ids: Dict[str, Tuple[int, ...]] = {
+            ap: self._ids(self.pair_preds.get(ap, []))
+            for aps in self.leaf_APs_map.values() for ap in aps
+        }
+
+        self._temporal_succs: List[List[int]] = [[] for _ in self._nodes]
+        self._structural_children: List[List[int]] = [[] for _ in self._nodes]
+        for i in range(self._n_dag):
+            for p in self._temporal_preds[i]:
+                self._temporal_succs[p].append(i)
+            for p in self._structural_parents[i]:
+                self._structural_children[p].append(i)
+
+        # Structural parents before children, so a single sweep of
+        # _update_unlocked reaches the fixed point (dag.nodes order otherwise)
+        indeg = [sum(1 for p in self._structural_parents[i] if p < self._n_dag) for i in range(self._n_dag)]
+        order = [i for i in range(self._n_dag) if indeg[i] == 0]
+        for i in order:
+            for c in self._structural_children[i]:
+                indeg[c] -= 1
+                if indeg[c] == 0:
+                    order.append(c)
+        self._sweep_acyclic = len(order) == self._n_dag
+        self._sweep_order = order if self._sweep_acyclic else list(range(self._n_dag))
+
+        # Integer transition tables for the atomic automata stepped every tick;
+        # the automata themselves stay the reference / visualization view
+        self.ap_index = APIndex()
+        self.tables: Dict[str, TransitionTable] = {}
+        self._dfa_ids: List[int] = []
+        self._table_of: List[Optional[TransitionTable]] = [None] * self._n_dag
+        self._sid = [0] * self._n_dag
+        for i in range(self._n_dag):
+            if self._kind[i] != _DFA_ATOMIC:
+                continue
+            node = self._nodes[i]
+            self._dfa_ids.append(i)
+            try:
+                table = TransitionTable(automata[node], self.states[node], self.ap_index, max_states=max_table_states)
+            except ValueError as e:
+                print(f"[WARN] No transition table for '{node}' ({e}); stepping the automaton directly")
+                continue
+            self.tables[node] = table
+            self._table_of[i] = table
+
+        # Incremental mode: only automata subscribed to newly true APs, or that
+        # moved on the previous tick, are stepped, and unlocked / locked are
+        # propagated from the nodes whose completion status changed
+        self.incremental = incremental
+        self._ap_subscribers: Dict[str, List[int]] = {}
+        for i in self._dfa_ids:
+            table = self._table_of[i]
+            if table is None:
+                continue
+            alphabet = 0
+            for enabled in table.enabled:
+                alphabet |= enabled
+            while alphabet:
+                low = alphabet & -alphabet
+                ap = self.ap_index.names[low.bit_length() - 1]
+                self._ap_subscribers.setdefault(ap, []).append(i)
+                alphabet ^= low
+        self._untabled = [i for i in self._dfa_ids if self._table_of[i] is None]
+
+        # Status arrays mirroring _completed / unlocked by node id
+        self._done = bytearray(len(self._nodes))
+        self._open = bytearray(len(self._nodes))
+        # mark_completed() / reset() bump _version; advance() catches up
+        self._version = 0
+        self._seen_version = 0
+        self._primed = False
+        self._prev_aps: Set[str] = set()
+        self._moved: Set[int] = set()
+        self._pending_gates: Set[int] = set()
+        self._locked_ids: List[int] = []
+        self._unlocked_aps: Optional[Set[str]] = None
+
         self.current_aps: Set[str] = set()
         self._completed: Set[str] = set()
         self.unlocked: List[str] = []
@@ -71,6 +178,10 @@ class Labeler:
 
         self.chosen_gate_per_group = {}  # key = group, value = chosen gate
 
+        # group -> ordered tasks, valid for one BindingManager.groups_version
+        self._group_order_cache: Dict[str, List[str]] = {}
+        self._group_order_version = None
+
     # ------------------------------------------------------------------ #
     # Public helpers
     # ------------------------------------------------------------------ #
@@ -78,19 +189,62 @@ class Labeler:
     def reset(self):
         """Reset DFA states and clear AP / completion tracking."""
         for name, dfa in self.automata.items():
-            if hasattr(dfa, "initial_state"):
-                self.states[name] = dfa.initial_state
-            elif "initial_state" in getattr(dfa, "graph", {}):
-                self.states[name] = dfa.graph["initial_state"]
-            else:
-                indeg = dict(dfa.in_degree())
-                self.states[name] = next((n for n, d in indeg.items() if d == 0), None)
+            self.states[name] = self._initial_state(dfa)
+        self._sid = [0] * self._n_dag
 
         self.current_aps = set()
         self._completed = set()
+        self._version += 1
+        self._sync_completed()
         self._update_unlocked()
         self._update_locked()
 
+        self._primed = False
+        self._prev_aps = set()
+        self._moved = set()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Copy of the mutable labeling state (DFA states, completion / status
+        sets, incremental bookkeeping). The DAG, automata and transition
+        tables are shared, not copied.
+        """
+        return {
+            "states": dict(self.states),
+            "sid": list(self._sid),
+            "completed": set(self._completed),
+            "done": bytes(self._done),
+            "open": bytes(self._open),
+            "unlocked": list(self.unlocked),
+            "locked": list(self.locked),
+            "locked_ids": list(self._locked_ids),
+            "pending_gates": set(self._pending_gates),
+            "moved": set(self._moved),
+            "prev_aps": set(self._prev_aps),
+            "current_aps": set(self.current_aps),
+            "primed": self._primed,
+            "chosen_gate_per_group": dict(self.chosen_gate_per_group),
+        }
+
+    def restore(self, snap: Dict[str, Any]):
+        """Return to a snapshot() (which stays reusable for further restores)."""
+        self.states = dict(snap["states"])
+        self._sid = list(snap["sid"])
+        self._completed = set(snap["completed"])
+        self._done = bytearray(snap["done"])
+        self._open = bytearray(snap["open"])
+        self.unlocked = list(snap["unlocked"])
+        self.locked = list(snap["locked"])
+        self._locked_ids = list(snap["locked_ids"])
+        self._pending_gates = set(snap["pending_gates"])
+        self._moved = set(snap["moved"])
+        self._prev_aps = set(snap["prev_aps"])
+        self.current_aps = set(snap["current_aps"])
+        self._primed = snap["primed"]
+        self.chosen_gate_per_group = dict(snap["chosen_gate_per_group"])
+        self._seen_version = self._version
+        self._unlocked_aps = None
+
     def extract_APs(self, state) -> Set[str]:
         """
         Convert the workspace state into a set of currently true atomic propositions (APs),
@@ -158,46 +312,21 @@ class Labeler:
 
     def advance(self, true_APs: Set[str]) -> None:
         """Advance the labeler one step, given the set of true AP tokens."""
-        updated: Set[str] = set()
-
-        # Step 1 — advance DFA transitions for atomic nodes that have a DFA
-        for node in self.dag.nodes:
-            if node in self.automata and self._is_atomic_node(node):
-                state = self.states[node]
-                next_state = state
-                advanced = False
-
-                for _, tgt, data in self.automata[node].out_edges(state, data=True):
-                    label = data.get("label")
-                    label_set: Set[str] = {label} if isinstance(label, str) else set(label)
-
-                    if label_set & true_APs:
-                        next_state = tgt
-                        advanced = True
-                        break
-
-                self.states[node] = next_state
+        external = self._sync_completed()
 
-                if self._is_accepting(self.automata[node], next_state):
-                    if node not in self._completed:
-                        self._completed.add(node)
-                        updated.add(node)
-
-        # Step 2 — environment-driven atomic nodes with no DFA (p_found, p_notfound, etc.)
-        for node in self.dag.nodes:
-            if self._is_atomic_node(node) and node not in self.automata:
-                if node in true_APs and node not in self._completed:
-                    self._completed.add(node)
-                    updated.add(node)
+        if self.incremental and self._primed:
+            updated = self._step_changed(true_APs)
+        else:
+            updated = self._step_all(true_APs)
 
         # Step 3 — env-disjunctive gates (e.g., p_foundgate_0_0_0_0 or p_notfoundgate_0_0_0_0)
         gates_by_group = {}
-        for node in self.dag.nodes:
-            if node.startswith(("p_foundgate_", "p_notfoundgate_")):
-                if node in self.unlocked and node not in self._completed:
-                    # group = "_".join(node.split("_")[2:6])  # e.g., 0_0_0_0
-                    tid = node.split("_")[2]  # shared group
-                    gates_by_group.setdefault(tid, []).append(node)
+        for i in sorted(self._pending_gates):
+            if not self._done[i]:
+                node = self._nodes[i]
+                # group = "_".join(node.split("_")[2:6])  # e.g., 0_0_0_0
+                tid = node.split("_")[2]  # shared group
+                gates_by_group.setdefault(tid, []).append(node)
 
         # Found or Not found
         for group, gate_list in gates_by_group.items():
@@ -213,108 +342,323 @@ class Labeler:
             # print(f"[DEBUG] Disjunctive group: {group}, candidates: {gate_list}, chosen: {chosen}")
 
             if chosen not in self._completed:
-                self._completed.add(chosen)
-                updated.add(chosen)
+                self._mark_completed(chosen, updated)
 
         # Step 4 — propagate completions upward in the DAG
-        self._propagate_completions(updated)
+        newly_completed = self._propagate_completions(updated)
 
         # Step 5 — refresh unlocked / locked lists
-        self._update_unlocked()
-        self._update_locked()
+        if self.incremental and self._primed and external is not None:
+            self._refresh_status(external + newly_completed)
+        else:
+            self._update_unlocked()
+            self._update_locked()
+            self._primed = True
+        self._seen_version = self._version
+        self._prev_aps = set(true_APs)
+
+    def _mark_completed(self, node: str, updated: List[int]):
+        self._completed.add(node)
+        i = self._node_index.get(node)
+        if i is not None:
+            self._done[i] = 1
+            updated.append(i)
+
+    def _sync_completed(self) -> Optional[List[int]]:
+        """
+        Pick up completions made outside advance() through mark_completed()
+        (e.g. a GUI marking a verification done). Returns the ids completed
+        externally, or None if completions were removed and the status must
+        be rebuilt.
+        """
+        completed = self._completed
+        if self._version == self._seen_version:
+            return []
+        self._seen_version = self._version
+        index = self._node_index
+        known = {self._nodes[i] for i in range(len(self._nodes)) if self._done[i]}
+        if not known <= completed:
+            self._done = bytearray(len(self._nodes))
+            for node in completed:
+                if node in index:
+                    self._done[index[node]] = 1
+            return None
+        added = []
+        for node in completed - known:
+            if node in index:
+                self._done[index[node]] = 1
+                added.append(index[node])
+        return added
+
+    def _step_dfa_node(self, i: int, mask: int, true_APs: Set[str], updated: List[int]) -> bool:
+        """Step one atomic automaton; returns True if its state changed."""
+        table = self._table_of[i]
+        if table is not None:
+            sid = self._sid[i]
+            next_sid = table.step(sid, mask)
+            if next_sid != sid:
+                self._sid[i] = next_sid
+                self.states[self._nodes[i]] = table.states[next_sid]
+
+            if table.accepting[next_sid] and not self._done[i]:
+                self._mark_completed(self._nodes[i], updated)
+            return next_sid != sid
+
+        node = self._nodes[i]
+        state = self.states[node]
+        next_state = state
+        for _, tgt, data in self.automata[node].out_edges(state, data=True):
+            label = data.get("label")
+            label_set: Set[str] = {label} if isinstance(label, str) else set(label)
+
+            if label_set & true_APs:
+                next_state = tgt
+                break
+
+        self.states[node] = next_state
+
+        if self._is_accepting(self.automata[node], next_state):
+            if not self._done[i]:
+                self._mark_completed(node, updated)
+        return next_state != state
+
+    def _step_all(self, true_APs: Set[str]) -> List[int]:
+        """Steps 1–2 over every atomic node."""
+        updated: List[int] = []
+
+        # Step 1 — advance DFA transitions for atomic nodes that have a DFA
+        mask = self.ap_index.mask(true_APs)
+        self._moved = set()
+        for i in self._dfa_ids:
+            if self._step_dfa_node(i, mask, true_APs, updated):
+                self._moved.add(i)
+
+        # Step 2 — environment-driven atomic nodes with no DFA (p_found, p_notfound, etc.)
+        for i in self._env_ids:
+            if not self._done[i] and self._nodes[i] in true_APs:
+                self._mark_completed(self._nodes[i], updated)
+
+        return updated
+
+    def _step_changed(self, true_APs: Set[str]) -> List[int]:
+        """
+        Steps 1–2 restricted to what the AP delta can affect. Transitions fire
+        on APs being true, so an automaton that did not move last tick can only
+        move if one of its APs became true; one that moved may move again on
+        APs that stayed true.
+        """
+        updated: List[int] = []
+        added = true_APs - self._prev_aps
+
+        candidates = self._moved.union(self._untabled)
+        for ap in added:
+            candidates.update(self._ap_subscribers.get(ap, ()))
+
+        # Step 1 — same node order as a full pass
+        mask = self.ap_index.mask(true_APs) if candidates else 0
+        self._moved = set()
+        for i in sorted(candidates):
+            if self._step_dfa_node(i, mask, true_APs, updated):
+                self._moved.add(i)
+
+        # Step 2 — environment APs that just became true
+        index, kind = self._node_index, self._kind
+        env = [index[ap] for ap in added if ap in index and index[ap] < self._n_dag]
+        for i in sorted(env):
+            if kind[i] == _ENV_ATOMIC and not self._done[i]:
+                self._mark_completed(self._nodes[i], updated)
+
+        return updated
 
     # ------------------------------------------------------------------ #
     # Internal helpers
     # ------------------------------------------------------------------ #
 
-    def _propagate_completions(self, changed_nodes: Set[str]):
+    @staticmethod
+    def _initial_state(dfa: Any) -> Any:
+        if hasattr(dfa, "initial_state"):
+            return dfa.initial_state
+        if "initial_state" in getattr(dfa, "graph", {}):
+            return dfa.graph["initial_state"]
+        indeg = dict(dfa.in_degree())
+        return next((n for n, d in indeg.items() if d == 0), None)
+
+    def _ids(self, names: Iterable[str]) -> Tuple[int, ...]:
+        """Node ids for *names*, numbering names outside the DAG after its nodes."""
+        out = []
+        for name in names:
+            i = self._node_index.get(name)
+            if i is None:
+                i = self._node_index[name] = len(self._nodes)
+                self._nodes.append(name)
+            out.append(i)
+        return tuple(out)
+
+    def _propagate_completions(self, changed_nodes: List[int]) -> List[int]:
         """
         Bottom-up propagation that respects AND / OR semantics.
 
         A composite node becomes *completed* when:
         - every child in ``mandatory`` is completed, and
         - for each alt-group in ``alt_groups`` at least one child is completed.
+
+        Returns the changed nodes followed by the parents completed here.
         """
-        stack, visited = list(changed_nodes), set()
+        done = self._done
+        stack, visited = list(changed_nodes), []
+        seen = set()
 
         while stack:
-            node = stack.pop()
-            if node in visited:
+            i = stack.pop()
+            if i in seen:
+                continue
+            seen.add(i)
+            visited.append(i)
+            if i >= self._n_dag:
                 continue
-            visited.add(node)
 
-            for parent in self.dag.predecessors(node):
-                if parent in self._completed:        # already done
+            for parent in self._parents[i]:
+                if done[parent]:        # already done
                     continue
-                if self._is_parent_completed(parent):
-                    self._completed.add(parent)
+                if self._parent_done(parent):
+                    self._completed.add(self._nodes[parent])
+                    done[parent] = 1
                     stack.append(parent)
 
+        return visited
+
     def _is_atomic_node(self, node: str) -> bool:
         """
         A node is atomic if it is (a) one of the concrete AP tokens in the DAG
         or (b) a level-4 formula name.
         """
-        atomic_tokens = set(self.dag.graph.get("atomic_names", []))
-        leaf_formulas = set(self.leafs)
-        return node in atomic_tokens or node in leaf_formulas
+        return node in self._atomic
 
     def _update_unlocked(self):
         """
         Re-compute the list of unlocked formulas. We iterate at most |V|
-        times to avoid infinite propagation loops.
+        times to avoid infinite propagation loops; with acyclic structural
+        parents one sweep in _sweep_order is enough.
         """
-        self.unlocked = []
-        completed = set(self._completed)
-        unlocked_set: Set[str] = set()
+        done = self._done
+        unlocked = bytearray(len(self._nodes))
+        temporal_preds, structural_parents = self._temporal_preds, self._structural_parents
 
-        for _ in range(len(self.dag.nodes)):
+        for _ in range(self._n_dag):
             changed = False
-            for node in self.dag.nodes:
-                if node in completed or node in unlocked_set:
+            for i in self._sweep_order:
+                if done[i] or unlocked[i]:
                     continue
 
-                temporal_preds = set(self.pair_preds.get(node, []))
                 # All temporal predecessors must be completed
-                if temporal_preds and not temporal_preds <= completed:
+                ok = True
+                for p in temporal_preds[i]:
+                    if not done[p]:
+                        ok = False
+                        break
+                if not ok:
                     continue
 
                 # Structural parents may be either unlocked or completed
-                structural_parents = set(self.preds_map.get(node, [])) - temporal_preds
-                parents_ok = all(
-                    p in unlocked_set or p in completed for p in structural_parents
-                )
-                if not parents_ok:
+                for p in structural_parents[i]:
+                    if not (unlocked[p] or done[p]):
+                        ok = False
+                        break
+                if not ok:
                     continue
 
-                unlocked_set.add(node)
+                unlocked[i] = 1
                 changed = True
 
-            if not changed:
+            if not changed or self._sweep_acyclic:
                 break
 
-        self.unlocked = list(unlocked_set)
+        self._open = unlocked
+        self._pending_gates = {i for i in range(self._n_dag) if unlocked[i] and self._is_gate[i]}
+        self.unlocked = [self._nodes[i] for i in range(self._n_dag) if unlocked[i]]
+        self._unlocked_aps = None
 
     def _update_locked(self):
         """Formulas that are neither completed nor unlocked."""
-        completed = self._completed
-        unlocked = set(self.unlocked)
-        self.locked = [n for n in self.formulas if n not in completed and n not in unlocked]
+        done, unlocked = self._done, self._open
+        self._locked_ids = [i for i in self._formula_ids if not done[i] and not unlocked[i]]
+        self.locked = [self._nodes[i] for i in self._locked_ids]
+
+    def _refresh_status(self, newly_completed: List[int]):
+        """
+        Incremental counterpart of _update_unlocked / _update_locked.
+
+        Completion only grows between resets and the unlock condition is
+        monotone in it, so nodes can only move locked -> unlocked -> completed:
+        re-check the temporal successors and structural children of the newly
+        completed nodes and follow structural children of anything that
+        unlocks.
+        """
+        if not newly_completed:
+            return
+
+        done, unlocked = self._done, self._open
+        temporal_preds, structural_parents = self._temporal_preds, self._structural_parents
+        children = self._structural_children
+        stack: List[int] = []
+        opened: List[int] = []
+        for i in newly_completed:
+            unlocked[i] = 0
+            self._pending_gates.discard(i)
+            stack.extend(self._temporal_succs[i])
+            stack.extend(children[i])
+
+        while stack:
+            i = stack.pop()
+            if done[i] or unlocked[i]:
+                continue
+            if not all(done[p] for p in temporal_preds[i]):
+                continue
+            if not all(unlocked[p] or done[p] for p in structural_parents[i]):
+                continue
+            unlocked[i] = 1
+            opened.append(i)
+            if self._is_gate[i]:
+                self._pending_gates.add(i)
+            stack.extend(children[i])
+
+        index = self._node_index
+        self.unlocked = [n for n in self.unlocked if unlocked[index[n]]]
+        self.unlocked += [self._nodes[i] for i in sorted(opened)]
+        self._locked_ids = [i for i in self._locked_ids if not done[i] and not unlocked[i]]
+        self.locked = [self._nodes[i] for i in self._locked_ids]
+        self._unlocked_aps = None
 
     def get_group_ordered_tasks(self, group):
-        """Return ordered list of APs in a group using pairwise order constraints"""
+        """
+        Return ordered list of APs in a group using pairwise order constraints.
+        Orders are cached per group until the BindingManager registers groups
+        again; the returned list is shared, do not modify it.
+        """
         if not self.binding_manager:
             return []
 
-        tasks = list(self.binding_manager.group_to_tasks.get(group, []))
+        version = self.binding_manager.groups_version
+        if version != self._group_order_version:
+            self._group_order_cache = {}
+            self._group_order_version = version
+        ordered = self._group_order_cache.get(group)
+        if ordered is None:
+            ordered = self._group_order_cache[group] = self._order_group_tasks(group)
+        return ordered
+
+    def _order_group_tasks(self, group) -> List[str]:
+        # sorted so the order of unconstrained tasks does not follow set hashing
+        tasks = sorted(self.binding_manager.group_to_tasks.get(group, []))
         if not tasks:
             return []
 
+        members = set(tasks)
         predecessors = {task: [] for task in tasks}
         for task in tasks:
             preds = self.pair_preds.get(task, [])
             for pred in preds:
-                if pred in tasks:
+                if pred in members:
                     predecessors[task].append(pred)
 
         ordered = []
@@ -340,6 +684,15 @@ class Labeler:
     def get_completed(self) -> List[str]:
         return list(self._completed)
 
+    def mark_completed(self, ap: str) -> None:
+        """
+        Mark *ap* completed from outside the automata (e.g. a human answering
+        a verification); picked up by the next advance().
+        """
+        if ap not in self._completed:
+            self._completed.add(ap)
+            self._version += 1
+
     def get_unlocked(self) -> List[str]:
         return self.unlocked
 
@@ -347,10 +700,18 @@ class Labeler:
         return self.locked
 
     def get_unlocked_leaf_formulas(self) -> List[str]:
-        leaf_set = set(self.leafs)
+        leaf_set = self._leaf_set
         return [f for f in self.unlocked if f in leaf_set]
 
     def get_unlocked_APs(self) -> Set[str]:
+        # cached between status changes; completions added from outside
+        # advance() are not in the status arrays yet, so check by name then
+        external = self._version != self._seen_version
+        if self._unlocked_aps is not None and not external:
+            return set(self._unlocked_aps)
+
+        done = self._done
+        completed = self._completed
         aps: Set[str] = set()
 
         # 1) team-driven leaves
@@ -359,23 +720,28 @@ class Labeler:
                 continue  # handled below
             ap_candidates = self.leaf_APs_map.get(leaf, set())
             for ap in ap_candidates:
-                preds = self.pair_preds.get(ap, [])
-                if all(p in self._completed for p in preds):
+                if external:
+                    ready = all(p in completed for p in self.pair_preds.get(ap, []))
+                else:
+                    ready = all(done[p] for p in self._ap_pred_ids[ap])
+                if ready:
                     aps.add(ap)
 
         # 2) env-driven gates (p_foundgate_* and p_notfoundgate_*) — disjunctive logic
         gates_by_group = {}
 
-        for leaf in self.leafs:
-            if leaf.startswith(("p_foundgate_", "p_notfoundgate_")):
-                if leaf in self.unlocked and leaf not in self._completed:
-                    group = "_".join(leaf.split("_")[2:6])  # e.g., 0_0_0_0
-                    gates_by_group.setdefault(group, []).append(leaf)
+        for i in sorted(self._pending_gates):
+            leaf = self._nodes[i]
+            if leaf in self._leaf_set and leaf not in completed:
+                group = "_".join(leaf.split("_")[2:6])  # e.g., 0_0_0_0
+                gates_by_group.setdefault(group, []).append(leaf)
 
         for group, gate_list in gates_by_group.items():
             chosen_gate = sorted(gate_list)[0]  # deterministic: pick p_foundgate over p_notfoundgate if both unlocked
             aps.update(self.leaf_APs_map.get(chosen_gate, set()))
 
+        if not external:
+            self._unlocked_aps = set(aps)
         return aps
 
     # ------------------------------------------------------------------ #
@@ -437,16 +803,19 @@ class Labeler:
         Return True ⇔ *all* mandatory children are complete **and**
         for every alternative-group, at least one member is complete.
         """
-        mandatory = self.dag.nodes[parent].get("mandatory", [])
-        alt_groups = self.dag.nodes[parent].get("alt_groups", [])
+        return self._parent_done(self._node_index[parent])
+
+    def _parent_done(self, i: int) -> bool:
+        done = self._done
 
         # mandatory children
-        if any(c not in self._completed for c in mandatory):
-            return False
+        for c in self._mandatory[i]:
+            if not done[c]:
+                return False
 
         # each OR-group must contribute ≥ 1 completed child
-        for group in alt_groups:
-            if not any(c in self._completed for c in group):
+        for group in self._alt_groups[i]:
+            if not any(done[c] for c in group):
                 return False
 
         return True
@@ -0,0 +1,294 @@
+import re
+from collections import deque
+from typing import Dict, FrozenSet, List, Tuple
+import networkx as nx
+
+
+# Formula nodes are plain hashable tuples so they can live inside frozensets:
+#   ("true",) | ("false",) | ("ap", name) | ("ev", child)
+#   ("and", (child, ...)) | ("or", (child, ...))
+TRUE = ("true",)
+FALSE = ("false",)
+
+_TOKEN_RE = re.compile(r"\s*(<>|\[\]|<->|->|&&|\|\||∧|∨|[()!]|[A-Za-z_][A-Za-z0-9_]*)")
+_UNSUPPORTED = {"[]", "!", "->", "<->", "U", "V", "R", "X", "W"}
+
+
+# --------------------------------------------------------------------------- #
+# Parsing
+# --------------------------------------------------------------------------- #
+def _tokenize(formula: str) -> List[str]:
+    text = formula.strip()
+    tokens: List[str] = []
+    pos = 0
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if not m:
+            raise ValueError(f"Cannot tokenize LTL formula at offset {pos}: {formula!r}")
+        tok = m.group(1)
+        if tok in _UNSUPPORTED:
+            raise ValueError(f"Operator '{tok}' is not supported by the native translator: {formula!r}")
+        tokens.append({"∧": "&&", "∨": "||"}.get(tok, tok))
+        pos = m.end()
+    return tokens
+
+
+def _make(kind: str, children: List[Tuple]) -> Tuple:
+    """Build a flattened, lightly simplified and/or node."""
+    absorbing, neutral = (FALSE, TRUE) if kind == "and" else (TRUE, FALSE)
+    flat: List[Tuple] = []
+    for c in children:
+        if c == absorbing:
+            return absorbing
+        if c == neutral:
+            continue
+        for sub in (c[1] if c[0] == kind else (c,)):
+            if sub not in flat:
+                flat.append(sub)
+    if not flat:
+        return neutral
+    if len(flat) == 1:
+        return flat[0]
+    return (kind, tuple(flat))
+
+
+def _eventually(child: Tuple) -> Tuple:
+    if child in (TRUE, FALSE) or child[0] == "ev":
+        return child
+    return ("ev", child)
+
+
+class _Parser:
+    def __init__(self, formula: str):
+        self.formula = formula
+        self.tokens = _tokenize(formula)
+        self.i = 0
+
+    def peek(self):
+        return self.tokens[self.i] if self.i < len(self.tokens) else None
+
+    def take(self, expected=None):
+        tok = self.peek()
+        if tok is None or (expected is not None and tok != expected):
+            raise ValueError(f"Expected {expected or 'a token'} in LTL formula: {self.formula!r}")
+        self.i += 1
+        return tok
+
+    def parse(self) -> Tuple:
+        node = self.parse_or()
+        # ltl2ba stops at the end of the first complete formula; mirror that for
+        # stray closing parentheses (e.g. "<> p_verify_0)")
+        while self.peek() == ")":
+            self.i += 1
+        if self.peek() is not None:
+            raise ValueError(f"Unexpected token '{self.peek()}' in LTL formula: {self.formula!r}")
+        return node
+
+    def parse_or(self) -> Tuple:
+        children = [self.parse_and()]
+        while self.peek() == "||":
+            self.take()
+            children.append(self.parse_and())
+        return _make("or", children)
+
+    def parse_and(self) -> Tuple:
+        children = [self.parse_unary()]
+        while self.peek() == "&&":
+            self.take()
+            children.append(self.parse_unary())
+        return _make("and", children)
+
+    def parse_unary(self) -> Tuple:
+        tok = self.take()
+        if tok == "<>":
+            return _eventually(self.parse_unary())
+        if tok == "(":
+            node = self.parse_or()
+            self.take(")")
+            return node
+        if tok in ("&&", "||", ")"):
+            raise ValueError(f"Unexpected '{tok}' in LTL formula: {self.formula!r}")
+        if tok == "true":
+            return TRUE
+        if tok == "false":
+            return FALSE
+        return ("ap", tok)
+
+
+def parse_ltl(formula: str) -> Tuple:
+    """
+    Parse the LTL fragment used by the mission specifications (atoms, true/false,
+    '<>', '&&', '||', parentheses) into a tuple-based syntax tree.
+    Raises ValueError on anything outside that fragment.
+    """
+    return _Parser(formula).parse()
+
+
+def atoms_in_order(node: Tuple) -> List[str]:
+    """Return the atomic propositions of *node* in order of first appearance."""
+    out: List[str] = []
+    stack = [node]
+    while stack:
+        n = stack.pop()
+        if n[0] == "ap":
+            if n[1] not in out:
+                out.append(n[1])
+        elif n[0] == "ev":
+            stack.append(n[1])
+        elif n[0] in ("and", "or"):
+            stack.extend(reversed(n[1]))
+    return out
+
+
+# --------------------------------------------------------------------------- #
+# Formula progression
+# --------------------------------------------------------------------------- #
+def _minimize(dnf: List[FrozenSet]) -> List[FrozenSet]:
+    """Drop duplicate and subsumed obligation sets (a superset is never easier)."""
+    kept: List[FrozenSet] = []
+    for s in sorted(set(dnf), key=len):
+        if not any(k <= s for k in kept):
+            kept.append(s)
+    return kept
+
+
+def _conjoin(dnfs: List[List[FrozenSet]]) -> List[FrozenSet]:
+    result: List[FrozenSet] = [frozenset()]
+    for dnf in dnfs:
+        if not dnf:
+            return []
+        result = _minimize([a | b for a in result for b in dnf])
+    return result
+
+
+def _progress(node: Tuple, letter: FrozenSet[str], memo: Dict) -> List[FrozenSet]:
+    """
+    Obligations for the next position if *node* must hold at a position whose
+    true APs are *letter*, as a DNF over sets of formulas.
+    """
+    key = (node, letter)
+    if key in memo:
+        return memo[key]
+    kind = node[0]
+    if kind == "true":
+        res = [frozenset()]
+    elif kind == "false":
+        res = []
+    elif kind == "ap":
+        res = [frozenset()] if node[1] in letter else []
+    elif kind == "ev":
+        res = _minimize(_progress(node[1], letter, memo) + [frozenset((node,))])
+    elif kind == "or":
+        res = _minimize([s for c in node[1] for s in _progress(c, letter, memo)])
+    else:
+        res = _conjoin([_progress(c, letter, memo) for c in node[1]])
+    memo[key] = res
+    return res
+
+
+def _explore(formula: str):
+    """
+    Build the single-AP transition structure of the formula's Büchi automaton.
+
+    States are sets of pending obligations; the empty set is 'accept_all'.
+    Successors reachable under the empty letter are the unconditional '(1)'
+    moves ltl2ba emits; they become states but not labelled edges, and an AP
+    edge into one of them is dropped because ltl2ba folds it into the '(1)'
+    move. Only single-AP letters are explored since parse_ltl2ba_output
+    discards conjunctive guards, so this yields the graph the ltl2ba backend
+    produces after parsing (up to state naming).
+    """
+    root = parse_ltl(formula)
+    aps = atoms_in_order(root)
+    memo: Dict = {}
+    empty_letter: FrozenSet[str] = frozenset()
+
+    if root == TRUE:
+        init = frozenset()
+    elif root[0] == "and":
+        init = frozenset(root[1])
+    else:
+        init = frozenset((root,))
+    accept = frozenset()
+    names: Dict[FrozenSet, str] = {init: "accept_all" if init == accept else "T0_init"}
+    order: List[FrozenSet] = [init]
+    edges: List[Tuple[str, str, str]] = []
+    waits: Dict[str, List[str]] = {}
+
+    def visit(state: FrozenSet) -> str:
+        if state not in names:
+            names[state] = "accept_all" if state == accept else f"T0_S{len(names)}"
+            order.append(state)
+            queue.append(state)
+        return names[state]
+
+    queue = deque([init])
+    while queue and root != FALSE:
+        state = queue.popleft()
+        if state == accept:
+            continue
+        wait = _conjoin([_progress(f, empty_letter, memo) for f in state])
+        waits[names[state]] = [visit(w) for w in wait]
+        for ap in aps:
+            letter = frozenset((ap,))
+            for nxt in _conjoin([_progress(f, letter, memo) for f in state]):
+                if nxt == state or nxt in wait:
+                    continue
+                edges.append((names[state], visit(nxt), ap))
+
+    # accept_all is reachable through conjunctive guards even when no single AP reaches it
+    if root != FALSE and accept not in names:
+        names[accept] = "accept_all"
+        order.append(accept)
+
+    return order, names, edges, waits
+
+
+def translate(formula: str) -> nx.MultiDiGraph:
+    """
+    In-process replacement for ``parse_ltl2ba_output(run_ltl2ba(formula))``.
+    Returns the same MultiDiGraph shape: the initial state is the first node,
+    accepting states are named 'accept_*', edges carry a single-AP 'label'.
+    """
+    order, names, edges, _ = _explore(formula)
+    out_edges: Dict[str, List[Tuple[str, str]]] = {names[s]: [] for s in order}
+    for u, v, ap in edges:
+        out_edges[u].append((ap, v))
+
+    # insert in never-claim order so node order matches the parsed ltl2ba graph
+    G = nx.MultiDiGraph()
+    for state in order:
+        name = names[state]
+        G.add_node(name)
+        for ap, tgt in out_edges[name]:
+            G.add_edge(name, tgt, label=ap)
+    return G
+
+
+def to_never_claim(formula: str) -> str:
+    """
+    Render the native automaton as SPIN never-claim text, the format ltl2ba
+    prints, so it can go through parse_ltl2ba_output or the translation cache.
+    """
+    order, names, edges, waits = _explore(formula)
+    out_edges: Dict[str, List[Tuple[str, str]]] = {names[s]: [] for s in order}
+    for u, v, ap in edges:
+        out_edges[u].append((ap, v))
+
+    lines = [f"never {{ /* {' '.join(formula.split())} */"]
+    for state in order:
+        name = names[state]
+        lines.append(f"{name}:")
+        if not state:
+            lines.append("\tskip")
+            continue
+        moves = [("1", tgt) for tgt in waits.get(name, [])] + out_edges[name]
+        if not moves:
+            lines.append("\tfalse;")
+            continue
+        lines.append("\tif")
+        for guard, tgt in moves:
+            lines.append(f"\t:: ({guard}) -> goto {tgt}")
+        lines.append("\tfi;")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
@@ -1,10 +1,12 @@
+import random
 import numpy as np
 from ltl_core.dag_builder import build_dag
 from ltl_core.automaton_generator import compile_automata
 from ltl_core.specification import get_ap_prefix, AP_TYPE_PREFIX_MAP
+from ltl_core.trace import TraceRecorder
 
 class Simulation:
-    def __init__(self, spec, workspace, allocator, labeler):
+    def __init__(self, spec, workspace, allocator, labeler, trace=None):
         self.spec = spec
         self.workspace = workspace
         self.allocator = allocator
@@ -15,8 +17,8 @@ class Simulation:
         self.dag = spec.dag
         self.automata = spec.automata
 
-        # Episode trace for logging
-        self.episode_trace = []
+        # Episode trace for logging (AP / completion change events, bounded ring by default)
+        self.trace = trace if trace is not None else TraceRecorder()
 
         # Wait for human verification responses
         self.verify_response_pending = set()
@@ -25,16 +27,53 @@ class Simulation:
         self.prev_completed = set()
         self.prev_actions = {}
 
+        # Number of allocator.choose calls so far
+        self.allocator_calls = 0
+
     @staticmethod
     def parse_ap_target_index(ap: str) -> int:
         return int(ap.split("_")[2])
 
     def get_agent_by_label(self, label: str):
-        for agent in self.workspace.get_all_agents():
-            if agent.label == label:
-                return agent
-        return None
+        return self.workspace.get_agent_by_label(label)
     
+    def snapshot(self):
+        """
+        Mission state for what-if rollouts or resuming a session: labeler,
+        bindings, workspace/fleet, allocator and this loop's own bookkeeping,
+        plus the global random state used by the allocator and gate choices.
+        Agents are referenced by label and the spec, DAG and automata are
+        shared, so a snapshot is small and picklable. The trace is not
+        included.
+        """
+        return {
+            "labeler": self.labeler.snapshot(),
+            "binding_manager": self.binding_manager.snapshot(),
+            "workspace": self.workspace.snapshot(),
+            "allocator": self.allocator.snapshot(),
+            "prev_completed": self.prev_completed.copy(),
+            "prev_actions": {a.label: ap for a, ap in self.prev_actions.items()},
+            "verify_response_pending": set(self.verify_response_pending),
+            "allocator_calls": self.allocator_calls,
+            "random": random.getstate(),
+        }
+
+    def restore(self, snap):
+        """Return to a snapshot(); the same snapshot can be restored any number of times."""
+        self.labeler.restore(snap["labeler"])
+        self.binding_manager.restore(snap["binding_manager"])
+        self.workspace.restore(snap["workspace"])
+        self.allocator.restore(snap["allocator"])
+        self.prev_completed = snap["prev_completed"].copy()
+        self.prev_actions = {self.get_agent_by_label(label): ap for label, ap in snap["prev_actions"].items()}
+        self.verify_response_pending = set(snap["verify_response_pending"])
+        self.allocator_calls = snap["allocator_calls"]
+        random.setstate(snap["random"])
+
+    def close(self):
+        """End the episode: flush and close the trace's disk stream, if any."""
+        self.trace.close()
+
     def step(self, dt, verbose=False):
         # Advance agent dynamics
         self.workspace.step_dynamics(dt=dt)
@@ -50,6 +89,7 @@ class Simulation:
 
         if completed != self.prev_completed:
             self.prev_actions = self.allocator.choose(unlocked, completed, current_aps)
+            self.allocator_calls += 1
             self.prev_completed = completed
         actions = self.prev_actions
 
@@ -83,28 +123,7 @@ class Simulation:
                     agent.set_symbolic_task_speed(ap, speed=0.1)
 
         # Idle return-to-base for unassigned drones/GVs
-        for agent in self.workspace.get_all_agents():
-            if agent.role not in ["drones", "gvs"]:
-                continue
-
-            is_idle = (
-                (agent.goal is None or agent.has_arrived())
-                and tuple(agent.pos.astype(int)) not in self.workspace.base_area
-            )
-
-            if is_idle:
-                occupied = {
-                    tuple(a.goal.astype(int)) for a in self.workspace.get_all_agents()
-                    if a.goal is not None
-                }
-                taken_now = {
-                    tuple(a.pos.astype(int)) for a in self.workspace.get_all_agents()
-                }
-                unavailable = occupied | taken_now
-                available_bases = [b for b in self.workspace.base_area if b not in unavailable]
-
-                if available_bases:
-                    agent.goal = np.array(available_bases[0], dtype=float)
+        self.workspace.send_idle_agents_to_base()
 
         # Mark symbolic task complete
         for agent in self.workspace.get_all_agents():
@@ -113,10 +132,7 @@ class Simulation:
                 agent.current_symbolic_task = None
 
         # Optional logging
-        self.episode_trace.append({
-            "aps": sorted(current_aps),
-            "completed": completed
-        })
+        self.trace.record(current_aps, completed)
 
         # print("[Labeling] APs = ", sorted(aps))
         # print(sorted(list(completed)))
@@ -1,7 +1,7 @@
 import re
 from .symbolic_function import SymbolicFunction
 from ltl_core.dag_builder import build_dag
-from ltl_core.automaton_generator import compile_automata
+from ltl_core.automaton_generator import CompiledSpec
 
 ENVIRONMENT_AP_PREFIXES = ["p_found", "p_notfound", "p_verified"]
 AP_TYPE_PREFIX_MAP = {
@@ -32,18 +32,23 @@ class Specification:
         self.binding_manager = None
         self.dag = []
         self.automata = []
+        self.compiled = None
+        self.backend = "ltl2ba"
 
-    def get_task_specification(self, case, s=None, binding_manager=None):
+    def get_task_specification(self, case, s=None, binding_manager=None, backend="ltl2ba", workers=None):
         self.case = case
         self.binding_manager = binding_manager
+        self.backend = backend
 
         if s is not None:
             self.get_sar_specification_with_mask(case, s, binding_manager=binding_manager)
         else:
             self.get_sar_specification(case)
 
-        self.dag = build_dag(self)
-        self.automata = compile_automata(self)
+        # translate each formula once; the DAG and the labeler share the result
+        self.compiled = CompiledSpec(self.hierarchy, backend=backend, workers=workers)
+        self.dag = build_dag(self, compiled=self.compiled)
+        self.automata = self.compiled.automata
 
     def get_sar_specification_with_mask(self, case, s, binding_manager=None):
         # Use the passed-in binding manager, or fallback to internal one
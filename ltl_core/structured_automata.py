@@ -0,0 +1,332 @@
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+import networkx as nx
+
+from .ltl_translator import parse_ltl
+
+
+# --------------------------------------------------------------------------- #
+# Components
+#
+# Each component is an immutable description of a co-safety pattern with
+#   initial()            -> hashable state
+#   accepting(state)     -> bool
+#   step(state, inputs)  -> next state after a position where *inputs* hold
+#   moves(state)         -> (ap, next_state) single-AP moves (graph view)
+#   aps()                -> APs in order of appearance
+#   order_pairs()        -> (a, b) with a strictly before b on every run
+#   guard_groups()       -> tuples of APs that trigger the same move
+# --------------------------------------------------------------------------- #
+class _Chain:
+    """
+    <> (g1 && <> (g2 && ... <> (gk && then))) as a stage counter.
+    Each guard gi is a tuple of alternative APs; *then* is an optional
+    component that starts once the last stage is reached.
+    State: (index of the stage being waited for, state of *then* or None).
+    """
+
+    def __init__(self, stages: Tuple[Tuple[str, ...], ...], then=None):
+        self.stages = stages
+        self.then = then
+
+    def _enter(self, i: int) -> Tuple[int, Any]:
+        if i == len(self.stages) and self.then is not None:
+            return i, self.then.initial()
+        return i, None
+
+    def initial(self):
+        return 0, None
+
+    def accepting(self, state) -> bool:
+        i, sub = state
+        if i < len(self.stages):
+            return False
+        return self.then is None or self.then.accepting(sub)
+
+    def step(self, state, inputs: Set[str]):
+        i, sub = state
+        # stages may complete at the same position (<> includes "now")
+        while i < len(self.stages) and any(ap in inputs for ap in self.stages[i]):
+            i, sub = self._enter(i + 1)
+        if i == len(self.stages) and self.then is not None:
+            sub = self.then.step(sub, inputs)
+        return i, sub
+
+    def moves(self, state) -> Iterator[Tuple[str, Any]]:
+        i, sub = state
+        if i < len(self.stages):
+            nxt = self._enter(i + 1)
+            for ap in self.stages[i]:
+                yield ap, nxt
+        elif self.then is not None:
+            for ap, sub_next in self.then.moves(sub):
+                yield ap, (i, sub_next)
+
+    def aps(self) -> List[str]:
+        out = [ap for stage in self.stages for ap in stage]
+        if self.then is not None:
+            out += self.then.aps()
+        return out
+
+    def order_pairs(self) -> List[Tuple[str, str]]:
+        later = [list(stage) for stage in self.stages[1:]]
+        if self.then is not None:
+            later.append(self.then.aps())
+        pairs = []
+        for i, stage in enumerate(self.stages):
+            for a in stage:
+                for group in later[i:]:
+                    pairs.extend((a, b) for b in group if b != a)
+        if self.then is not None:
+            pairs += self.then.order_pairs()
+        return pairs
+
+    def guard_groups(self) -> List[Tuple[str, ...]]:
+        groups = [stage for stage in self.stages if len(stage) > 1]
+        if self.then is not None:
+            groups += self.then.guard_groups()
+        return groups
+
+
+class _EventuallyAll:
+    """
+    <> g1 && <> g2 && ... && <> gn as a bitset over satisfied guards, so
+    n independent eventualities need one int instead of 2**n explicit states.
+    """
+
+    def __init__(self, guards: Tuple[Tuple[str, ...], ...]):
+        self.guards = guards
+        self.full = (1 << len(guards)) - 1
+
+    def initial(self):
+        return 0
+
+    def accepting(self, state) -> bool:
+        return state == self.full
+
+    def step(self, state, inputs: Set[str]):
+        for bit, guard in enumerate(self.guards):
+            if not state >> bit & 1 and any(ap in inputs for ap in guard):
+                state |= 1 << bit
+        return state
+
+    def moves(self, state) -> Iterator[Tuple[str, Any]]:
+        for bit, guard in enumerate(self.guards):
+            if not state >> bit & 1:
+                for ap in guard:
+                    yield ap, state | 1 << bit
+
+    def aps(self) -> List[str]:
+        return [ap for guard in self.guards for ap in guard]
+
+    def order_pairs(self) -> List[Tuple[str, str]]:
+        return []
+
+    def guard_groups(self) -> List[Tuple[str, ...]]:
+        return [guard for guard in self.guards if len(guard) > 1]
+
+
+class _Product:
+    """Conjunction (all children) or disjunction (any child) of components."""
+
+    def __init__(self, children: List, conjunctive: bool):
+        self.children = children
+        self.conjunctive = conjunctive
+
+    def initial(self):
+        return tuple(c.initial() for c in self.children)
+
+    def accepting(self, state) -> bool:
+        done = (c.accepting(s) for c, s in zip(self.children, state))
+        return all(done) if self.conjunctive else any(done)
+
+    def step(self, state, inputs: Set[str]):
+        return tuple(c.step(s, inputs) for c, s in zip(self.children, state))
+
+    def moves(self, state) -> Iterator[Tuple[str, Any]]:
+        if not self.conjunctive and self.accepting(state):
+            return
+        for idx, (c, s) in enumerate(zip(self.children, state)):
+            for ap, s_next in c.moves(s):
+                yield ap, state[:idx] + (s_next,) + state[idx + 1:]
+
+    def aps(self) -> List[str]:
+        return [ap for c in self.children for ap in c.aps()]
+
+    def order_pairs(self) -> List[Tuple[str, str]]:
+        return [p for c in self.children for p in c.order_pairs()]
+
+    def guard_groups(self) -> List[Tuple[str, ...]]:
+        return [g for c in self.children for g in c.guard_groups()]
+
+
+# --------------------------------------------------------------------------- #
+# Pattern recognition
+# --------------------------------------------------------------------------- #
+def _guard(node) -> Optional[Tuple[str, ...]]:
+    """An atom or a disjunction of atoms, as a tuple of alternatives."""
+    if node[0] == "ap":
+        return (node[1],)
+    if node[0] == "or" and all(c[0] == "ap" for c in node[1]):
+        return tuple(dict.fromkeys(c[1] for c in node[1]))
+    return None
+
+
+def _eventually(body):
+    """Component for <> body, or None if body is irregular."""
+    guard = _guard(body)
+    if guard is not None:
+        return _Chain((guard,))
+    if body[0] != "and":
+        return None
+
+    guards = [g for g in (_guard(c) for c in body[1]) if g is not None]
+    rest = [c for c in body[1] if _guard(c) is None]
+    # exactly one guard now and temporal obligations afterwards; simultaneous
+    # guards (a && b) need a conjunctive letter and are left to the translator
+    if len(guards) != 1 or not rest:
+        return None
+    comps = [_component(c) for c in rest]
+    if any(c is None for c in comps):
+        return None
+    then = comps[0] if len(comps) == 1 else _conjunction(comps)
+    if isinstance(then, _Chain):
+        return _Chain((guards[0],) + then.stages, then.then)
+    return _Chain((guards[0],), then)
+
+
+def _conjunction(comps: List):
+    simple = [c for c in comps if isinstance(c, _Chain) and len(c.stages) == 1 and c.then is None]
+    if len(simple) == len(comps):
+        return _EventuallyAll(tuple(c.stages[0] for c in comps))
+    return _Product(comps, conjunctive=True)
+
+
+def _disjunction(comps: List):
+    simple = [c for c in comps if isinstance(c, _Chain) and len(c.stages) == 1 and c.then is None]
+    if len(simple) == len(comps):
+        # <> a || <> b  ==  <> (a || b)
+        merged = tuple(dict.fromkeys(ap for c in comps for ap in c.stages[0]))
+        return _Chain((merged,))
+    return _Product(comps, conjunctive=False)
+
+
+def _component(node):
+    kind = node[0]
+    if kind == "ev":
+        return _eventually(node[1])
+    if kind in ("and", "or"):
+        comps = [_component(c) for c in node[1]]
+        if any(c is None for c in comps):
+            return None
+        return _conjunction(comps) if kind == "and" else _disjunction(comps)
+    return None
+
+
+# --------------------------------------------------------------------------- #
+# Automaton facade
+# --------------------------------------------------------------------------- #
+class _AcceptingStates:
+    """Membership test standing in for an explicit accepting-state set."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def __contains__(self, state) -> bool:
+        # states come from initial()/delta(); a malformed one raises instead of reading as "not accepting"
+        return self.root.accepting(state)
+
+    def __repr__(self):
+        return "<accepting states of structured automaton>"
+
+
+class StructuredAutomaton:
+    """
+    Compact automaton for conjunctions/disjunctions of eventualities and
+    sequential <> (a && <> b) chains, with states built on demand from
+    stage counters and bitsets instead of an explicit state graph.
+
+    Exposes the subset of the NetworkX DFA interface that the Labeler and
+    BindingManager use: initial_state, accepting_states (membership only),
+    delta(), out_edges() and the graph metadata dict. to_networkx() builds
+    the explicit graph for debugging and plotting.
+    """
+
+    def __init__(self, formula: str, root):
+        self.formula = formula
+        self.root = root
+        self.initial_state = root.initial()
+        self.accepting_states = _AcceptingStates(root)
+
+        disj_eq: Dict[Any, List[Dict[str, Any]]] = {}
+        for idx, group in enumerate(root.guard_groups()):
+            disj_eq[f"guard_{idx}"] = [{"next": None, "aps": set(group)}]
+
+        self.graph: Dict[str, Any] = {
+            "initial_state": self.initial_state,
+            "accepting_states": self.accepting_states,
+            "disjunctive_equivalents": disj_eq,
+            "structured": True,
+        }
+
+    def delta(self, state: Any, inputs: Set[str]) -> Any:
+        return self.root.step(state, inputs)
+
+    def out_edges(self, state: Any, data: bool = False):
+        for ap, nxt in self.root.moves(state):
+            yield (state, nxt, {"label": ap}) if data else (state, nxt)
+
+    def successors(self, state: Any) -> Iterator[Any]:
+        seen = set()
+        for _, nxt in self.root.moves(state):
+            if nxt not in seen:
+                seen.add(nxt)
+                yield nxt
+
+    def aps(self) -> List[str]:
+        return list(dict.fromkeys(self.root.aps()))
+
+    def pairwise_order(self) -> List[Tuple[str, str]]:
+        """Pairs (a, b) such that a precedes b on every accepting run."""
+        pairs = list(dict.fromkeys(self.root.order_pairs()))
+        found = set(pairs)
+        return [(a, b) for a, b in pairs if (b, a) not in found]
+
+    def to_networkx(self, max_states: int = 100000) -> nx.MultiDiGraph:
+        """Materialize the explicit state graph (may be exponential for wide conjunctions)."""
+        G = nx.MultiDiGraph()
+        G.add_node(self.initial_state)
+        queue = deque([self.initial_state])
+        while queue:
+            state = queue.popleft()
+            for _, nxt, d in self.out_edges(state, data=True):
+                if nxt not in G:
+                    if G.number_of_nodes() >= max_states:
+                        raise RuntimeError(f"Automaton for '{self.formula}' exceeds {max_states} states")
+                    G.add_node(nxt)
+                    queue.append(nxt)
+                G.add_edge(state, nxt, label=d["label"])
+        accepting = {n for n in G if n in self.accepting_states}
+        G.graph.update(self.graph)
+        G.graph["accepting_states"] = accepting
+        G.initial_state = self.initial_state
+        G.accepting_states = accepting
+        return G
+
+    def __repr__(self):
+        return f"StructuredAutomaton({self.formula!r})"
+
+
+def compile_structured(formula: str) -> Optional[StructuredAutomaton]:
+    """
+    Return a StructuredAutomaton if *formula* belongs to one of the regular
+    pattern classes (conjunctions/disjunctions of eventualities, sequential
+    eventuality chains, and combinations of these), otherwise None.
+    """
+    try:
+        root = _component(parse_ltl(formula))
+    except ValueError:
+        return None
+    if root is None:
+        return None
+    return StructuredAutomaton(formula, root)
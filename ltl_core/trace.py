@@ -0,0 +1,194 @@
+import os
+from typing import Collection, Dict, Iterator, Optional, Set, Tuple
+
+import numpy as np
+
+from .transition_table import APIndex
+
+
+# Event kinds
+AP_ON, AP_OFF, COMPLETED, UNCOMPLETED = 0, 1, 2, 3
+
+EVENT_DTYPE = np.dtype([("step", "<i4"), ("id", "<i4"), ("kind", "u1")])
+
+POLICIES = ("ring", "delta", "disk")
+
+
+class TraceRecorder:
+    """
+    Episode trace as delta-encoded events: (step, interned name id, kind) for
+    every AP that turns on/off and every formula that gets completed, kept
+    in a preallocated structured array.
+
+    Policies:
+      - "ring":  fixed capacity, oldest events are overwritten (bounded memory)
+      - "delta": keep everything in memory, doubling the buffer when full
+      - "disk":  stream full buffers to *path* and keep only one buffer in memory
+
+    The disk stream stays open until save() or close(); use the recorder as
+    a context manager (or call close()) when the episode may end without a
+    save.
+    """
+
+    def __init__(self, policy: str = "ring", capacity: int = 4096, path: Optional[str] = None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown trace policy '{policy}', expected one of {POLICIES}")
+        if policy == "disk" and path is None:
+            raise ValueError("The 'disk' trace policy needs a path")
+        self.policy = policy
+        self.capacity = capacity
+        self.path = path
+
+        self.index = APIndex()
+        self.events = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self.n = 0              # events in the buffer
+        self.total = 0          # events ever recorded
+        self.step = 0           # steps recorded so far
+
+        self._aps: Set[str] = set()
+        self._completed: Set[str] = set()
+        self._raw = None
+        if policy == "disk":
+            self._raw = open(self._raw_path(), "wb")
+
+    def _raw_path(self) -> str:
+        return self.path + ".events"
+
+    # ---- #
+    # Recording
+    # ---- #
+
+    def record(self, aps: Collection[str], completed: Collection[str]):
+        """Log the changes since the previous call."""
+        step = self.step
+        self.step += 1
+
+        if aps != self._aps:
+            aps = set(aps)
+            for ap in aps - self._aps:
+                self._push(step, ap, AP_ON)
+            for ap in self._aps - aps:
+                self._push(step, ap, AP_OFF)
+            self._aps = aps
+
+        completed = set(completed)
+        if completed != self._completed:
+            for name in completed - self._completed:
+                self._push(step, name, COMPLETED)
+            for name in self._completed - completed:
+                self._push(step, name, UNCOMPLETED)
+            self._completed = completed
+
+    def _push(self, step: int, name: str, kind: int):
+        if self.n == len(self.events):
+            self._make_room()
+        slot = self.n if self.policy != "ring" else self.total % len(self.events)
+        self.events[slot] = (step, self.index.bit(name), kind)
+        self.n = min(self.n + 1, len(self.events))
+        self.total += 1
+
+    def _make_room(self):
+        if self.policy == "delta":
+            grown = np.zeros(2 * len(self.events), dtype=EVENT_DTYPE)
+            grown[:self.n] = self.events
+            self.events = grown
+        elif self.policy == "disk":
+            self.events[:self.n].tofile(self._raw)
+            self.n = 0
+        # ring: _push overwrites the oldest slot
+
+    def reset(self):
+        """Start a new episode (the interned names are kept)."""
+        if self._raw is not None:
+            self._raw.close()
+        if self.policy == "disk":
+            self._raw = open(self._raw_path(), "wb")
+        self.n = self.total = self.step = 0
+        self._aps = set()
+        self._completed = set()
+
+    # ---- #
+    # Output
+    # ---- #
+
+    def chronological(self) -> np.ndarray:
+        """Events held in memory, oldest first."""
+        if self.policy == "ring" and self.total > len(self.events):
+            head = self.total % len(self.events)
+            return np.concatenate([self.events[head:], self.events[:head]])
+        return self.events[:self.n].copy()
+
+    def save(self, path: Optional[str] = None) -> str:
+        """
+        Write the trace as .npz (columns step/id/kind plus the name table).
+        For the disk policy this closes the stream and folds it into *path*.
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path given for the trace")
+        if self.policy == "disk":
+            self.close()
+            raw_path = self._raw_path()
+            if os.path.exists(raw_path):
+                events = np.fromfile(raw_path, dtype=EVENT_DTYPE)
+                os.remove(raw_path)
+            else:       # saved before
+                events = self.events[:0]
+        else:
+            events = self.chronological()
+
+        np.savez_compressed(path, step=events["step"], id=events["id"], kind=events["kind"],
+                            names=np.array(self.index.names, dtype=str), policy=np.array(self.policy),
+                            steps=np.array(self.step), dropped=np.array(self.total - len(events)))
+        return path
+
+    def close(self):
+        """
+        Flush the buffered events to the disk stream and close it (no-op for
+        the in-memory policies). The events stay in path + ".events" until
+        save() folds them in; reset() opens a new stream.
+        """
+        if self._raw is not None:
+            self.events[:self.n].tofile(self._raw)
+            self._raw.close()
+            self._raw = None
+            self.n = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return self.n
+
+
+def load_trace(path: str) -> Dict[str, np.ndarray]:
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+def replay(steps: np.ndarray, ids: np.ndarray, kinds: np.ndarray, names) -> Iterator[Tuple[int, Set[str], Set[str]]]:
+    """
+    Rebuild (step, true APs, completed) after each step that has events, from
+    the step/id/kind columns (e.g. load_trace(path)). For a ring trace that
+    wrapped, the state is relative to the oldest event kept.
+    """
+    aps: Set[str] = set()
+    completed: Set[str] = set()
+    i, n = 0, len(steps)
+    while i < n:
+        step = int(steps[i])
+        while i < n and steps[i] == step:
+            name, kind = str(names[ids[i]]), kinds[i]
+            if kind == AP_ON:
+                aps.add(name)
+            elif kind == AP_OFF:
+                aps.discard(name)
+            elif kind == COMPLETED:
+                completed.add(name)
+            else:
+                completed.discard(name)
+            i += 1
+        yield step, set(aps), set(completed)
@@ -0,0 +1,90 @@
+from collections import deque
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+class APIndex:
+    """
+    Interns AP names to bit positions so a set of true APs becomes one int
+    and label tests become bitmask ANDs.
+    """
+
+    def __init__(self):
+        self.bits: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def bit(self, ap: str) -> int:
+        """Bit position of *ap*, allocating a new one on first use."""
+        b = self.bits.get(ap)
+        if b is None:
+            b = len(self.names)
+            self.bits[ap] = b
+            self.names.append(ap)
+        return b
+
+    def mask(self, aps: Iterable[str]) -> int:
+        """Bitmask of the known APs in *aps*; unknown APs cannot enable any transition."""
+        bits = self.bits
+        m = 0
+        for ap in aps:
+            b = bits.get(ap)
+            if b is not None:
+                m |= 1 << b
+        return m
+
+
+class TransitionTable:
+    """
+    Integer-indexed lowering of an automaton for per-tick stepping.
+
+    States are numbered in BFS order from the initial state (id 0). For each
+    state the outgoing transitions are kept as (AP bitmask, next id) pairs in
+    the automaton's edge order, plus the OR of all of them, so a tick on a
+    state with nothing enabled is one AND. The source automaton (NetworkX
+    graph or StructuredAutomaton) stays the debug/visualization view.
+    """
+
+    def __init__(self, automaton: Any, initial_state: Any, ap_index: APIndex, max_states: int = 4096):
+        self.states: List[Any] = [initial_state]
+        ids: Dict[Any, int] = {initial_state: 0}
+        self.moves: List[Tuple[Tuple[int, int], ...]] = []
+        self.enabled: List[int] = []
+
+        queue = deque([initial_state])
+        while queue:
+            state = queue.popleft()
+            moves = []
+            enabled = 0
+            for _, nxt, data in automaton.out_edges(state, data=True):
+                label = data.get("label")
+                labels = (label,) if isinstance(label, str) else tuple(label)
+                bits = 0
+                for ap in labels:
+                    bits |= 1 << ap_index.bit(ap)
+                if nxt not in ids:
+                    if len(self.states) >= max_states:
+                        raise ValueError(f"automaton exceeds {max_states} states")
+                    ids[nxt] = len(self.states)
+                    self.states.append(nxt)
+                    queue.append(nxt)
+                moves.append((bits, ids[nxt]))
+                enabled |= bits
+            self.moves.append(tuple(moves))
+            self.enabled.append(enabled)
+
+        self.ids = ids
+        accepting = getattr(automaton, "accepting_states", None)
+        if accepting is None:
+            accepting = automaton.graph.get("accepting_states", ())
+        self.accepting: List[bool] = [s in accepting for s in self.states]
+
+    def step(self, sid: int, mask: int) -> int:
+        """Follow the first transition whose label is among the true APs in *mask*."""
+        if not self.enabled[sid] & mask:
+            return sid
+        for bits, nxt in self.moves[sid]:
+            if bits & mask:
+                return nxt
+        return sid
+
+    def __len__(self):
+        return len(self.states)
@@ -3,6 +3,8 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 import random
 from .agent import Agent
+from .base_slots import BaseSlots
+from .fleet import Fleet
 from .specification import get_ap_prefix, AP_TYPE_PREFIX_MAP
 
 
@@ -30,8 +32,14 @@ class Workspace:
 
         self.agents["drones"] = self._place_agents_in_base(num_drones, role="drones")
         self.agents["gvs"] = self._place_agents_in_base(num_gvs, role="gvs")
+        self.agents_by_label = {agent.label: agent for agent in self.get_all_agents()}
+
+        # Shared struct-of-arrays state; the Agent objects become views onto it
+        self.fleet = Fleet.from_agents(self.get_all_agents())
+        self.base_slots = BaseSlots(self.base_area, size)
 
         self.dropoff_locations = self._assign_dropoff_locations()
+        self.index_goals()
 
         self._active_aps = set()    # Holds currently true atomic propositions
         self.true_aps = set()
@@ -91,6 +99,28 @@ class Workspace:
             assigned[i] = hospital_cells[i % len(hospital_cells)]
         return assigned
     
+    def index_goals(self):
+        """
+        Build role → {goal cell: [APs made true by arriving there]} from the
+        target and dropoff placements, so AP detection is one dict lookup per
+        arrived agent. Hospital cells are reused once targets outnumber them,
+        so a dropoff cell may serve several targets. Call again if
+        target_locations or dropoff_locations are changed.
+        """
+        arrival_aps = {"drones": {}, "gvs": {}}
+        for idx, loc in enumerate(self.target_locations):
+            cell = tuple(int(round(c)) for c in loc)
+            arrival_aps["drones"].setdefault(cell, []).append(f"p_nav_{idx}_1_1_0")
+            arrival_aps["gvs"].setdefault(cell, []).append(f"p_pickup_{idx}_2_1_0")
+        for idx, loc in self.dropoff_locations.items():
+            cell = tuple(int(round(c)) for c in loc)
+            arrival_aps["gvs"].setdefault(cell, []).append(f"p_dropoff_{idx}_2_1_0")
+        self.arrival_aps = arrival_aps
+
+    def send_idle_agents_to_base(self):
+        """Park every idle drone/GV outside the base on a free base cell; returns those agents."""
+        return [self.fleet.agents[i] for i in self.base_slots.send_idle_home(self.fleet)]
+
     def all_mobile_agents_at_base(self, tol=2.0):
         """
         Check whether all drones and GVs are within tolerance of any base cell.
@@ -179,53 +209,54 @@ class Workspace:
             agent.reset()
         return self
 
+    def snapshot(self):
+        """Dynamic workspace state: the fleet and the currently true APs (layout is static)."""
+        return {
+            "fleet": self.fleet.snapshot(),
+            "true_aps": set(self.true_aps),
+            "active_aps": set(self._active_aps),
+        }
+
+    def restore(self, snap):
+        self.fleet.restore(snap["fleet"])
+        self.true_aps = set(snap["true_aps"])
+        self._active_aps = set(snap["active_aps"])
+
     def get_all_agents(self):
         return self.agents["drones"] + self.agents["gvs"] + self.agents["humans"]
 
+    def get_agent_by_label(self, label: str):
+        return self.agents_by_label.get(label)
+
     def update_true_aps(self):
         true_aps = set()
+        fleet = self.fleet
 
         # --- Physical APs: GVs and Drones ---
-        for agent in self.agents["drones"] + self.agents["gvs"]:
-            if not agent.has_arrived():
-                continue
-
-            # Identify goal match for pickup/dropoff/nav
-            if agent.role == "drones":
-                for idx, loc in enumerate(self.target_locations):
-                    if np.allclose(agent.goal, loc):
-                        ap = f"p_nav_{idx}_1_1_0"
-                        true_aps.add(ap)
-
-            elif agent.role == "gvs":
-                # Check for pickup (at target)
-                for idx, loc in enumerate(self.target_locations):
-                    if np.allclose(agent.goal, loc):
-                        ap = f"p_pickup_{idx}_2_1_0"
-                        true_aps.add(ap)
-
-                # Check for dropoff (at hospital)
-                for idx, loc in self.dropoff_locations.items():
-                    if np.allclose(agent.goal, loc):
-                        ap = f"p_dropoff_{idx}_2_1_0"
-                        true_aps.add(ap)
+        # Arrived agents whose goal sits on a target/dropoff cell (same tolerance as np.allclose)
+        arrived = np.flatnonzero(fleet.arrived())
+        if len(arrived):
+            goals = fleet.goal[arrived]
+            cells = np.rint(goals)
+            on_cell = np.isclose(goals, cells).all(axis=1)
+            for i, cell in zip(arrived[on_cell].tolist(), cells[on_cell].astype(int).tolist()):
+                aps = self.arrival_aps.get(fleet.roles[i], {}).get(tuple(cell))
+                if aps:
+                    true_aps.update(aps)
 
         # --- Symbolic APs ---
-        for agent in self.get_all_agents():
-            task = agent.current_symbolic_task
-            if task is None:
-                continue
+        done = np.flatnonzero(fleet.task_active & (fleet.task_progress >= 1.0))
+        for i in done.tolist():
+            task = fleet.tasks[i]
             prefix = get_ap_prefix(task)
             ap_type = AP_TYPE_PREFIX_MAP.get(prefix)
-            if ap_type == "symbolic" and agent.has_completed(task):
+            if ap_type == "symbolic":
                 true_aps.add(task)
 
         self.true_aps = true_aps
 
     def step_dynamics(self, dt=1.0):
-        for agent in self.get_all_agents():
-            agent.move_toward_goal(dt)
-            agent.step_symbolic(dt)
+        self.fleet.step(dt)
         self.update_true_aps()
 
     def meter_to_pixel(self, pos, screen_size=(1200, 900)):
@@ -0,0 +1,161 @@
+"""
+Fleet-wide RRT-Connect planning
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+import numpy as np
+
+from rrt_2D.rrt_connect import RrtConnect
+
+
+# Leg status
+OK, TIMEOUT, FAILED = "ok", "timeout", "failed"
+
+DEFAULT_PLANNER = {"step_len": 0.08, "goal_sample_rate": 0.05, "iter_max": 5000}
+
+# Collision checker shipped to each worker once by the pool initializer
+# (and updated in place from each call's obstacles)
+_collision = None
+
+
+def leg_seeds(seed, n):
+    """Independent per-leg seeds derived from one fleet seed (same for any process count)."""
+    return [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(n)]
+
+
+def straight_line(start, goal, spacing=0.05):
+    """
+    Fallback trajectory for the leg start -> goal, sampled at about the
+    smoothing spacing and ordered goal first like RrtConnect paths (the GUIs
+    follow them from the end).
+    """
+    n = max(int(math.ceil(math.dist(start, goal) / spacing)), 1) + 1
+    return np.linspace(np.asarray(goal, dtype=float), np.asarray(start, dtype=float), n)
+
+
+def plan_leg(start, goal, obstacles=None, seed=0, time_limit=None, planner=None, collision=None):
+    """
+    Plan and smooth one leg with RrtConnect, seeding the global NumPy RNG the
+    planner draws from (the caller's RNG state is restored on return).
+    *obstacles* is an (obs_cir, obs_bound, obs_rec)
+    tuple for Utils.update_obs, *collision* a ready checker (Utils or
+    GridUtils) used instead of a fresh Utils and updated with *obstacles*
+    when both are given. Returns (path, status); path is None unless status
+    is OK.
+    """
+    state = np.random.get_state()
+    np.random.seed(seed)
+    try:
+        rrt = RrtConnect(start, goal, **{**DEFAULT_PLANNER, **(planner or {})})
+        if collision is not None:
+            if obstacles is not None:
+                collision.update_obs(*obstacles)
+            rrt.utils = collision
+        elif obstacles is not None:
+            rrt.utils.update_obs(*obstacles)
+
+        deadline = None if time_limit is None else perf_counter() + time_limit
+        if rrt.planning(deadline=deadline) is None:
+            timed_out = deadline is not None and perf_counter() > deadline
+            return None, TIMEOUT if timed_out else FAILED
+
+        rrt.smoothing()
+        return rrt.path, OK
+    finally:
+        np.random.set_state(state)
+
+
+def make_pool(processes=None, collision=None, mp_context=None):
+    """
+    Process pool to pass as plan_fleet's *executor* across calls, so workers
+    start and import the planner once per session instead of once per call.
+    Each worker keeps its own copy of *collision*, updated in place from the
+    *obstacles* of every call (cheap for GridUtils, which re-rasterizes only
+    the obstacles that moved). Shut it down when done.
+    """
+    return ProcessPoolExecutor(max_workers=processes, mp_context=mp_context,
+                               initializer=_init_worker, initargs=(collision,))
+
+
+def _init_worker(collision):
+    global _collision
+    _collision = collision
+
+
+def _plan_leg_args(args):
+    try:
+        return plan_leg(*args, collision=_collision)
+    except Exception as e:
+        print(f"[Warning] Planning leg {args[0]} -> {args[1]} failed: {e!r}")
+        return None, FAILED
+
+
+def plan_fleet(legs, obstacles=None, seed=0, processes=None, timeout=None, previous=None,
+               planner=None, collision=None, executor=None):
+    """
+    Plan every (start, goal) leg across a process pool (in-process when
+    processes == 1) and return (paths, status), both in input order.
+    Repeated callers should pass a make_pool() pool as *executor*: a pool
+    created per call costs about a second of worker start-up, more than
+    planning a handful of legs.
+
+    Each leg gets its own seed from *seed* and at most *timeout* seconds of
+    search. A leg that times out or fails falls back to previous[i] when
+    given (e.g. the trajectory it had before a replan) and to a straight
+    line otherwise, so every entry of paths is usable; status tells which
+    legs were planned ("ok") and which fell back ("timeout" / "failed").
+    *collision* is sent to each worker once, so a large checker such as a
+    GridUtils is not pickled per leg; with an *executor* the workers use the
+    checker given to make_pool() and *collision* only serves legs planned
+    in-process.
+    """
+    global _collision
+    legs = [(tuple(start), tuple(goal)) for start, goal in legs]
+    jobs = [(start, goal, obstacles, leg_seed, timeout, planner)
+            for (start, goal), leg_seed in zip(legs, leg_seeds(seed, len(legs)))]
+
+    if processes == 1 or len(jobs) <= 1:
+        _collision = collision
+        try:
+            results = [_plan_leg_args(job) for job in jobs]
+        finally:
+            _collision = None
+    elif executor is not None:
+        results = list(executor.map(_plan_leg_args, jobs))
+    else:
+        with make_pool(processes, collision) as pool:
+            results = list(pool.map(_plan_leg_args, jobs))
+
+    paths, status = [], []
+    for i, ((start, goal), (path, leg_status)) in enumerate(zip(legs, results)):
+        if leg_status != OK:
+            fallback = previous[i] if previous is not None else None
+            path = fallback if fallback is not None else straight_line(start, goal)
+        paths.append(path)
+        status.append(leg_status)
+    return paths, status
+
+
+def plan_routes(routes, **kwargs):
+    """
+    plan_fleet over per-vehicle waypoint lists: route [p0, p1, p2] is the
+    legs p0 -> p1 -> p2. Returns (trajectories, status) as one list of legs
+    per route. A *previous* keyword is given in the same nested layout.
+    """
+    routes = [list(route) for route in routes]
+    legs = [(route[k], route[k + 1]) for route in routes for k in range(len(route) - 1)]
+    if kwargs.get("previous") is not None:
+        kwargs["previous"] = [leg for route in kwargs["previous"] for leg in route]
+
+    paths, status = plan_fleet(legs, **kwargs)
+
+    trajectories, route_status, k = [], [], 0
+    for route in routes:
+        n = max(len(route) - 1, 0)
+        trajectories.append(paths[k:k + n])
+        route_status.append(status[k:k + n])
+        k += n
+    return trajectories, route_status
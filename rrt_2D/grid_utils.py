@@ -0,0 +1,226 @@
+"""
+Occupancy-grid / distance-field collision checks
+"""
+
+import math
+import numpy as np
+from scipy import ndimage
+
+from rrt_2D import env
+
+
+class GridUtils:
+    """
+    Drop-in alternative to utils_rrt.Utils backed by a raster of the
+    inflated obstacles, for obstacle sets that change often (wind cells):
+
+      - count: number of obstacles covering each cell, so one obstacle can be
+        stamped in or out without touching the others
+      - field: clearance from the cell to the nearest obstacle cell, clamped
+        at max_dist and lowered by the discretization error; -1 for occupied
+        cells
+
+    Point checks are a single lookup. Segment checks march along the segment
+    in steps of the clearance, which for short RRT edges away from obstacles
+    is also a single lookup. update_obs() re-stamps only the obstacles that
+    changed and recomputes the field in a window around them.
+
+    The raster is conservative: a cell counts as occupied when it comes
+    within one cell of an inflated obstacle, and anything outside the grid
+    is occupied. Segments are checked along their whole length (Utils only
+    tests rectangle edges, not boundary walls), so no collision with an
+    inflated obstacle is missed, but segments passing within about two cells
+    of one may be rejected.
+    """
+
+    def __init__(self, resolution=0.01, max_dist=0.25, delta=0.05, bounds=None):
+        self.env = env.Env()
+        self.delta = delta
+        self.res = resolution
+        self.max_dist = max_dist
+
+        if bounds is None:
+            pad = 0.2
+            bounds = (self.env.x_range[0] - pad, self.env.x_range[1] + pad,
+                      self.env.y_range[0] - pad, self.env.y_range[1] + pad)
+        self.x0, x1, self.y0, y1 = bounds
+        self.nx = int(math.ceil((x1 - self.x0) / resolution))
+        self.ny = int(math.ceil((y1 - self.y0) / resolution))
+
+        # Obstacles are stamped this much larger than delta so that every cell
+        # touching an inflated obstacle (and every res / 2 march sample inside
+        # one) lands in an occupied cell
+        self.margin = resolution
+        # Cell-centre distances understate the true clearance by at most this
+        self.slack = math.sqrt(2) * resolution
+        self.min_step = 0.5 * resolution
+        self._pad = int(math.ceil(max_dist / resolution)) + 1
+
+        self.count = np.zeros((self.ny, self.nx), dtype=np.int16)
+        self.field = np.full((self.ny, self.nx), max_dist - self.slack)
+        self._stamps = {}
+
+        self.obs_circle = []
+        self.obs_boundary = []
+        self.obs_rectangle = []
+        self.update_obs(self.env.obs_circle, self.env.obs_boundary, self.env.obs_rectangle)
+
+    # ---- #
+    # Obstacles
+    # ---- #
+
+    def update_obs(self, obs_cir, obs_bound, obs_rec):
+        """
+        Replace the obstacle lists. Obstacles are matched by kind and position
+        in their list; only the ones that moved, appeared or disappeared are
+        re-rasterized.
+        """
+        self.obs_circle = obs_cir
+        self.obs_boundary = obs_bound
+        self.obs_rectangle = obs_rec
+
+        stamps = {}
+        for kind, obs_list in (("circle", obs_cir), ("boundary", obs_bound), ("rectangle", obs_rec)):
+            for i, obs in enumerate(obs_list):
+                stamps[(kind, i)] = tuple(float(v) for v in obs)
+
+        # One window per changed obstacle (old and new footprint), so far-apart
+        # wind cells do not drag the whole grid into the recomputation
+        windows = []
+        for key in set(self._stamps) | set(stamps):
+            old, new = self._stamps.get(key), stamps.get(key)
+            if old == new:
+                continue
+            footprints = []
+            if old is not None:
+                footprints.append(self._stamp(key[0], old, -1))
+            if new is not None:
+                footprints.append(self._stamp(key[0], new, 1))
+            footprints = [w for w in footprints if w is not None]
+            if footprints:
+                windows.append((min(w[0] for w in footprints), max(w[1] for w in footprints),
+                                min(w[2] for w in footprints), max(w[3] for w in footprints)))
+        self._stamps = stamps
+
+        # After all stamps, so every window sees the final occupancy
+        for window in windows:
+            self._update_field(*window)
+
+    def _stamp(self, kind, obs, sign):
+        """Add (sign=1) or remove (sign=-1) one obstacle; returns its cell window or None."""
+        grow = self.delta + self.margin
+        if kind == "circle":
+            cx, cy, r = obs
+            r += grow
+            lo, hi = (cx - r, cy - r), (cx + r, cy + r)
+        else:
+            x, y, w, h = obs
+            lo, hi = (x - grow, y - grow), (x + w + grow, y + h + grow)
+
+        ix0 = max(int(math.floor((lo[0] - self.x0) / self.res)), 0)
+        iy0 = max(int(math.floor((lo[1] - self.y0) / self.res)), 0)
+        ix1 = min(int(math.ceil((hi[0] - self.x0) / self.res)) + 1, self.nx)
+        iy1 = min(int(math.ceil((hi[1] - self.y0) / self.res)) + 1, self.ny)
+        if ix0 >= ix1 or iy0 >= iy1:
+            return None
+
+        xc = self.x0 + (np.arange(ix0, ix1) + 0.5) * self.res
+        yc = self.y0 + (np.arange(iy0, iy1) + 0.5) * self.res
+        if kind == "circle":
+            mask = (xc[None, :] - cx) ** 2 + (yc[:, None] - cy) ** 2 <= r * r
+        else:
+            mask = ((xc >= lo[0]) & (xc <= hi[0]))[None, :] & ((yc >= lo[1]) & (yc <= hi[1]))[:, None]
+
+        self.count[iy0:iy1, ix0:ix1] += sign * mask.astype(np.int16)
+        return iy0, iy1, ix0, ix1
+
+    def _update_field(self, iy0, iy1, ix0, ix1):
+        """Recompute the field for cells within max_dist of the changed window."""
+        pad = self._pad
+        # Cells whose clamped clearance can change ...
+        oy0, oy1 = max(iy0 - pad, 0), min(iy1 + pad, self.ny)
+        ox0, ox1 = max(ix0 - pad, 0), min(ix1 + pad, self.nx)
+        # ... and every cell that can be their nearest obstacle
+        wy0, wy1 = max(oy0 - pad, 0), min(oy1 + pad, self.ny)
+        wx0, wx1 = max(ox0 - pad, 0), min(ox1 + pad, self.nx)
+
+        occupied = self.count[wy0:wy1, wx0:wx1] > 0
+        if occupied.any():
+            dist = ndimage.distance_transform_edt(~occupied) * self.res
+        else:
+            dist = np.full(occupied.shape, self.max_dist)
+        field = np.maximum(np.minimum(dist, self.max_dist) - self.slack, 0.0)
+        field[occupied] = -1.0
+
+        self.field[oy0:oy1, ox0:ox1] = field[oy0 - wy0:oy1 - wy0, ox0 - wx0:ox1 - wx0]
+
+    # ---- #
+    # Lookups
+    # ---- #
+
+    def clearance(self, x, y):
+        """Obstacle-free radius around (x, y); -1 if the point is occupied or off the grid."""
+        ix = math.floor((x - self.x0) / self.res)
+        iy = math.floor((y - self.y0) / self.res)
+        if 0 <= ix < self.nx and 0 <= iy < self.ny:
+            return self.field[iy, ix]
+        return -1.0
+
+    def clearance_batch(self, points):
+        p = np.asarray(points, dtype=float).reshape(-1, 2)
+        ix = np.floor((p[:, 0] - self.x0) / self.res).astype(int)
+        iy = np.floor((p[:, 1] - self.y0) / self.res).astype(int)
+        inside = (ix >= 0) & (ix < self.nx) & (iy >= 0) & (iy < self.ny)
+
+        clear = np.full(len(p), -1.0)
+        clear[inside] = self.field[iy[inside], ix[inside]]
+        return clear
+
+    # ---- #
+    # Utils interface
+    # ---- #
+
+    def is_inside_obs(self, node):
+        return self.clearance(node.x, node.y) < 0
+
+    def is_inside_obs_batch(self, points):
+        return self.clearance_batch(points) < 0
+
+    def is_collision(self, start, end):
+        ox, oy = start.x, start.y
+        dx, dy = end.x - ox, end.y - oy
+        length = math.hypot(dx, dy)
+        ux, uy = (dx / length, dy / length) if length > 0 else (0.0, 0.0)
+
+        t = 0.0
+        while True:
+            clear = self.clearance(ox + t * ux, oy + t * uy)
+            if clear < 0:
+                return True
+            if t >= length:
+                return False
+            t = min(t + max(clear, self.min_step), length)
+
+    def is_collision_batch(self, starts, ends):
+        o, e = np.broadcast_arrays(np.asarray(starts, dtype=float).reshape(-1, 2),
+                                   np.asarray(ends, dtype=float).reshape(-1, 2))
+        d = e - o
+        length = np.hypot(d[:, 0], d[:, 1])
+        u = d / np.where(length > 0, length, 1.0)[:, None]
+
+        hit = np.zeros(len(o), dtype=bool)
+        t = np.zeros(len(o))
+        active = np.arange(len(o))
+        while len(active):
+            clear = self.clearance_batch(o[active] + t[active, None] * u[active])
+            hit[active[clear < 0]] = True
+            going = (clear >= 0) & (t[active] < length[active])
+            active, clear = active[going], clear[going]
+            t[active] = np.minimum(t[active] + np.maximum(clear, self.min_step), length[active])
+
+        return hit
+
+    def first_collision(self, start, ends):
+        """Position of the first segment start -> ends[k] that collides, -1 if none."""
+        hit = self.is_collision_batch(start, ends)
+        return int(np.argmax(hit)) if hit.any() else -1
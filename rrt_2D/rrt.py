@@ -13,6 +13,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)) +
 
 from rrt_2D import env, plotting
 from rrt_2D import utils_rrt as utils
+from rrt_2D.tree import Tree
 
 
 class Node:
@@ -29,7 +30,7 @@ class Rrt:
         self.step_len = step_len
         self.goal_sample_rate = goal_sample_rate
         self.iter_max = iter_max
-        self.vertex = [self.s_start]
+        self.tree = Tree(s_start)
 
         self.env = env.Env()
         self.plotting = plotting.Plotting(s_start, s_goal)
@@ -44,19 +45,23 @@ class Rrt:
     def planning(self):
         for i in range(self.iter_max):
             node_rand = self.generate_random_node(self.goal_sample_rate)
-            node_near = self.nearest_neighbor(self.vertex, node_rand)
+            i_near = self.tree.nearest(node_rand.x, node_rand.y)
+            node_near = self.tree.point(i_near)
             node_new = self.new_state(node_near, node_rand)
 
             if node_new and not self.utils.is_collision(node_near, node_new):
-                self.vertex.append(node_new)
+                i_new = self.tree.add(node_new.x, node_new.y, i_near)
                 dist, _ = self.get_distance_and_angle(node_new, self.s_goal)
 
                 if dist <= self.step_len and not self.utils.is_collision(node_new, self.s_goal):
-                    self.new_state(node_new, self.s_goal)
-                    return self.extract_path(node_new)
+                    return self.extract_path(i_new)
 
         return None
 
+    @property
+    def vertex(self):
+        return self.tree.nodes()
+
     def generate_random_node(self, goal_sample_rate):
         delta = self.utils.delta
 
@@ -77,19 +82,12 @@ class Rrt:
         dist = min(self.step_len, dist)
         node_new = Node((node_start.x + dist * math.cos(theta),
                          node_start.y + dist * math.sin(theta)))
-        node_new.parent = node_start
 
         return node_new
 
-    def extract_path(self, node_end):
-        path = [(self.s_goal.x, self.s_goal.y)]
-        node_now = node_end
-
-        while node_now.parent is not None:
-            node_now = node_now.parent
-            path.append((node_now.x, node_now.y))
-
-        return path
+    def extract_path(self, i_end):
+        # Starts from the parent of i_end, as the object version did
+        return [(self.s_goal.x, self.s_goal.y)] + self.tree.path_to_root(self.tree.parent[i_end])
 
     @staticmethod
     def get_distance_and_angle(node_start, node_end):
@@ -8,6 +8,7 @@ import sys
 import math
 import copy
 import numpy as np
+from time import perf_counter
 import matplotlib.pyplot as plt
 from scipy.interpolate import splprep, splev
 from scipy.spatial.distance import euclidean
@@ -17,6 +18,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)) +
 
 from rrt_2D import env, plotting
 from rrt_2D import utils_rrt as utils
+from rrt_2D.tree import Tree
 
 
 class Node:
@@ -34,8 +36,9 @@ class RrtConnect:
         self.step_len = step_len
         self.goal_sample_rate = goal_sample_rate
         self.iter_max = iter_max
-        self.V1 = [self.s_start]
-        self.V2 = [self.s_goal]
+        # T1 is the tree being extended, the trees swap whenever T2 gets smaller
+        self.T1 = Tree(s_start)
+        self.T2 = Tree(s_goal)
 
         self.env = env.Env()
         self.plotting = plotting.Plotting(s_start, s_goal)
@@ -47,25 +50,32 @@ class RrtConnect:
         self.obs_rectangle = self.env.obs_rectangle
         self.obs_boundary = self.env.obs_boundary
 
-    def planning(self):
+    def planning(self, deadline=None):
+        # deadline: perf_counter() value after which the search gives up (returns None)
         for i in range(self.iter_max):
+            if deadline is not None and perf_counter() > deadline:
+                return None
             node_rand = self.generate_random_node(self.s_goal, self.goal_sample_rate)
-            node_near = self.nearest_neighbor(self.V1, node_rand)
+            i_near = self.T1.nearest(node_rand.x, node_rand.y)
+            node_near = self.T1.point(i_near)
             node_new = self.new_state(node_near, node_rand)
 
             if node_new and not self.utils.is_collision(node_near, node_new):
-                self.V1.append(node_new)
-                node_near_prim = self.nearest_neighbor(self.V2, node_new)
+                i_new = self.T1.add(node_new.x, node_new.y, i_near)
+                # T2 parent of node_new_prim, whether or not it gets added
+                prim_parent = self.T2.nearest(node_new.x, node_new.y)
+                node_near_prim = self.T2.point(prim_parent)
                 node_new_prim = self.new_state(node_near_prim, node_new)
 
                 if node_new_prim and not self.utils.is_collision(node_new_prim, node_near_prim):
-                    self.V2.append(node_new_prim)
+                    i_prim = self.T2.add(node_new_prim.x, node_new_prim.y, prim_parent)
 
                     while True:
                         node_new_prim2 = self.new_state(node_new_prim, node_new)
                         if node_new_prim2 and not self.utils.is_collision(node_new_prim2, node_new_prim):
-                            self.V2.append(node_new_prim2)
-                            node_new_prim = self.change_node(node_new_prim, node_new_prim2)
+                            prim_parent = i_prim
+                            i_prim = self.T2.add(node_new_prim2.x, node_new_prim2.y, prim_parent)
+                            node_new_prim = node_new_prim2
                         else:
                             break
 
@@ -73,20 +83,26 @@ class RrtConnect:
                             break
 
                 if self.is_node_same(node_new_prim, node_new):
-                    self.path = self.extract_path(node_new, node_new_prim)
+                    self.path = self.extract_path(i_new, node_new_prim, prim_parent)
                     # Set right direction of path: AD-HOC! Should be revised!
                     if np.linalg.norm(np.array(self.path[-1]) - np.array([self.s_goal.x, self.s_goal.y])) < 1e-2:
                         self.path.reverse()
                         # print('Path reversed for correction.')
                     return self.path
 
-            if len(self.V2) < len(self.V1):
-                list_mid = self.V2
-                self.V2 = self.V1
-                self.V1 = list_mid
+            if len(self.T2) < len(self.T1):
+                self.T1, self.T2 = self.T2, self.T1
 
         return None
 
+    @property
+    def V1(self):
+        return self.T1.nodes()
+
+    @property
+    def V2(self):
+        return self.T2.nodes()
+
     def smoothing(self):
         if not self.path:
             return []
@@ -101,11 +117,16 @@ class RrtConnect:
         # 1) Eliminate redundant waypoints
         # Initialize
         non_redundant_path = [self.path[0]]
+        points = np.asarray(self.path, dtype=float)
 
-        # Iterate through the path in reversed order
-        for i in range(1, len(self.path)):
-            if self.utils.is_collision(Node(non_redundant_path[-1]), Node(self.path[i])):
-                non_redundant_path.append(self.path[i-1])
+        # Iterate through the path, one batch check per kept waypoint
+        i = 1
+        while i < len(self.path):
+            k = self.utils.first_collision(non_redundant_path[-1], points[i:])
+            if k < 0:
+                break
+            non_redundant_path.append(self.path[i + k - 1])
+            i += k + 1
 
         # Add the last point in the path
         non_redundant_path.append(self.path[-1])
@@ -151,13 +172,6 @@ class RrtConnect:
     def add_wind_area(self, wind_area):
         self.env.added_circle = wind_area
 
-    @staticmethod
-    def change_node(node_new_prim, node_new_prim2):
-        node_new = Node((node_new_prim2.x, node_new_prim2.y))
-        node_new.parent = node_new_prim
-
-        return node_new
-
     @staticmethod
     def is_node_same(node_new_prim, node_new):
         if node_new_prim.x == node_new.x and \
@@ -186,27 +200,14 @@ class RrtConnect:
         dist = min(self.step_len, dist)
         node_new = Node((node_start.x + dist * math.cos(theta),
                          node_start.y + dist * math.sin(theta)))
-        node_new.parent = node_start
 
         return node_new
 
-    @staticmethod
-    def extract_path(node_new, node_new_prim):
-        path1 = [(node_new.x, node_new.y)]
-        node_now = node_new
-
-        while node_now.parent is not None:
-            node_now = node_now.parent
-            path1.append((node_now.x, node_now.y))
-
-        path2 = [(node_new_prim.x, node_new_prim.y)]
-        node_now = node_new_prim
-
-        while node_now.parent is not None:
-            node_now = node_now.parent
-            path2.append((node_now.x, node_now.y))
+    def extract_path(self, i_new, node_new_prim, prim_parent):
+        path1 = self.T1.path_to_root(i_new)
+        path2 = [(node_new_prim.x, node_new_prim.y)] + self.T2.path_to_root(prim_parent)
 
-        return list(list(reversed(path1)) + path2)
+        return list(reversed(path1)) + path2
 
     @staticmethod
     def get_distance_and_angle(node_start, node_end):
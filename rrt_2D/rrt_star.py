@@ -15,6 +15,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)) +
 
 from rrt_2D import env, plotting, queue
 from rrt_2D import utils_rrt as utils
+from rrt_2D.tree import Tree
 
 
 class Node:
@@ -33,7 +34,7 @@ class RrtStar:
         self.goal_sample_rate = goal_sample_rate
         self.search_radius = search_radius
         self.iter_max = iter_max
-        self.vertex = [self.s_start]
+        self.tree = Tree(x_start)
         self.path = []
 
         self.env = env.Env()
@@ -49,7 +50,8 @@ class RrtStar:
     def planning(self):
         for k in range(self.iter_max):
             node_rand = self.generate_random_node(self.goal_sample_rate)
-            node_near = self.nearest_neighbor(self.vertex, node_rand)
+            i_near = self.tree.nearest(node_rand.x, node_rand.y)
+            node_near = self.tree.point(i_near)
             node_new = self.new_state(node_near, node_rand)
 
             if k % 500 == 0:
@@ -57,14 +59,19 @@ class RrtStar:
 
             if node_new and not self.utils.is_collision(node_near, node_new):
                 neighbor_index = self.find_near_neighbor(node_new)
-                self.vertex.append(node_new)
 
                 if neighbor_index:
-                    self.choose_parent(node_new, neighbor_index)
-                    self.rewire(node_new, neighbor_index)
+                    i_parent, cost = self.choose_parent(node_new, neighbor_index)
+                else:
+                    i_parent = i_near
+                    cost = self.tree.cost[i_near] + self.get_distance_and_angle(node_near, node_new)[0]
+                i_new = self.tree.add(node_new.x, node_new.y, i_parent, cost)
+
+                if neighbor_index:
+                    self.rewire(i_new, neighbor_index)
 
         index = self.search_goal_parent()
-        self.path = self.extract_path(self.vertex[index])
+        self.path = self.extract_path(index)
 
         # self.plotting.animation(self.vertex, self.path, "rrt*, N = " + str(self.iter_max))
 
@@ -75,11 +82,16 @@ class RrtStar:
         # 1) Eliminate redundant waypoints, note: path is reversed!
         # Initialize
         non_redundant_path = [self.path[-1]]
+        points = np.asarray(self.path, dtype=float)
 
-        # Iterate through the path in reversed order
-        for i in range(len(self.path) - 2, -1, -1):
-            if self.utils.is_collision(Node(non_redundant_path[-1]), Node(self.path[i])):
-                non_redundant_path.append(self.path[i+1])
+        # Iterate through the path in reversed order, one batch check per kept waypoint
+        i = len(self.path) - 2
+        while i >= 0:
+            k = self.utils.first_collision(non_redundant_path[-1], points[i::-1])
+            if k < 0:
+                break
+            non_redundant_path.append(self.path[i - k + 1])
+            i -= k + 1
 
         # Add the first point in the list (=last point in physical world) to the non-redundant path
         non_redundant_path.append(self.path[0])
@@ -132,38 +144,46 @@ class RrtStar:
         node_new = Node((node_start.x + dist * math.cos(theta),
                          node_start.y + dist * math.sin(theta)))
 
-        node_new.parent = node_start
-
         return node_new
 
+    @property
+    def vertex(self):
+        return self.tree.nodes()
+
+    def edge_lengths(self, neighbor_index, node):
+        diff = self.tree.xy[neighbor_index] - (node.x, node.y)
+        return np.hypot(diff[:, 0], diff[:, 1])
+
     def choose_parent(self, node_new, neighbor_index):
-        cost = [self.get_new_cost(self.vertex[i], node_new) for i in neighbor_index]
+        cost = self.tree.cost[neighbor_index] + self.edge_lengths(neighbor_index, node_new)
 
-        cost_min_index = neighbor_index[int(np.argmin(cost))]
-        node_new.parent = self.vertex[cost_min_index]
+        k = int(np.argmin(cost))
+        return neighbor_index[k], cost[k]
 
-    def rewire(self, node_new, neighbor_index):
-        for i in neighbor_index:
-            node_neighbor = self.vertex[i]
+    def rewire(self, i_new, neighbor_index):
+        tree = self.tree
+        cost = tree.cost[i_new] + self.edge_lengths(neighbor_index, tree.point(i_new))
 
-            if self.cost(node_neighbor) > self.get_new_cost(node_new, node_neighbor):
-                node_neighbor.parent = node_new
+        # Costs only drop while rewiring, so the vectorized test finds every candidate;
+        # it is repeated per vertex since an earlier rewire may have lowered the cost already
+        for k in np.flatnonzero(tree.cost[neighbor_index] > cost):
+            i = neighbor_index[k]
+            if tree.cost[i] > cost[k]:
+                tree.reparent(i, i_new)
+                tree.cost[i] = cost[k]
+                self.update_cost(i)
 
     def search_goal_parent(self):
-        dist_list = [math.hypot(n.x - self.s_goal.x, n.y - self.s_goal.y) for n in self.vertex]
-        node_index = [i for i in range(len(dist_list)) if dist_list[i] <= self.step_len]
+        tree = self.tree
+        node_index = tree.within(self.s_goal.x, self.s_goal.y, self.step_len)
 
         if len(node_index) > 0:
-            cost_list = [dist_list[i] + self.cost(self.vertex[i]) for i in node_index
-                         if not self.utils.is_collision(self.vertex[i], self.s_goal)]
+            dist_list = self.edge_lengths(node_index, self.s_goal)
+            free = ~self.utils.is_collision_batch(tree.xy[node_index], (self.s_goal.x, self.s_goal.y))
+            cost_list = (dist_list + tree.cost[node_index])[free]
             return node_index[int(np.argmin(cost_list))]
 
-        return len(self.vertex) - 1
-
-    def get_new_cost(self, node_start, node_end):
-        dist, _ = self.get_distance_and_angle(node_start, node_end)
-
-        return self.cost(node_start) + dist
+        return len(tree) - 1
 
     def generate_random_node(self, goal_sample_rate):
         delta = self.utils.delta
@@ -175,12 +195,12 @@ class RrtStar:
         return self.s_goal
 
     def find_near_neighbor(self, node_new):
-        n = len(self.vertex) + 1
+        n = len(self.tree) + 1
         r = min(self.search_radius * math.sqrt((math.log(n) / n)), self.step_len)
 
-        dist_table = [math.hypot(nd.x - node_new.x, nd.y - node_new.y) for nd in self.vertex]
-        dist_table_index = [ind for ind in range(len(dist_table)) if dist_table[ind] <= r and
-                            not self.utils.is_collision(node_new, self.vertex[ind])]
+        # A handful of neighbours: single checks are cheaper than one batch call here
+        dist_table_index = [ind for ind in self.tree.within(node_new.x, node_new.y, r)
+                            if not self.utils.is_collision(node_new, self.tree.point(ind))]
 
         return dist_table_index
 
@@ -189,41 +209,23 @@ class RrtStar:
         return node_list[int(np.argmin([math.hypot(nd.x - n.x, nd.y - n.y)
                                         for nd in node_list]))]
 
-    @staticmethod
-    def cost(node_p):
-        node = node_p
-        cost = 0.0
-
-        while node.parent:
-            cost += math.hypot(node.x - node.parent.x, node.y - node.parent.y)
-            node = node.parent
-
-        return cost
-
-    def update_cost(self, parent_node):
+    def update_cost(self, i_parent):
+        tree = self.tree
         OPEN = queue.QueueFIFO()
-        OPEN.put(parent_node)
+        OPEN.put(i_parent)
 
         while not OPEN.empty():
-            node = OPEN.get()
-
-            if len(node.child) == 0:
-                continue
+            i = OPEN.get()
 
-            for node_c in node.child:
-                node_c.Cost = self.get_new_cost(node, node_c)
-                OPEN.put(node_c)
+            for c in tree.children(i):
+                tree.cost[c] = tree.cost[i] + tree.edge(i, c)
+                OPEN.put(c)
 
-    def extract_path(self, node_end):
+    def extract_path(self, i_end):
         path = [[self.s_goal.x, self.s_goal.y]]
         # The above part makes 'jump' at the end of edges,
         # if sampling was not enough!
-        node = node_end
-
-        while node.parent is not None:
-            path.append([node.x, node.y])
-            node = node.parent
-        path.append([node.x, node.y])
+        path += [[x, y] for x, y in self.tree.path_to_root(i_end)]
 
         return path
 
@@ -0,0 +1,88 @@
+"""
+Spatial index for RRT vertex queries
+"""
+
+import math
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class SpatialIndex:
+    """
+    Incremental nearest / radius index over the (x, y) of tree vertices,
+    addressed by insertion order (= position in the planner's vertex list).
+
+    Points live in a KD-tree that is rebuilt from scratch once the insertion
+    buffer outgrows ~2*sqrt(n); queries combine the tree with a vectorized
+    scan of the buffer. Candidates are re-ranked with math.hypot, so results
+    match the planners' linear scans exactly: nearest() returns the lowest
+    index among equally close vertices and within() returns ascending
+    indices.
+    """
+
+    # relative slack when gathering candidates, covers KD-tree vs math.hypot rounding
+    _SLACK = 1e-9
+
+    def __init__(self, min_buffer=32, capacity=64):
+        self.min_buffer = min_buffer
+        self.n = 0
+        self.xy = np.empty((capacity, 2))
+        self._tree = None
+        self._n_tree = 0
+
+    def __len__(self):
+        return self.n
+
+    def _grow(self, capacity):
+        """Reallocate the per-vertex arrays to *capacity* rows (subclasses extend this)."""
+        grown = np.empty((capacity, 2))
+        grown[:self.n] = self.xy[:self.n]
+        self.xy = grown
+
+    def insert(self, x, y):
+        """Add a vertex; returns its index."""
+        i = self.n
+        if i == len(self.xy):
+            self._grow(2 * i)
+        self.xy[i] = (x, y)
+        self.n = i + 1
+
+        if self.n - self._n_tree > max(self.min_buffer, 2 * int(math.sqrt(self._n_tree))):
+            self._tree = cKDTree(self.xy[:self.n])
+            self._n_tree = self.n
+        return i
+
+    def _hypot(self, i, x, y):
+        return math.hypot(self.xy[i, 0] - x, self.xy[i, 1] - y)
+
+    def _buffer_dists(self, x, y):
+        diff = self.xy[self._n_tree:self.n] - (x, y)
+        return np.sqrt(np.einsum("ij,ij->i", diff, diff))
+
+    def _candidates(self, x, y, r):
+        """Indices within r (plus slack) of (x, y), unordered."""
+        r = r * (1 + self._SLACK) + self._SLACK
+        found = self._tree.query_ball_point((x, y), r) if self._tree is not None else []
+        buffered = np.flatnonzero(self._buffer_dists(x, y) <= r) + self._n_tree
+        return list(found) + buffered.tolist()
+
+    def nearest(self, x, y):
+        """Index of the closest vertex."""
+        slack = self._SLACK
+        candidates = []
+        if self._tree is not None:
+            d, idx = self._tree.query((x, y), k=2)
+            if d[1] <= d[0] * (1 + slack) + slack:
+                candidates += self._tree.query_ball_point((x, y), d[0] * (1 + slack) + slack)
+            else:
+                candidates.append(int(idx[0]))
+        if self.n > self._n_tree:
+            dists = self._buffer_dists(x, y)
+            near = np.flatnonzero(dists <= dists.min() * (1 + slack) + slack) + self._n_tree
+            candidates += near.tolist()
+
+        return min(candidates, key=lambda i: (self._hypot(i, x, y), i))
+
+    def within(self, x, y, r):
+        """Ascending indices of the vertices at distance <= r."""
+        return sorted(i for i in self._candidates(x, y, r) if self._hypot(i, x, y) <= r)
@@ -0,0 +1,103 @@
+"""
+Array-backed tree storage for the RRT planners
+"""
+
+import math
+import numpy as np
+
+from rrt_2D.spatial_index import SpatialIndex
+
+
+class Point:
+    """(x, y) carrier with the Node attribute names, for the collision checker."""
+
+    __slots__ = ("x", "y", "parent")
+
+    def __init__(self, n):
+        self.x = n[0]
+        self.y = n[1]
+        self.parent = None
+
+
+class Tree(SpatialIndex):
+    """
+    Planner tree as parallel arrays indexed by vertex id (insertion order):
+    coordinates (from SpatialIndex), parent id (-1 for the root), cost-to-
+    root, and first-child / next-sibling links so subtrees can be walked
+    without per-vertex objects. About 36 bytes per vertex; all arrays grow
+    geometrically.
+    """
+
+    def __init__(self, root, capacity=64):
+        super().__init__(capacity=capacity)
+        self.parent = np.full(capacity, -1, dtype=np.int32)
+        self.cost = np.zeros(capacity)
+        self.first_child = np.full(capacity, -1, dtype=np.int32)
+        self.next_sibling = np.full(capacity, -1, dtype=np.int32)
+        self.add(root[0], root[1])
+
+    def _grow(self, capacity):
+        n = self.n
+        super()._grow(capacity)
+        for name, fill in (("parent", -1), ("cost", 0.0), ("first_child", -1), ("next_sibling", -1)):
+            old = getattr(self, name)
+            grown = np.full(capacity, fill, dtype=old.dtype)
+            grown[:n] = old[:n]
+            setattr(self, name, grown)
+
+    def add(self, x, y, parent=-1, cost=0.0):
+        """Append a vertex under *parent*; returns its id."""
+        i = self.insert(x, y)
+        self.parent[i] = parent
+        self.cost[i] = cost
+        self.first_child[i] = -1
+        self.next_sibling[i] = -1
+        if parent >= 0:
+            self.next_sibling[i] = self.first_child[parent]
+            self.first_child[parent] = i
+        return i
+
+    def point(self, i):
+        return Point((float(self.xy[i, 0]), float(self.xy[i, 1])))
+
+    def edge(self, i, j):
+        """Euclidean length between vertices i and j."""
+        return math.hypot(self.xy[j, 0] - self.xy[i, 0], self.xy[j, 1] - self.xy[i, 1])
+
+    def children(self, i):
+        c = self.first_child[i]
+        while c >= 0:
+            yield int(c)
+            c = self.next_sibling[c]
+
+    def reparent(self, i, parent):
+        """Move vertex i (with its subtree) under *parent*; costs are not touched."""
+        old = self.parent[i]
+        if old >= 0:
+            if self.first_child[old] == i:
+                self.first_child[old] = self.next_sibling[i]
+            else:
+                c = self.first_child[old]
+                while self.next_sibling[c] != i:
+                    c = self.next_sibling[c]
+                self.next_sibling[c] = self.next_sibling[i]
+        self.parent[i] = parent
+        self.next_sibling[i] = self.first_child[parent]
+        self.first_child[parent] = i
+
+    def path_to_root(self, i):
+        """[(x, y), ...] from vertex i up to and including the root."""
+        path = []
+        parent, xy = self.parent, self.xy
+        while i >= 0:
+            path.append((float(xy[i, 0]), float(xy[i, 1])))
+            i = parent[i]
+        return path
+
+    def nodes(self):
+        """The tree as a list of Node-style objects with parent links (for plotting)."""
+        nodes = [self.point(i) for i in range(self.n)]
+        for i in range(1, self.n):
+            if self.parent[i] >= 0:
+                nodes[i].parent = nodes[self.parent[i]]
+        return nodes
@@ -12,113 +12,155 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)) +
                 "/../rrt_2D/")
 
 from rrt_2D import env
-from rrt_2D.rrt import Node
 
 
 class Utils:
+    """
+    Collision checks against inflated (by delta) circles, rectangles and
+    boundary boxes. update_obs() precomputes the inflated geometry once,
+    as arrays so N segments or N points are tested against every obstacle
+    in one NumPy call (is_collision_batch / is_inside_obs_batch), and as
+    plain rows for the single checks, where a short Python loop beats the
+    per-call NumPy overhead. Call update_obs() again after changing delta.
+    """
+
     def __init__(self):
         self.env = env.Env()
 
         # self.delta = 0.5
         self.delta = 0.05
-        self.obs_circle = self.env.obs_circle
-        self.obs_rectangle = self.env.obs_rectangle
-        self.obs_boundary = self.env.obs_boundary
+        self.update_obs(self.env.obs_circle, self.env.obs_boundary, self.env.obs_rectangle)
 
     def update_obs(self, obs_cir, obs_bound, obs_rec):
         self.obs_circle = obs_cir
         self.obs_boundary = obs_bound
         self.obs_rectangle = obs_rec
-
-    def get_obs_vertex(self):
         delta = self.delta
-        obs_list = []
-
-        for (ox, oy, w, h) in self.obs_rectangle:
-            vertex_list = [[ox - delta, oy - delta],
-                           [ox + w + delta, oy - delta],
-                           [ox + w + delta, oy + h + delta],
-                           [ox - delta, oy + h + delta]]
-            obs_list.append(vertex_list)
-
-        return obs_list
-
-    def is_intersect_rec(self, start, end, o, d, a, b):
-        v1 = [o[0] - a[0], o[1] - a[1]]
-        v2 = [b[0] - a[0], b[1] - a[1]]
-        v3 = [-d[1], d[0]]
-
-        div = np.dot(v2, v3)
-
-        if div == 0:
-            return False
 
-        t1 = np.linalg.norm(np.cross(v2, v1)) / div
-        t2 = np.dot(v1, v3) / div
+        circles = np.asarray(obs_cir, dtype=float).reshape(-1, 3)
+        self.circle_xy = circles[:, :2]
+        self.circle_r = circles[:, 2] + delta
+
+        # Point test: rectangles and boundaries alike; segment test: rectangle edges only
+        boxes = np.asarray(list(obs_rec) + list(obs_bound), dtype=float).reshape(-1, 4)
+        self.box_lo = boxes[:, :2] - delta
+        self.box_size = boxes[:, 2:] + 2 * delta
+
+        self.obs_vertex = []
+        for (ox, oy, w, h) in obs_rec:
+            self.obs_vertex.append([[ox - delta, oy - delta],
+                                    [ox + w + delta, oy - delta],
+                                    [ox + w + delta, oy + h + delta],
+                                    [ox - delta, oy + h + delta]])
+        corners = np.asarray(self.obs_vertex, dtype=float).reshape(-1, 4, 2)
+        self.edge_a = corners.reshape(-1, 2)
+        self.edge_b = np.roll(corners, -1, axis=1).reshape(-1, 2)
+
+        self.circle_rows = np.column_stack([self.circle_xy, self.circle_r]).tolist()
+        self.box_rows = np.column_stack([self.box_lo, self.box_size]).tolist()
+        self.edge_rows = np.column_stack([self.edge_a, self.edge_b - self.edge_a]).tolist()
 
-        if t1 >= 0 and 0 <= t2 <= 1:
-            shot = Node((o[0] + t1 * d[0], o[1] + t1 * d[1]))
-            dist_obs = self.get_dist(start, shot)
-            dist_seg = self.get_dist(start, end)
-            if dist_obs <= dist_seg:
-                return True
-
-        return False
-
-    def is_intersect_circle(self, o, d, a, r):
-        d2 = np.dot(d, d)
-        delta = self.delta
-
-        if d2 == 0:
-            return False
-
-        t = np.dot([a[0] - o[0], a[1] - o[1]], d) / d2
-
-        if 0 <= t <= 1:
-            shot = Node((o[0] + t * d[0], o[1] + t * d[1]))
-            if self.get_dist(shot, Node(a)) <= r + delta:
-                return True
-
-        return False
+    def get_obs_vertex(self):
+        return self.obs_vertex
+
+    # ---- #
+    # Batch checks
+    # ---- #
+
+    def is_inside_obs_batch(self, points):
+        """Boolean mask over the (N, 2) *points* lying inside an inflated obstacle."""
+        p = np.asarray(points, dtype=float).reshape(-1, 2)
+
+        diff = p[:, None, :] - self.circle_xy
+        inside = (np.hypot(diff[..., 0], diff[..., 1]) <= self.circle_r).any(axis=1)
+
+        offset = p[:, None, :] - self.box_lo
+        inside |= ((offset >= 0) & (offset <= self.box_size)).all(axis=2).any(axis=1)
+
+        return inside
+
+    def is_collision_batch(self, starts, ends):
+        """
+        Boolean mask over the segments starts[i] -> ends[i]; either argument
+        may be a single point, broadcast against the other.
+        """
+        o, e = np.broadcast_arrays(np.asarray(starts, dtype=float).reshape(-1, 2),
+                                   np.asarray(ends, dtype=float).reshape(-1, 2))
+        hit = self.is_inside_obs_batch(o) | self.is_inside_obs_batch(e)
+
+        ox, oy = o[:, 0:1], o[:, 1:2]
+        dx, dy = e[:, 0:1] - ox, e[:, 1:2] - oy
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if len(self.edge_a):
+                # Ray o + t1 * d against edge a + t2 * (b - a)
+                ax, ay = self.edge_a[:, 0], self.edge_a[:, 1]
+                v1x, v1y = ox - ax, oy - ay
+                v2x, v2y = self.edge_b[:, 0] - ax, self.edge_b[:, 1] - ay
+                div = v2x * -dy + v2y * dx
+                t1 = np.abs(v2x * v1y - v2y * v1x) / div
+                t2 = (v1x * -dy + v1y * dx) / div
+                shot = np.hypot(ox + t1 * dx - ox, oy + t1 * dy - oy)
+                hit |= ((div != 0) & (t1 >= 0) & (t2 >= 0) & (t2 <= 1)
+                        & (shot <= np.hypot(dx, dy))).any(axis=1)
+
+            if len(self.circle_xy):
+                # Closest point of the segment to each centre
+                cx, cy = self.circle_xy[:, 0], self.circle_xy[:, 1]
+                d2 = dx * dx + dy * dy
+                t = ((cx - ox) * dx + (cy - oy) * dy) / d2
+                dist = np.hypot(cx - (ox + t * dx), cy - (oy + t * dy))
+                hit |= ((d2 != 0) & (t >= 0) & (t <= 1) & (dist <= self.circle_r)).any(axis=1)
+
+        return hit
+
+    def first_collision(self, start, ends):
+        """Position of the first segment start -> ends[k] that collides, -1 if none."""
+        hit = self.is_collision_batch(start, ends)
+        return int(np.argmax(hit)) if hit.any() else -1
+
+    # ---- #
+    # Single checks
+    # ---- #
 
     def is_collision(self, start, end):
         if self.is_inside_obs(start) or self.is_inside_obs(end):
             return True
 
-        o, d = self.get_ray(start, end)
-        obs_vertex = self.get_obs_vertex()
-
-        for (v1, v2, v3, v4) in obs_vertex:
-            if self.is_intersect_rec(start, end, o, d, v1, v2):
-                return True
-            if self.is_intersect_rec(start, end, o, d, v2, v3):
-                return True
-            if self.is_intersect_rec(start, end, o, d, v3, v4):
-                return True
-            if self.is_intersect_rec(start, end, o, d, v4, v1):
+        ox, oy = start.x, start.y
+        dx, dy = end.x - ox, end.y - oy
+
+        for (ax, ay, v2x, v2y) in self.edge_rows:
+            div = v2x * -dy + v2y * dx
+            if div == 0:
+                continue
+            v1x, v1y = ox - ax, oy - ay
+            t1 = abs(v2x * v1y - v2y * v1x) / div
+            t2 = (v1x * -dy + v1y * dx) / div
+            if t1 >= 0 and 0 <= t2 <= 1 \
+                    and math.hypot(ox + t1 * dx - ox, oy + t1 * dy - oy) <= math.hypot(dx, dy):
                 return True
 
-        for (x, y, r) in self.obs_circle:
-            if self.is_intersect_circle(o, d, [x, y], r):
+        d2 = dx * dx + dy * dy
+        if d2 == 0:
+            return False
+
+        for (cx, cy, r) in self.circle_rows:
+            t = ((cx - ox) * dx + (cy - oy) * dy) / d2
+            if 0 <= t <= 1 and math.hypot(cx - (ox + t * dx), cy - (oy + t * dy)) <= r:
                 return True
 
         return False
 
     def is_inside_obs(self, node):
-        delta = self.delta
-
-        for (x, y, r) in self.obs_circle:
-            if math.hypot(node.x - x, node.y - y) <= r + delta:
-                return True
+        x, y = node.x, node.y
 
-        for (x, y, w, h) in self.obs_rectangle:
-            if 0 <= node.x - (x - delta) <= w + 2 * delta \
-                    and 0 <= node.y - (y - delta) <= h + 2 * delta:
+        for (cx, cy, r) in self.circle_rows:
+            if math.hypot(x - cx, y - cy) <= r:
                 return True
 
-        for (x, y, w, h) in self.obs_boundary:
-            if 0 <= node.x - (x - delta) <= w + 2 * delta \
-                    and 0 <= node.y - (y - delta) <= h + 2 * delta:
+        for (lx, ly, w, h) in self.box_rows:
+            if 0 <= x - lx <= w and 0 <= y - ly <= h:
                 return True
 
         return False